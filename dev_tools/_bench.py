@@ -0,0 +1,80 @@
+"""Helpers shared by the benchmarks"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _Ini:
+    def __init__(self, options):
+        self._options = options
+
+    def get(self, section, name):
+        return self._options.get(name)
+
+
+class BenchConfig:
+    """Minimal stand-in of the pytest config the sessions read their options from"""
+
+    def __init__(self, url, **options):
+        options = {key.replace('_', '-'): value for key, value in options.items()}
+        options.update({'testrail-url': url, 'testrail-email': 'bench@example.com', 'testrail-key': 'key'})
+        self.inicfg = type('inicfg', (), {'config': _Ini(options)})()
+
+    def getoption(self, name, default=None):
+        return default
+
+
+class CountingServer(ThreadingHTTPServer):
+    """HTTP/1.1 keep-alive server answering every request with the same JSON body and counting connections"""
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, body=None, latency=0.0):
+        self.latency = latency
+        self.connections = 0
+        self.requests = 0
+        self.body = json.dumps(body if body is not None else []).encode()
+        self._lock = threading.Lock()
+        super().__init__(('127.0.0.1', 0), _Handler)
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def url(self):
+        return 'http://127.0.0.1:{}'.format(self.server_port)
+
+    def get_request(self):
+        with self._lock:
+            self.connections += 1
+        return super().get_request()
+
+    def reset(self):
+        with self._lock:
+            self.connections = self.requests = 0
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def _reply(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            self.rfile.read(length)
+        with self.server._lock:  # pylint: disable=protected-access
+            self.server.requests += 1
+        time.sleep(self.server.latency)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(self.server.body)))
+        if self.headers.get('Connection', '').lower() == 'close':
+            self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write(self.server.body)
+
+    do_GET = _reply
+    do_POST = _reply
+
+    def log_message(self, *args):
+        pass
@@ -0,0 +1,57 @@
+"""
+Counts the connections (i.e. TLS handshakes against a https TestRail) opened by rounds of concurrent
+requests, the way the exporters fan out, with the default requests adapter and with the pooled adapter of Session.
+
+    python dev_tools/bench_connection_pool.py --rounds 100 --workers 16
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from _bench import BenchConfig, CountingServer  # noqa: E402 pylint: disable=wrong-import-position
+from pytest_testrail_client._enums import METHODS  # noqa: E402 pylint: disable=wrong-import-position
+from pytest_testrail_client._session import Session  # noqa: E402 pylint: disable=wrong-import-position
+
+
+def run(server, session, rounds, workers):
+    server.reset()
+    started = time.perf_counter()
+    for _ in range(rounds):
+        # distinct runs, identical GETs in flight at once would share one request
+        session.request_many([(METHODS.GET, f'get_tests/{run_id}') for run_id in range(1, workers + 1)],
+                             max_workers=workers)
+    return server.connections, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rounds', type=int, default=100)
+    parser.add_argument('--workers', type=int, default=16)
+    parser.add_argument('--latency', type=float, default=50, help='server latency in milliseconds')
+    args = parser.parse_args()
+    # urllib3 warns about every connection the default pool discards
+    logging.getLogger('urllib3').setLevel(logging.ERROR)
+
+    server = CountingServer(latency=args.latency / 1000)
+    default = Session(BenchConfig(server.url, testrail_max_workers=args.workers))
+    # the adapter requests mounts by default: 10 pooled connections
+    default._Session__session.mount('http://', requests.adapters.HTTPAdapter())  # pylint: disable=protected-access
+    pooled = Session(BenchConfig(server.url, testrail_max_workers=args.workers))
+    no_keep_alive = Session(BenchConfig(server.url, testrail_max_workers=args.workers, testrail_keep_alive='false'))
+
+    print('{:<28}{:>14}{:>12}'.format('adapter', 'connections', 'seconds'))
+    for name, session in (('default (10 connections)', default),
+                          ('pooled ({} connections)'.format(args.workers), pooled),
+                          ('keep-alive disabled', no_keep_alive)):
+        connections, seconds = run(server, session, args.rounds, args.workers)
+        print('{:<28}{:>14}{:>12.2f}'.format(name, connections, seconds))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""
+Builds Case and Test models from a get_cases / get_tests like JSON page, with the custom fields collected
+at construction by a regex over every key (as before), lazily on first use and by the compact models, then reads
+a custom field of every model. Then measures the memory held per model once the decoded page is dropped.
+
+    python dev_tools/bench_models.py --objects 100000
+"""
+import argparse
+import gc
+import json
+import os
+import re
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pytest_testrail_client.model.case import Case  # noqa: E402 pylint: disable=wrong-import-position
+from pytest_testrail_client.model.compact import CompactCase, CompactTest  # noqa: E402 pylint: disable=C0413
+from pytest_testrail_client.model.test import Test  # noqa: E402 pylint: disable=wrong-import-position
+
+CUSTOM_METHODS_RE = re.compile(r'^custom_(\w+)')
+
+
+def regex_custom_methods(content):
+    matches = [CUSTOM_METHODS_RE.match(method) for method in content]
+    return dict({match.string: content[match.string] for match in matches if match})
+
+
+class EagerCase(Case):
+    def __init__(self, content=None):
+        super().__init__(content)
+        self._custom_fields = regex_custom_methods(self._content)
+
+
+class EagerTest(Test):
+    def __init__(self, content=None):
+        super().__init__(content)
+        self._custom_fields = regex_custom_methods(self._content)
+
+
+def case(index):
+    return {
+        'id': index, 'title': f'Scenario {index}: user logs in with a valid account', 'section_id': index // 50,
+        'template_id': 2, 'type_id': 7, 'priority_id': 2, 'milestone_id': None, 'refs': f'JIRA-{index}',
+        'created_by': 1, 'created_on': 1600000000 + index, 'updated_by': 1, 'updated_on': 1600000000 + index,
+        'estimate': None, 'estimate_forecast': '2m', 'suite_id': 1, 'display_order': index, 'is_deleted': 0,
+        'custom_automation_type': 1, 'custom_preconds': 'Feature: Login\n  As a user I want to log in',
+        'custom_steps': None, 'custom_expected': None, 'custom_data_set': '{"user": "admin", "pass": "secret"}',
+        'custom_steps_separated': [
+            {'content': 'Given a registered user', 'expected': ''},
+            {'content': 'When the user logs in', 'expected': ''},
+            {'content': 'Then the dashboard is shown', 'expected': ''}],
+        'custom_mission': None, 'custom_goals': None, 'custom_tags': '@smoke @login',
+    }
+
+
+def test(index):
+    content = case(index)
+    content.update({'case_id': content['id'], 'id': 100000 + index, 'run_id': 1, 'status_id': 3,
+                    'assignedto_id': None})
+    return content
+
+
+def bench(label, model, contents, read):
+    # a full collection over the fixture would land in whichever run allocates at that time
+    gc.collect()
+    gc.disable()
+    started = time.perf_counter()
+    objects = [model(content) for content in contents]
+    built = time.perf_counter() - started
+    if read:
+        started = time.perf_counter()
+        for obj in objects:
+            obj._custom_methods.get('custom_data_set')  # pylint: disable=protected-access
+        print(f'{label:<30} built in {built:.3f}s, custom field read in {time.perf_counter() - started:.3f}s')
+    else:
+        print(f'{label:<30} built in {built:.3f}s')
+    gc.enable()
+
+
+def memory(label, model, text, objects):
+    gc.collect()
+    tracemalloc.start()
+    contents = json.loads(text)
+    models = [model(content) for content in contents]
+    del contents
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f'{label:<30} {held / len(models):.0f} bytes per object, {held / 1024 ** 2:.1f} MiB for {objects}')
+    return models
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--objects', type=int, default=100000)
+    args = parser.parse_args()
+
+    cases_text = json.dumps([case(index) for index in range(args.objects)])
+    tests_text = json.dumps([test(index) for index in range(args.objects)])
+    cases, tests = json.loads(cases_text), json.loads(tests_text)
+    models = (('Case (regex, eager)', EagerCase, cases), ('Case (lazy)', Case, cases),
+              ('Case (compact)', CompactCase, cases), ('Test (regex, eager)', EagerTest, tests),
+              ('Test (lazy)', Test, tests), ('Test (compact)', CompactTest, tests))
+    for label, model, contents in models:
+        bench(label, model, contents, read=False)
+        bench(label, model, contents, read=True)
+    del cases, tests
+
+    print()
+    for label, model, contents in models:
+        memory(label, model, cases_text if contents is models[0][2] else tests_text, args.objects)
+
+
+if __name__ == '__main__':
+    main()
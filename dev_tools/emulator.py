@@ -0,0 +1,468 @@
+"""
+Stateful in-process TestRail emulator for load and scale tests
+
+A WSGI application implementing the API v2 endpoints used by the client with in-memory state: projects, suites,
+sections, cases, milestones, plans and entries, runs, tests, results, statuses, configs, priorities, templates,
+case types, fields and users. It runs in a thread:
+
+    emulator = Emulator(latency=0.02, page_size=250, rate_limit=180)
+    project = emulator.seed(cases=50000)
+    tr = TestRailAPI(BenchConfig(emulator.serve()))
+
+Knobs: latency per request, page size of the bulk endpoints, requests per minute before HTTP 429 and ratio of
+injected HTTP 503.
+"""
+import gzip
+import itertools
+import json
+import random
+import threading
+import time
+from collections import Counter, deque
+from socketserver import ThreadingMixIn
+from urllib.parse import parse_qsl, urlencode
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+API_PREFIX = '/api/v2/'
+
+STATUSES = [
+    {'id': 1, 'name': 'passed', 'label': 'Passed', 'is_final': True},
+    {'id': 2, 'name': 'blocked', 'label': 'Blocked', 'is_final': True},
+    {'id': 3, 'name': 'untested', 'label': 'Untested', 'is_final': False},
+    {'id': 4, 'name': 'retest', 'label': 'Retest', 'is_final': False},
+    {'id': 5, 'name': 'failed', 'label': 'Failed', 'is_final': True},
+]
+PRIORITIES = [
+    {'id': 1, 'name': 'Low', 'short_name': 'Low', 'priority': 1, 'is_default': False},
+    {'id': 2, 'name': 'Medium', 'short_name': 'Medium', 'priority': 2, 'is_default': True},
+    {'id': 3, 'name': 'High', 'short_name': 'High', 'priority': 3, 'is_default': False},
+    {'id': 4, 'name': 'Critical', 'short_name': 'Critical', 'priority': 4, 'is_default': False},
+]
+TEMPLATES = [
+    {'id': 1, 'name': 'Test Case (Text)', 'is_default': True},
+    {'id': 2, 'name': 'Test Case (Steps)', 'is_default': False},
+    {'id': 3, 'name': 'Exploratory Session', 'is_default': False},
+]
+CASE_TYPES = [
+    {'id': 1, 'name': 'Acceptance', 'is_default': False},
+    {'id': 6, 'name': 'Functional', 'is_default': False},
+    {'id': 7, 'name': 'Other', 'is_default': True},
+]
+USERS = [{'id': 1, 'name': 'Emulator', 'email': 'bench@example.com', 'is_active': True}]
+
+# objects handled generically: name -> (table, field of the add_* argument, field of the get_*s argument, envelope)
+TABLES = {
+    'project': ('projects', None, None, 'projects'),
+    'suite': ('suites', 'project_id', 'project_id', None),
+    'section': ('sections', 'project_id', 'project_id', 'sections'),
+    'case': ('cases', 'section_id', 'project_id', 'cases'),
+    'milestone': ('milestones', 'project_id', 'project_id', 'milestones'),
+    'plan': ('plans', 'project_id', 'project_id', 'plans'),
+    'run': ('runs', 'project_id', 'project_id', 'runs'),
+    'test': ('tests', None, 'run_id', 'tests'),
+    'config_group': ('config_groups', 'project_id', 'project_id', None),
+    'config': ('configs', 'group_id', 'group_id', None),
+}
+# targets of add_attachment_to_*: name -> number of ID arguments
+ATTACHMENT_TARGETS = {'case': 1, 'plan': 1, 'plan_entry': 2, 'result': 1, 'run': 1}
+# list filters accepted by the bulk endpoints
+FILTERS = ('suite_id', 'section_id', 'status_id', 'is_completed', 'milestone_id')
+
+
+class BadRequest(Exception):
+    """Rejected request, reported as HTTP 400 like TestRail does"""
+
+
+class Emulator:
+    """In-memory TestRail, see the module documentation"""
+
+    def __init__(self, latency: float = 0.0, page_size: int = 250, rate_limit: float = None,
+                 error_rate: float = 0.0, error_methods=('GET', 'POST'), retry_after: int = 1,
+                 gzip_requests: bool = True, gzip_responses: bool = True, seed: int = None) -> None:
+        """
+        :param latency: Seconds every request takes
+        :param page_size: Items per page of the bulk endpoints
+        :param rate_limit: Requests per minute accepted before answering HTTP 429, unlimited if None
+        :param error_rate: Share of the requests answered HTTP 503, between 0 and 1
+        :param error_methods: HTTP methods of the requests failing at error_rate
+        :param retry_after: Retry-After of the HTTP 429 responses, in seconds
+        :param gzip_requests: Accept gzip request bodies, answer HTTP 415 otherwise
+        :param gzip_responses: Compress the responses of clients accepting gzip
+        :param seed: Seed of the error injection
+        """
+        self.latency = latency
+        self.page_size = page_size
+        self.rate_limit = rate_limit
+        self.error_rate = error_rate
+        self.error_methods = error_methods
+        self.retry_after = retry_after
+        self.gzip_requests = gzip_requests
+        self.gzip_responses = gzip_responses
+        self.calls = Counter()
+        self.throttled = 0
+        self.failed = 0
+        self._random = random.Random(seed)
+        self._window = deque()
+        self._lock = threading.RLock()
+        self._ids = {name: itertools.count(1) for name in ('projects', 'suites', 'sections', 'cases', 'milestones',
+                                                           'plans', 'entries', 'runs', 'tests', 'results',
+                                                           'config_groups', 'configs', 'attachments')}
+        self._tables = {name: dict() for name in self._ids}
+        self._server = None
+
+    # state
+
+    def _insert(self, table: str, obj: dict) -> dict:
+        obj['id'] = next(self._ids[table])
+        obj.setdefault('created_on', int(time.time()))
+        self._tables[table][obj['id']] = obj
+        return obj
+
+    def _get(self, table: str, obj_id) -> dict:
+        try:
+            return self._tables[table][int(obj_id)]
+        except (KeyError, ValueError):
+            raise BadRequest(f'Field :{table[:-1]}_id is not a valid ID.') from None
+
+    def _config_names(self, config_ids) -> str:
+        return ', '.join(self._get('configs', config_id)['name'] for config_id in config_ids or [])
+
+    def _tests_of(self, run: dict) -> None:
+        cases = [case for case in self._tables['cases'].values() if case['suite_id'] == run['suite_id']]
+        if not run.get('include_all', True):
+            cases = [case for case in cases if case['id'] in set(run.get('case_ids') or [])]
+        for case in cases:
+            test = {key: value for key, value in case.items() if key.startswith('custom_')}
+            test.update({'case_id': case['id'], 'run_id': run['id'], 'status_id': 3, 'title': case['title'],
+                         'type_id': case.get('type_id'), 'priority_id': case.get('priority_id'),
+                         'refs': case.get('refs')})
+            self._insert('tests', test)
+
+    def _add_run(self, project_id: int, data: dict, plan_id: int = None, entry_id: str = None) -> dict:
+        run = dict(data, project_id=project_id, plan_id=plan_id, entry_id=entry_id, is_completed=False,
+                   config=self._config_names(data.get('config_ids')) or None)
+        run.setdefault('name', self._get('suites', data['suite_id'])['name'])
+        self._insert('runs', run)
+        self._tests_of(run)
+        return run
+
+    def _add_entry(self, plan: dict, data: dict) -> dict:
+        entry = {'id': str(next(self._ids['entries'])), 'suite_id': data['suite_id'],
+                 'name': data.get('name') or self._get('suites', data['suite_id'])['name'], 'runs': []}
+        for run in data.get('runs') or [{}]:
+            run = dict({'suite_id': data['suite_id'], 'name': entry['name'],
+                        'include_all': data.get('include_all', True), 'case_ids': data.get('case_ids')}, **run)
+            entry['runs'].append(self._add_run(plan['project_id'], run, plan['id'], entry['id'])['id'])
+        plan['entries'].append(entry)
+        return entry
+
+    def _plan(self, plan: dict) -> dict:
+        entries = [dict(entry, runs=[self._tables['runs'][run_id] for run_id in entry['runs']])
+                   for entry in plan['entries']]
+        return dict(plan, entries=entries)
+
+    def _add_result(self, test: dict, data: dict) -> dict:
+        result = dict(data, test_id=test['id'])
+        self._insert('results', result)
+        if data.get('status_id'):
+            test['status_id'] = data['status_id']
+        return result
+
+    def _test_of_case(self, run_id, case_id) -> dict:
+        for test in self._tables['tests'].values():
+            if test['run_id'] == int(run_id) and test['case_id'] == int(case_id):
+                return test
+        raise BadRequest('Field :case_id is not part of the run.')
+
+    def seed(self, project: str = 'Emulated', suites: int = 1, sections: int = 1, cases: int = 0,
+             configs=('Chrome', 'Firefox')) -> int:
+        """Creates a project with its suites, sections, cases and a configuration group, returns its ID"""
+        with self._lock:
+            project_id = self._insert('projects', {'name': project, 'suite_mode': 3, 'is_completed': False})['id']
+            group = self._insert('config_groups', {'name': 'Browsers', 'project_id': project_id})
+            for name in configs:
+                self._insert('configs', {'name': name, 'group_id': group['id']})
+            for suite_index in range(suites):
+                suite = self._insert('suites', {'name': f'Suite {suite_index + 1}', 'project_id': project_id})
+                for section_index in range(sections):
+                    section = self._insert('sections', {'name': f'Section {section_index + 1}',
+                                                        'suite_id': suite['id'], 'project_id': project_id,
+                                                        'parent_id': None, 'depth': 0})
+                    for case_index in range(cases // (suites * sections)):
+                        self._insert('cases', {'title': f'Case {case_index + 1}', 'section_id': section['id'],
+                                               'suite_id': suite['id'], 'project_id': project_id,
+                                               'template_id': 2, 'type_id': 6, 'priority_id': 2,
+                                               'custom_steps_separated': [], 'custom_data_set': None})
+        return project_id
+
+    # endpoints
+
+    def _page(self, src: str, key: str, items: list, params: dict):
+        if key is None:
+            return items
+        offset = int(params.get('offset', 0))
+        limit = min(int(params.get('limit', self.page_size)), self.page_size)
+        next_link = None
+        if offset + limit < len(items):
+            query = urlencode(dict(params, offset=offset + limit, limit=limit))
+            next_link = f'{API_PREFIX}{src}&{query}'
+        page = items[offset:offset + limit]
+        return {'offset': offset, 'limit': limit, 'size': len(page),
+                '_links': {'next': next_link, 'prev': None}, key: page}
+
+    def _list(self, name: str, args: list, params: dict, src: str):
+        table, _, field, key = TABLES[name]
+        items = list(self._tables[table].values())
+        if field:
+            items = [item for item in items if item.get(field) == int(args[0])]
+        for param in FILTERS:
+            if param in params:
+                values = {int(value) for value in str(params[param]).split(',')}
+                items = [item for item in items if item.get(param) in values]
+        for param in ('created', 'updated'):
+            if f'{param}_after' in params:
+                after = int(params[f'{param}_after'])
+                items = [item for item in items if (item.get(f'{param}_on') or item.get('created_on') or 0) > after]
+        if name == 'run':
+            items = [item for item in items if item.get('plan_id') is None]
+        if name == 'plan':
+            items = [{k: v for k, v in plan.items() if k != 'entries'} for plan in items]
+        return self._page(src, key, items, params)
+
+    def _dispatch(self, method: str, src: str, params: dict, body):
+        name, *args = src.split('/')
+        verb, _, noun = name.partition('_')
+        if method == 'GET' and verb != 'get' or method == 'POST' and verb == 'get':
+            raise BadRequest(f'{method} not allowed for {name}')
+
+        # specific endpoints
+        if name == 'get_statuses':
+            return STATUSES
+        if name == 'get_priorities':
+            return PRIORITIES
+        if name == 'get_templates':
+            return TEMPLATES
+        if name == 'get_case_types':
+            return CASE_TYPES
+        if name in ('get_case_fields', 'get_result_fields'):
+            return []
+        if name == 'get_users':
+            return USERS
+        if name == 'get_user':
+            return USERS[0]
+        if name == 'get_user_by_email':
+            return USERS[0]
+        if name == 'get_configs':
+            return [dict(group, configs=[config for config in self._tables['configs'].values()
+                                         if config['group_id'] == group['id']])
+                    for group in self._tables['config_groups'].values() if group['project_id'] == int(args[0])]
+        if name == 'get_plan':
+            return self._plan(self._get('plans', args[0]))
+        if name == 'add_plan':
+            plan = self._insert('plans', dict(body, project_id=int(args[0]), entries=[], is_completed=False))
+            for entry in body.get('entries') or []:
+                self._add_entry(plan, entry)
+            return self._plan(plan)
+        if name == 'add_plan_entry':
+            plan = self._get('plans', args[0])
+            entry = self._add_entry(plan, body)
+            return dict(entry, runs=[self._tables['runs'][run_id] for run_id in entry['runs']])
+        if name == 'update_plan_entry':
+            plan = self._get('plans', args[0])
+            entry = next((entry for entry in plan['entries'] if entry['id'] == args[1]), None)
+            if entry is None:
+                raise BadRequest('Field :entry_id is not a valid ID.')
+            entry.update({key: value for key, value in body.items() if key in ('name', 'description')})
+            return dict(entry, runs=[self._tables['runs'][run_id] for run_id in entry['runs']])
+        if name == 'delete_plan_entry':
+            plan = self._get('plans', args[0])
+            plan['entries'] = [entry for entry in plan['entries'] if entry['id'] != args[1]]
+            return None
+        if name in ('close_plan', 'close_run'):
+            obj = self._get(noun + 's', args[0])
+            obj.update(is_completed=True, completed_on=int(time.time()))
+            return self._plan(obj) if noun == 'plan' else obj
+        if name == 'add_run':
+            return self._add_run(int(args[0]), body)
+        if name == 'add_case':
+            section = self._get('sections', args[0])
+            case = dict(body, section_id=section['id'], suite_id=section['suite_id'],
+                        project_id=section['project_id'], updated_on=int(time.time()))
+            return self._insert('cases', case)
+        if name in ('update_cases', 'delete_cases'):
+            cases = [self._get('cases', case_id) for case_id in body.get('case_ids') or []]
+            if any(case['suite_id'] != int(args[0]) for case in cases):
+                raise BadRequest('Field :case_ids contains cases of another suite.')
+            if name == 'update_cases':
+                fields = {key: value for key, value in body.items() if key not in ('case_ids', 'id', 'section_id')}
+                for case in cases:
+                    case.update(fields, updated_on=int(time.time()))
+                return {'updated_cases': cases}
+            if params.get('soft') in ('1', 1):
+                return {'cases': len(cases), 'tests': 0, 'runs': 0, 'results': 0}
+            for case in cases:
+                self._tables['cases'].pop(case['id'])
+            return None
+        if name == 'add_section':
+            suite = self._get('suites', body['suite_id'])
+            parent = self._get('sections', body['parent_id']) if body.get('parent_id') else None
+            section = dict(body, project_id=suite['project_id'], depth=parent['depth'] + 1 if parent else 0)
+            return self._insert('sections', section)
+        if name == 'get_results':
+            self._get('tests', args[0])
+            return self._page(src, 'results', [result for result in self._tables['results'].values()
+                                               if result['test_id'] == int(args[0])][::-1], params)
+        if name == 'get_results_for_case':
+            test = self._test_of_case(*args)
+            return self._page(src, 'results', [result for result in self._tables['results'].values()
+                                               if result['test_id'] == test['id']][::-1], params)
+        if name == 'get_results_for_run':
+            tests = {test['id'] for test in self._tables['tests'].values() if test['run_id'] == int(args[0])}
+            return self._page(src, 'results', [result for result in self._tables['results'].values()
+                                               if result['test_id'] in tests][::-1], params)
+        if name == 'add_result':
+            return self._add_result(self._get('tests', args[0]), body)
+        if name == 'add_result_for_case':
+            return self._add_result(self._test_of_case(*args), body)
+        if name == 'add_results':
+            return [self._add_result(self._get('tests', result['test_id']), result) for result in body['results']]
+        if name == 'add_results_for_cases':
+            return [self._add_result(self._test_of_case(args[0], result['case_id']), result)
+                    for result in body['results']]
+
+        if name.startswith('add_attachment_to_'):
+            target = name[len('add_attachment_to_'):]
+            if target not in ATTACHMENT_TARGETS or len(args) != ATTACHMENT_TARGETS[target]:
+                raise BadRequest(f'Unknown method \'{name}\'')
+            attachment = self._insert('attachments', dict(body, entity_type=target, entity_id='/'.join(args)))
+            return {'attachment_id': attachment['id']}
+        if name.startswith('get_attachments_for_'):
+            target = name[len('get_attachments_for_'):]
+            attachments = [{key: value for key, value in attachment.items() if key != 'content'}
+                           for attachment in self._tables['attachments'].values()
+                           if attachment['entity_type'] == target and attachment['entity_id'] == '/'.join(args)]
+            return self._page(src, 'attachments', attachments, params)
+        if name == 'get_attachment':
+            return self._get('attachments', args[0])['content']
+        if name == 'delete_attachment':
+            self._tables['attachments'].pop(self._get('attachments', args[0])['id'])
+            return None
+
+        # generic endpoints
+        if name.endswith('s') and verb == 'get' and noun[:-1] in TABLES:
+            return self._list(noun[:-1], args, params, src)
+        if noun not in TABLES:
+            raise BadRequest(f'Unknown method \'{name}\'')
+        table, field, _, _ = TABLES[noun]
+        if verb == 'get':
+            return self._get(table, args[0])
+        if verb == 'add':
+            obj = dict(body)
+            if field:
+                obj[field] = int(args[0])
+            return self._insert(table, obj)
+        if verb == 'update':
+            obj = self._get(table, args[0])
+            obj.update({key: value for key, value in body.items() if key != 'id'}, updated_on=int(time.time()))
+            return obj
+        if verb == 'delete':
+            self._tables[table].pop(self._get(table, args[0])['id'])
+            return None
+        raise BadRequest(f'Unknown method \'{name}\'')
+
+    # WSGI
+
+    def _throttle(self) -> bool:
+        """True if the request exceeds the rate limit"""
+        if not self.rate_limit:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            while self._window and self._window[0] <= now - 60:
+                self._window.popleft()
+            if len(self._window) >= self.rate_limit:
+                self.throttled += 1
+                return True
+            self._window.append(now)
+            return False
+
+    def __call__(self, environ, start_response):
+        path, _, query = environ.get('QUERY_STRING', '').partition('&')
+        src = path[len(API_PREFIX):] if path.startswith(API_PREFIX) else path
+        if self.latency:
+            time.sleep(self.latency)
+        headers = [('Content-Type', 'application/json')]
+        if self._throttle():
+            status, payload = '429 Too Many Requests', {'error': 'API Rate Limit Exceeded'}
+            headers.append(('Retry-After', str(self.retry_after)))
+        elif self.error_rate and environ['REQUEST_METHOD'] in self.error_methods \
+                and self._random.random() < self.error_rate:
+            with self._lock:
+                self.failed += 1
+            status, payload = '503 Service Unavailable', {'error': 'Injected failure'}
+        elif environ.get('HTTP_CONTENT_ENCODING') == 'gzip' and not self.gzip_requests:
+            status, payload = '415 Unsupported Media Type', {'error': 'Content-Encoding not supported'}
+        else:
+            length = int(environ.get('CONTENT_LENGTH') or 0)
+            raw = environ['wsgi.input'].read(length) if length else b''
+            if environ.get('HTTP_CONTENT_ENCODING') == 'gzip':
+                raw = gzip.decompress(raw)
+            try:
+                if environ.get('CONTENT_TYPE', '').startswith('multipart/form-data'):
+                    body = _upload(raw, environ['CONTENT_TYPE'])
+                else:
+                    body = json.loads(raw) if raw else {}
+                with self._lock:
+                    self.calls[src.split('/', 1)[0]] += 1
+                    payload = self._dispatch(environ['REQUEST_METHOD'], src, dict(parse_qsl(query)), body)
+                status = '200 OK'
+            except (BadRequest, KeyError, ValueError) as err:
+                status, payload = '400 Bad Request', {'error': str(err)}
+        if isinstance(payload, bytes):
+            headers[0] = ('Content-Type', 'application/octet-stream')
+            data = payload
+        else:
+            data = json.dumps(payload).encode() if payload is not None else b''
+        if self.gzip_responses and len(data) > 1024 and 'gzip' in environ.get('HTTP_ACCEPT_ENCODING', ''):
+            data = gzip.compress(data, compresslevel=1)
+            headers.append(('Content-Encoding', 'gzip'))
+        headers.append(('Content-Length', str(len(data))))
+        start_response(status, headers)
+        return [data]
+
+    def serve(self, host: str = '127.0.0.1', port: int = 0) -> str:
+        """Serves the emulator in a daemon thread, returns its url"""
+        self._server = make_server(host, port, self, server_class=_Server, handler_class=_Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self.url
+
+    @property
+    def url(self) -> str:
+        return 'http://{}:{}'.format(*self._server.server_address)
+
+    def shutdown(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+def _upload(raw: bytes, content_type: str) -> dict:
+    """Name, size and content of the file of a multipart/form-data body"""
+    boundary = content_type.split('boundary=', 1)[1].strip('"').encode()
+    part = raw.split(b'--' + boundary)[1]
+    headers, _, content = part.partition(b'\r\n\r\n')
+    name = headers.split(b'filename="', 1)[1].split(b'"', 1)[0].decode() if b'filename="' in headers else 'file'
+    content = content[:-2] if content.endswith(b'\r\n') else content
+    return {'name': name, 'size': len(content), 'content': content}
+
+
+class _Server(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class _Handler(WSGIRequestHandler):
+
+    def log_message(self, *args):
+        pass
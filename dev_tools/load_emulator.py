@@ -0,0 +1,75 @@
+"""
+Load test of the client against the TestRail emulator: reads every case of a large project, creates a plan with one
+entry per suite, fetches the tests of every run and publishes one result per test, the way export_tests_results
+does, then prints the request metrics.
+
+    python dev_tools/load_emulator.py --cases 50000 --suites 20 --latency 20 --server-rate-limit 1800
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from _bench import BenchConfig  # noqa: E402 pylint: disable=wrong-import-position
+from emulator import Emulator  # noqa: E402 pylint: disable=wrong-import-position
+from pytest_testrail_client.model.plan import Entry, Plan  # noqa: E402 pylint: disable=wrong-import-position
+from pytest_testrail_client.model.result import Result  # noqa: E402 pylint: disable=wrong-import-position
+from pytest_testrail_client.testrail_api import TestRailAPI  # noqa: E402 pylint: disable=wrong-import-position
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cases', type=int, default=5000)
+    parser.add_argument('--suites', type=int, default=10)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--latency', type=float, default=20, help='server latency in milliseconds')
+    parser.add_argument('--page-size', type=int, default=250)
+    parser.add_argument('--server-rate-limit', type=float, default=None, help='requests per minute of the server')
+    parser.add_argument('--client-rate-limit', type=float, default=None, help='testrail-rate-limit of the client')
+    # only reads fail: writes without a way to check they went through are not retried
+    parser.add_argument('--error-rate', type=float, default=0.0, help='share of reads answered HTTP 503')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    emulator = Emulator(latency=args.latency / 1000, page_size=args.page_size, rate_limit=args.server_rate_limit,
+                        error_rate=args.error_rate, error_methods=('GET',), seed=1)
+    project_id = emulator.seed(suites=args.suites, cases=args.cases)
+    tr = TestRailAPI(BenchConfig(emulator.serve(), testrail_max_workers=args.workers,
+                                 testrail_rate_limit=args.client_rate_limit, testrail_retry_backoff=0.1))
+    started = time.perf_counter()
+
+    tr.metrics.start_phase('read cases')
+    suites = tr.suites.get_suites(project_id)
+    cases = tr.map(lambda suite: tr.cases.get_cases(project_id, suite_id=suite.id), suites)
+
+    tr.metrics.start_phase('add plan entries')
+    plan = tr.plans.add_plan(project_id, Plan({'name': 'Load test'}))
+    config_ids = list(tr.registry.configs(project_id).by_id)
+    tr.map(lambda suite: tr.plans.add_plan_entry(plan.id, Entry({
+        'suite_id': suite.id, 'name': suite.name, 'include_all': True, 'config_ids': config_ids[:1],
+        'runs': [{'include_all': True, 'config_ids': config_ids[:1]}]})), suites)
+
+    tr.metrics.start_phase('fetch tests')
+    runs = [run for entry in tr.plans.get_plan(plan.id).entries for run in entry.runs]
+    tests = tr.map(lambda run: tr.tests.get_tests(run.id), runs)
+
+    tr.metrics.start_phase('publish results')
+    passed = tr.registry.statuses.id_of('passed')
+    tr.map(lambda run_tests: tr.results.add_results(run_tests[0].id, [
+        Result({'test_id': test.id, 'status_id': passed, 'comment': ''}) for test in run_tests[1]]),
+        list(zip(runs, tests)))
+    tr.metrics.end_phase()
+    seconds = time.perf_counter() - started
+
+    requests = sum(endpoint['count'] for endpoint in tr.metrics.endpoints.values())
+    print('\n'.join(tr.metrics.report()))
+    print(f'\n{sum(map(len, cases))} cases, {sum(map(len, tests))} results: {requests} requests in {seconds:.2f}s '
+          f'({requests / seconds:.1f} requests/s), {emulator.throttled} throttled, {emulator.failed} failed')
+    emulator.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+TestRail API categories for asyncio
+
+Every category of _category is mirrored with coroutine methods. The category code itself is shared: it runs
+in a worker thread against a blocking bridge that hands each request back to the event loop, where it is
+sent by the AsyncSession under its concurrency semaphore.
+"""
+import asyncio
+import functools
+import inspect
+
+from pytest_testrail_client import _category
+from pytest_testrail_client._session import Session
+
+
+class _Bridge:
+    """Blocking facade of an AsyncSession for category code running outside the event loop"""
+
+    def __init__(self, session, loop) -> None:
+        self._session = session
+        self._loop = loop
+        self._max_workers = session._max_concurrency  # pylint: disable=protected-access
+        self.compact_models = session.compact_models
+
+    def _wait(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def request(self, *args, **kwargs):
+        return self._wait(self._session.request(*args, **kwargs))
+
+    def attachment_request(self, *args, **kwargs):
+        return self._wait(self._session.attachment_request(*args, **kwargs))
+
+    def get_attachment(self, *args, **kwargs):
+        return self._wait(self._session.get_attachment(*args, **kwargs))
+
+    # fan-out of the category code, each call blocks a worker thread while its requests run on the event loop
+    map = Session.map
+
+
+class AsyncBaseCategory:
+
+    _category = _category.BaseCategory
+
+    def __init__(self, session) -> None:
+        self._session = session
+
+    async def _run(self, method, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        category = self._category(_Bridge(self._session, loop))
+
+        def call():
+            result = method(category, *args, **kwargs)
+            # iter_* generators are drained in the worker thread, the event loop is never blocked
+            return list(result) if inspect.isgenerator(result) else result
+
+        return await loop.run_in_executor(self._session.executor, call)
+
+
+def _coroutine(method):
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        return await self._run(method, *args, **kwargs)
+
+    return wrapper
+
+
+def _mirror(category):
+    namespace = {'_category': category, '__doc__': category.__doc__}
+    for name, method in inspect.getmembers(category, inspect.isfunction):
+        if not name.startswith('_'):
+            namespace[name] = _coroutine(method)
+    return type(category.__name__, (AsyncBaseCategory,), namespace)
+
+
+Attachments = _mirror(_category.Attachments)
+Cases = _mirror(_category.Cases)
+CaseFields = _mirror(_category.CaseFields)
+CaseTypes = _mirror(_category.CaseTypes)
+Configurations = _mirror(_category.Configurations)
+Milestones = _mirror(_category.Milestones)
+Plans = _mirror(_category.Plans)
+Priorities = _mirror(_category.Priorities)
+Projects = _mirror(_category.Projects)
+Results = _mirror(_category.Results)
+ResultFields = _mirror(_category.ResultFields)
+Runs = _mirror(_category.Runs)
+Sections = _mirror(_category.Sections)
+Statuses = _mirror(_category.Statuses)
+Suites = _mirror(_category.Suites)
+Templates = _mirror(_category.Templates)
+Tests = _mirror(_category.Tests)
+Users = _mirror(_category.Users)
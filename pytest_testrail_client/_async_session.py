@@ -0,0 +1,247 @@
+"""Base asyncio session"""
+
+import asyncio
+import logging
+import time
+from pathlib import Path
+from typing import Callable
+from urllib.parse import urlencode
+
+from . import _json
+from ._enums import METHODS
+from ._attachment import CHUNK_SIZE
+from ._exception import StatusCodeError, TestRailError
+from ._metrics import Metrics
+from ._session import RATE_LIMIT_STATUS_CODE, RATE_LIMIT_TIMEOUT, Session, _as_bool, _credentials, _get_option, \
+    _rate_limiter
+
+try:
+    import aiohttp
+    import yarl
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+LOGGER = logging.getLogger(__package__)
+
+DEFAULT_CONCURRENCY = 8
+
+
+class AsyncSession:
+    """Base asyncio Session"""
+
+    _user_agent = Session._user_agent
+
+    def __init__(self, config, exc: bool = False, rate_limit: bool = True,
+                 max_concurrency: int = DEFAULT_CONCURRENCY, **kwargs) -> None:
+        """
+        :param config:
+            pytest config holding TestRail url, email and key
+        :param exc:
+            Catching exceptions
+        :param rate_limit:
+            Wait and retry on HTTP 429
+        :param max_concurrency:
+            Maximum number of requests in flight at once
+        :param kwargs:
+            :key timeout: int (default: 30)
+            :key verify: bool (default: True)
+            :key headers: dict
+            :key metrics: Metrics - request instrumentation shared with other sessions
+        """
+        if aiohttp is None:
+            raise TestRailError("AsyncTestRailAPI requires aiohttp. Install it with 'pip install aiohttp'")
+        _url, _email, _key = _credentials(config)
+        self.__base_url = "{}/index.php?/api/v2/".format(_url)
+        self.__user_email = _email
+        self.__auth = aiohttp.BasicAuth(_email, _key)
+        self.__timeout = aiohttp.ClientTimeout(total=kwargs.get("timeout", 30))
+        self.__headers = {"User-Agent": self._user_agent, **kwargs.get("headers", {})}
+        self.__verify = kwargs.get("verify", True)
+        self.__exc = exc
+        self._rate_limit = rate_limit
+        self._limiter = _rate_limiter(config, _url) if rate_limit else None
+        self._max_concurrency = max_concurrency
+        self.__session = None
+        self.__semaphore = None
+        self.__resume_at = 0.0
+        self.metrics = kwargs.get("metrics") if kwargs.get("metrics") is not None else Metrics()
+        self.compact_models = _as_bool(_get_option(config, "testrail-compact-models", False))
+        self.__flights = dict()
+        LOGGER.info(
+            "Create AsyncSession{url: %s, user: %s, max_concurrency: %s, verify: %s, exception: %s}",
+            _url,
+            self.__user_email,
+            self._max_concurrency,
+            self.__verify,
+            self.__exc,
+        )
+
+    @property
+    def user_email(self) -> str:
+        """Get user email"""
+        return self.__user_email
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the underlying HTTP client"""
+        if self.__session is not None:
+            await self.__session.close()
+            self.__session = None
+
+    def _client(self):
+        # created lazily, aiohttp binds the client and the semaphore to the running event loop
+        if self.__session is None:
+            self.__session = aiohttp.ClientSession(
+                auth=self.__auth,
+                headers=self.__headers,
+                timeout=self.__timeout,
+                connector=aiohttp.TCPConnector(limit=self._max_concurrency, ssl=None if self.__verify else False),
+            )
+            self.__semaphore = asyncio.Semaphore(self._max_concurrency)
+        return self.__session
+
+    async def __throttle(self) -> None:
+        # every task waits out the retry-after window announced by any other task
+        loop = asyncio.get_running_loop()
+        while self.__resume_at > loop.time():
+            await asyncio.sleep(self.__resume_at - loop.time())
+        if self._limiter:
+            # the state file lock blocks, it is taken off the event loop
+            await asyncio.sleep(await loop.run_in_executor(None, self._limiter.reserve))
+
+    def __response(self, response, body: bytes):
+        if response.status >= 400:
+            LOGGER.error(
+                "Code: %s, reason: %s url: %s, content: %s",
+                response.status,
+                response.reason,
+                response.url,
+                body,
+            )
+            if not self.__exc:
+                raise StatusCodeError(response.status, response.reason, response.url, body)
+
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            LOGGER.debug("Response body: %s", body.decode("utf-8", "replace"))
+        if not body:
+            return None
+        try:
+            return _json.loads(body)
+        except ValueError:
+            return body.decode("utf-8") or None
+
+    @staticmethod
+    def _query(params: dict) -> str:
+        # TestRail routes on the raw query string (index.php?/api/v2/<src>&key=value), so it is built by hand
+        return urlencode({key: ",".join([str(i) for i in value]) if isinstance(value, list) else value
+                          for key, value in params.items() if value is not None})
+
+    @staticmethod
+    def _form(files: dict):
+        form = aiohttp.FormData()
+        for name, file in files.items():
+            form.add_field(name, file, filename=getattr(file, "name", name))
+        return form
+
+    async def request(self, method: METHODS, src: str, raw: bool = False,
+                      check: Callable = None, **kwargs):  # pylint: disable=unused-argument
+        """
+        Base request method, concurrent identical GETs share one request
+
+        Only HTTP 429 is retried here, a request the server turned down before processing it,
+        so the check of an add_* write (see Session.request) is not needed and not called.
+        """
+        if method is not METHODS.GET or raw:
+            return await self.__request(method, src, raw, **kwargs)
+        key = (src, tuple(sorted(self._query(kwargs.get("params") or {}).split("&"))))
+        flight = self.__flights.get(key)
+        if flight is not None:
+            self.metrics.share(src)
+            return _json.loads(await asyncio.shield(flight))
+        flight = self.__flights[key] = asyncio.get_running_loop().create_future()
+        try:
+            result = await self.__request(method, src, raw, **kwargs)
+        except asyncio.CancelledError:
+            flight.cancel()
+            raise
+        except Exception as err:
+            flight.set_exception(err)
+            flight.exception()  # retrieved, asyncio does not report it when no task waits for it
+            raise
+        else:
+            # serialized before the caller gets the result, the waiters never see it modified
+            flight.set_result(_json.dumps(result))
+        finally:
+            del self.__flights[key]
+        return result
+
+    async def __request(self, method: METHODS, src: str, raw: bool = False, **kwargs):
+        query = self._query(kwargs.pop("params", None) or {})
+        url = yarl.URL("{}{}{}".format(self.__base_url, src, "&" + query if query else ""), encoded=True)
+        client = self._client()
+        files = kwargs.pop("files", None)
+        if files is None:
+            headers = kwargs.setdefault("headers", {})
+            headers.update({"Content-Type": "application/json"})
+            if "json" in kwargs:
+                body = kwargs.pop("json")
+                kwargs["data"] = body if isinstance(body, (bytes, str)) else _json.dumps(body)
+
+        iterations = 3
+        for count in range(iterations):
+            if files is not None:
+                # a form is consumed by the request, it is built again from the start of the files for a retry
+                for file in files.values():
+                    file.seek(0)
+                kwargs["data"] = self._form(files)
+            await self.__throttle()
+            async with self.__semaphore:
+                start = time.perf_counter()
+                try:
+                    async with client.request(method.value, url, **kwargs) as response:
+                        body = await response.read()
+                except Exception as err:
+                    self.metrics.record(src, time.perf_counter() - start)
+                    LOGGER.error("%s", err, exc_info=True)
+                    raise
+                data = kwargs.get("data")
+                self.metrics.record(src, time.perf_counter() - start,
+                                    sent=len(data) if isinstance(data, (bytes, str)) else 0,
+                                    received=len(body), status=response.status)
+            if self._rate_limit and response.status == RATE_LIMIT_STATUS_CODE:
+                delay = float(response.headers.get("retry-after", RATE_LIMIT_TIMEOUT))
+                if self._limiter:
+                    await asyncio.get_running_loop().run_in_executor(None, self._limiter.penalize, delay)
+                self.__resume_at = max(self.__resume_at, asyncio.get_running_loop().time() + delay)
+                if count < iterations - 1:
+                    self.metrics.retry(src)
+                    continue
+            elif self._limiter:
+                self._limiter.reward()
+            LOGGER.debug("Response header: %s", response.headers)
+            return response if raw else self.__response(response, body)
+
+    async def attachment_request(self, method: METHODS, src: str, file, **kwargs):
+        """Sends attach, streamed from disk"""
+        with Path(file).open("rb") as attachment:
+            return await self.request(method, src, files={"attachment": attachment}, **kwargs)
+
+    async def get_attachment(self, method: METHODS, src: str, file, **kwargs) -> Path:
+        """Downloads attach, streamed to disk"""
+        file = Path(file)
+        client = self._client()
+        await self.__throttle()
+        async with self.__semaphore:
+            url = yarl.URL("{}{}".format(self.__base_url, src), encoded=True)
+            async with client.request(method.value, url, **kwargs) as response:
+                if response.status >= 400:
+                    return self.__response(response, await response.read())
+                with file.open("wb") as attachment:
+                    async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                        attachment.write(chunk)
+        return file
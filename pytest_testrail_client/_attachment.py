@@ -0,0 +1,79 @@
+"""Streaming of attachments from and to disk"""
+
+import hashlib
+import mimetypes
+import uuid
+from pathlib import Path
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def file_digest(path: Path) -> str:
+    """sha256 of the content of a file, read chunk by chunk"""
+    digest = hashlib.sha256()
+    with path.open('rb') as file:
+        for chunk in iter(lambda: file.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class MultipartFile:
+    """
+    multipart/form-data body of one file, read from disk while it is sent instead of being loaded in memory.
+    Its length is known upfront, so it is sent with a Content-Length; seek(0) rewinds it for a retry.
+    """
+
+    def __init__(self, path: Path, field: str = 'attachment') -> None:
+        boundary = uuid.uuid4().hex
+        content_type = mimetypes.guess_type(path.name)[0] or 'application/octet-stream'
+        self.content_type = f'multipart/form-data; boundary={boundary}'
+        self._head = (f'--{boundary}\r\nContent-Disposition: form-data; name="{field}"; filename="{path.name}"\r\n'
+                      f'Content-Type: {content_type}\r\n\r\n').encode('utf-8')
+        self._tail = f'\r\n--{boundary}--\r\n'.encode('utf-8')
+        self._size = path.stat().st_size
+        self._file = path.open('rb')
+        self._position = 0
+
+    def __len__(self) -> int:
+        return len(self._head) + self._size + len(self._tail)
+
+    def __iter__(self):
+        return iter(lambda: self.read(CHUNK_SIZE), b'')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        if offset != 0 or whence != 0:
+            raise ValueError('MultipartFile only rewinds to the start')
+        self._position = 0
+        self._file.seek(0)
+        return 0
+
+    def read(self, size: int = -1) -> bytes:
+        remaining = len(self) - self._position
+        size = remaining if size is None or size < 0 else min(size, remaining)
+        parts = []
+        while size > 0:
+            if self._position < len(self._head):
+                part = self._head[self._position:self._position + size]
+            elif self._position < len(self._head) + self._size:
+                part = self._file.read(min(size, len(self._head) + self._size - self._position))
+            else:
+                start = self._position - len(self._head) - self._size
+                part = self._tail[start:start + size]
+            if not part:
+                break
+            parts.append(part)
+            self._position += len(part)
+            size -= len(part)
+        return b''.join(parts)
+
+    def close(self) -> None:
+        self._file.close()
@@ -0,0 +1,127 @@
+"""Persistent cache of slow changing TestRail endpoints"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Union
+
+from . import _json
+
+LOGGER = logging.getLogger(__package__)
+
+MISS = object()
+
+HOUR = 60 * 60
+DAY = 24 * HOUR
+
+# seconds a response stays valid, by endpoint; other endpoints are never cached
+TTLS = {
+    'get_project': DAY,
+    'get_projects': HOUR,
+    'get_suite': HOUR,
+    'get_suites': HOUR,
+    'get_section': HOUR,
+    'get_sections': HOUR,
+    'get_configs': HOUR,
+    'get_statuses': DAY,
+    'get_priorities': DAY,
+    'get_templates': DAY,
+    'get_case_types': DAY,
+    'get_case_fields': DAY,
+    'get_result_fields': DAY,
+}
+
+# cached endpoints made stale by add_*, update_* and delete_* of an object
+INVALIDATES = {
+    'project': ('get_project', 'get_projects', 'get_suite', 'get_suites', 'get_section', 'get_sections',
+                'get_configs', 'get_templates'),
+    'suite': ('get_suite', 'get_suites', 'get_section', 'get_sections'),
+    'section': ('get_section', 'get_sections'),
+    'config': ('get_configs',),
+    'config_group': ('get_configs',),
+    'case_field': ('get_case_fields', 'get_templates'),
+}
+
+
+def endpoint(src: str) -> str:
+    """Endpoint name of a request source, e.g. get_sections/1&suite_id=2 -> get_sections"""
+    return src.split('/', 1)[0].split('&', 1)[0]
+
+
+def parse_ttls(value: str) -> dict:
+    """TTLs from 'get_sections=600, get_statuses=86400'"""
+    ttls = dict()
+    for item in (value or '').split(','):
+        if '=' in item:
+            name, seconds = item.split('=', 1)
+            ttls[name.strip()] = float(seconds)
+    return ttls
+
+
+class ResponseCache:
+    """
+    SQLite store of decoded responses, keyed by TestRail instance, user, endpoint and parameters.
+    Shared by every pytest invocation (and xdist worker) of the project.
+    """
+
+    def __init__(self, path: Union[Path, str], namespace: str, ttls: dict = None) -> None:
+        """
+        :param path: SQLite database file
+        :param namespace: Scope of the entries, e.g. TestRail url and user
+        :param ttls: Overrides of the TTLS, 0 disables caching of an endpoint
+        """
+        self._namespace = namespace
+        self._ttls = dict(TTLS, **(ttls or {}))
+        self._lock = threading.Lock()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(path), timeout=30, check_same_thread=False, isolation_level=None)
+        self._db.execute('CREATE TABLE IF NOT EXISTS responses '
+                         '(key TEXT PRIMARY KEY, endpoint TEXT, expires REAL, body BLOB)')
+        self._db.execute('CREATE INDEX IF NOT EXISTS responses_endpoint ON responses (endpoint)')
+
+    def cacheable(self, src: str) -> bool:
+        return bool(self._ttls.get(endpoint(src)))
+
+    def _key(self, src: str, params: dict) -> str:
+        query = json.dumps(params or {}, sort_keys=True, default=str)
+        return hashlib.sha256('{} {} {}'.format(self._namespace, src, query).encode()).hexdigest()
+
+    def get(self, src: str, params: dict = None):
+        """Cached response, MISS if absent or expired"""
+        with self._lock:
+            row = self._db.execute('SELECT expires, body FROM responses WHERE key = ?',
+                                   (self._key(src, params),)).fetchone()
+        if row is None or row[0] < time.time():
+            return MISS
+        LOGGER.debug('Cache hit %s %s', src, params)
+        return _json.loads(row[1])
+
+    def put(self, src: str, params: dict, response) -> None:
+        name = endpoint(src)
+        with self._lock:
+            self._db.execute('INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)',
+                             (self._key(src, params), '{} {}'.format(self._namespace, name),
+                              time.time() + self._ttls[name], _json.dumps(response)))
+
+    def invalidate(self, src: str) -> None:
+        """Drops the responses made stale by the write request src, e.g. add_section/1"""
+        name = endpoint(src)
+        for prefix in ('add_', 'update_', 'delete_'):
+            if name.startswith(prefix):
+                stale = INVALIDATES.get(name[len(prefix):], ())
+                break
+        else:
+            return
+        if stale:
+            LOGGER.debug('Cache invalidated %s by %s', stale, src)
+            with self._lock:
+                self._db.executemany('DELETE FROM responses WHERE endpoint = ?',
+                                     [('{} {}'.format(self._namespace, name),) for name in stale])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute('DELETE FROM responses')
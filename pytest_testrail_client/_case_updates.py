@@ -0,0 +1,155 @@
+"""Batching of the case updates of an export into bulk requests, skipping the cases unchanged since the last one"""
+
+import hashlib
+import json
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from pytest_testrail_client.model.case import Case
+
+# fields update_cases does not change, cases changing them are updated one by one
+NOT_BULK_FIELDS = ('section_id', 'suite_id')
+
+
+def _same(new, old) -> bool:
+    """True if the exported value new leaves the TestRail value old as it is"""
+    if new == old or (new in (None, '') and old in (None, '')):
+        return True
+    if isinstance(new, list) and isinstance(old, list):
+        return len(new) == len(old) and all(_same(item, old_item) for item, old_item in zip(new, old))
+    if isinstance(new, dict) and isinstance(old, dict):
+        # TestRail adds fields of its own, e.g. to the separated steps
+        return all(_same(value, old.get(key)) for key, value in new.items())
+    return new is not None and old is not None and str(new) == str(old)
+
+
+def case_digest(case: Case) -> str:
+    """Stable hash of the exported fields of a case"""
+    content = json.dumps(case.raw_data(), sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+class SyncManifest:
+    """
+    Hash of the exported fields and TestRail updated_on of each case as of the last export, kept in the pytest
+    cache per TestRail instance and project
+    """
+
+    def __init__(self, cache, url: str, project_id: int) -> None:
+        self._cache = cache
+        self._key = f'testrail/manifest-{project_id}'
+        self._url = url
+        stored = cache.get(self._key, None) or dict()
+        # a manifest of another TestRail instance knows other cases under the same IDs
+        self._cases: Dict[str, dict] = stored.get('cases', dict()) if stored.get('url') == url else dict()
+
+    def __len__(self) -> int:
+        return len(self._cases)
+
+    def get(self, case_id: int) -> Optional[dict]:
+        """{'hash': ..., 'updated_on': ...} of a case, None if it was not exported yet"""
+        return self._cases.get(str(case_id))
+
+    def record(self, case_id: int, digest: str, updated_on: Optional[int]) -> None:
+        self._cases[str(case_id)] = {'hash': digest, 'updated_on': updated_on}
+
+    def discard(self, case_id: int) -> None:
+        self._cases.pop(str(case_id), None)
+
+    def save(self) -> None:
+        self._cache.set(self._key, {'url': self._url, 'cases': self._cases})
+
+
+class CaseUpdates:
+    """
+    Case updates collected during an export and sent on flush: only the fields which differ from TestRail are
+    sent, cases with the same changes share update_cases requests and unchanged cases are not sent at all.
+    With a manifest, cases exported unchanged since the last export are not even compared, unless TestRail
+    updated them since (drift).
+    """
+
+    def __init__(self, tr, project_id: int, manifest: SyncManifest = None) -> None:
+        self._tr = tr
+        self._project_id = project_id
+        self._manifest = manifest
+        self._pending: Dict[int, Dict[int, Case]] = defaultdict(dict)
+        self._skipped: Dict[int, Dict[int, Case]] = defaultdict(dict)
+        self.counts = dict.fromkeys(('created', 'updated', 'skipped', 'drifted'), 0)
+
+    def __len__(self) -> int:
+        return sum(map(len, self._pending.values())) + sum(map(len, self._skipped.values()))
+
+    def add(self, case_id: int, case: Case) -> None:
+        case_id = int(case_id)
+        synced = self._manifest.get(case_id) if self._manifest is not None else None
+        if synced is not None and synced['updated_on'] is not None and synced['hash'] == case_digest(case):
+            self._skipped[case.suite_id][case_id] = case
+        else:
+            self._pending[case.suite_id][case_id] = case
+
+    def created(self, case: Case, tr_case: Case) -> None:
+        """Records a case added to TestRail as tr_case"""
+        self.counts['created'] += 1
+        if self._manifest is not None:
+            self._manifest.record(tr_case.id, case_digest(case), tr_case.raw_data().get('updated_on'))
+
+    def _drifted(self, suite_id: int, cases: Dict[int, Case]) -> Dict[int, Case]:
+        """Cases updated in TestRail since their last export, one get_cases request per suite"""
+        synced = {case_id: self._manifest.get(case_id)['updated_on'] for case_id in cases}
+        updated = self._tr.cases.iter_cases(self._project_id, suite_id=suite_id, updated_after=min(synced.values()))
+        return {case.id: cases[case.id] for case in updated
+                if case.id in cases and (case.raw_data().get('updated_on') or 0) > synced[case.id]}
+
+    def _changes(self, suite_id: int, cases: Dict[int, Case]) -> Dict[str, List[int]]:
+        """IDs of the cases by JSON of their changed fields, the changes of unknown cases are all their fields"""
+        current = {case.id: case.raw_data() for case in self._tr.cases.iter_cases(self._project_id, suite_id=suite_id)}
+        changes = defaultdict(list)
+        for case_id, case in cases.items():
+            old = current.get(case_id)
+            fields = {key: value for key, value in case.raw_data().items()
+                      if old is None or not _same(value, old.get(key))}
+            if fields:
+                changes[json.dumps(fields, sort_keys=True, ensure_ascii=False)].append(case_id)
+            elif self._manifest is not None:
+                self._manifest.record(case_id, case_digest(case), old.get('updated_on'))
+        return changes
+
+    def _record(self, cases: Dict[int, Case], updated) -> None:
+        """Records the cases TestRail returned from update_case or update_cases"""
+        for tr_case in updated if isinstance(updated, list) else [updated]:
+            if tr_case.id in cases:
+                self._manifest.record(tr_case.id, case_digest(cases[tr_case.id]), tr_case.raw_data().get('updated_on'))
+
+    def flush(self) -> None:
+        pending, self._pending = self._pending, defaultdict(dict)
+        skipped, self._skipped = self._skipped, defaultdict(dict)
+        calls, exported = list(), dict()
+        for suite_id in list(pending) + [suite_id for suite_id in skipped if suite_id not in pending]:
+            cases, unchanged = pending.get(suite_id, dict()), skipped.get(suite_id, dict())
+            drifted = self._drifted(suite_id, unchanged) if unchanged else dict()
+            if drifted:
+                print(f'{len(drifted)} cases of suite {suite_id} changed in TestRail since the last export')
+                cases = {**cases, **drifted}
+            self.counts['skipped'] += len(unchanged) - len(drifted)
+            self.counts['drifted'] += len(drifted)
+            if not cases:
+                continue
+            exported.update(cases)
+            changes = self._changes(suite_id, cases)
+            updated = sum(map(len, changes.values()))
+            self.counts['updated'] += updated
+            self.counts['skipped'] += len(cases) - updated
+            print(f'Updating {updated} cases of suite {suite_id} in TestRail, {len(cases) - updated} unchanged')
+            for fields, case_ids in changes.items():
+                fields = json.loads(fields)
+                if len(case_ids) == 1 or any(field in fields for field in NOT_BULK_FIELDS):
+                    calls.extend((self._tr.cases.update_case, case_id, Case(dict(fields))) for case_id in case_ids)
+                else:
+                    calls.append((self._tr.cases.update_cases, suite_id, case_ids, fields))
+        for updated in self._tr.map(lambda call: call[0](*call[1:]), calls):
+            if self._manifest is not None:
+                self._record(exported, updated)
+        if self._manifest is not None:
+            self._manifest.save()
+        print('Exported cases: {created} created, {updated} updated, {skipped} skipped, {drifted} drifted'.format(
+            **self.counts))
@@ -0,0 +1,169 @@
+"""Recording and replay of the TestRail traffic, to reproduce exports offline"""
+
+import base64
+import gzip
+import hashlib
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from os import environ
+from pathlib import Path
+from typing import Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from ._exception import TestRailError
+
+API_PREFIX = '/api/v2/'
+# response headers kept in the cassette, the others are not used by the client
+HEADERS = ('Content-Type', 'Retry-After')
+
+# cassettes by directory, see shared_cassette
+_CASSETTES = dict()
+_CASSETTES_LOCK = threading.Lock()
+
+
+def _src(url: str) -> str:
+    """Request source independent of the TestRail address, e.g. get_tests/1&offset=250"""
+    return url.split(API_PREFIX, 1)[-1]
+
+
+def _key(request: requests.PreparedRequest) -> str:
+    body = request.body
+    if 'multipart/form-data' in request.headers.get('Content-Type', ''):
+        # the random boundary makes uploads unique, they are matched on the endpoint only
+        body = None
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    if body and request.headers.get('Content-Encoding') == 'gzip':
+        # matched on the content, whether it was sent compressed or not
+        body = gzip.decompress(body)
+    digest = hashlib.sha256(body or b'').hexdigest()
+    return hashlib.sha256('{} {} {}'.format(request.method, _src(request.url), digest).encode()).hexdigest()
+
+
+class Cassette:
+    """
+    Request / response pairs, one JSON line each, keyed by hash of method, endpoint, params and body.
+    Pairs recorded for the same key are replayed in order, the last one is repeated once they are used up.
+    """
+
+    def __init__(self, directory: Union[Path, str]) -> None:
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+        self._file = None
+        # the file is truncated when first opened, then appended to, e.g. after an adapter was closed
+        self._mode = 'w'
+        self._entries = None
+
+    def record(self, request: requests.PreparedRequest, response: requests.Response) -> None:
+        content = response.content
+        try:
+            body = {'body': content.decode('utf-8')}
+        except UnicodeDecodeError:
+            body = {'body_b64': base64.b64encode(content).decode('ascii')}
+        line = json.dumps(dict({
+            'key': _key(request),
+            'method': request.method,
+            'src': _src(request.url),
+            'status': response.status_code,
+            'reason': response.reason,
+            'headers': {name: response.headers[name] for name in HEADERS if name in response.headers},
+        }, **body), separators=(',', ':'))
+        with self._lock:
+            if self._file is None:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                worker = environ.get('PYTEST_XDIST_WORKER', 'main')
+                self._file = (self.directory / 'cassette-{}.jsonl'.format(worker)).open(self._mode, encoding='utf-8')
+                self._mode = 'a'
+            self._file.write(line + '\n')
+            self._file.flush()
+
+    def _load(self) -> dict:
+        entries = defaultdict(deque)
+        files = sorted(self.directory.glob('cassette-*.jsonl'))
+        if not files:
+            raise TestRailError(f'No cassette found in {self.directory}')
+        for path in files:
+            with path.open(encoding='utf-8') as file:
+                for line in file:
+                    if line.strip():
+                        entry = json.loads(line)
+                        entries[entry['key']].append(entry)
+        return entries
+
+    def play(self, request: requests.PreparedRequest) -> dict:
+        with self._lock:
+            if self._entries is None:
+                self._entries = self._load()
+            recorded = self._entries.get(_key(request))
+            if not recorded:
+                raise TestRailError(f'No recorded response for {request.method} {_src(request.url)}')
+            return recorded.popleft() if len(recorded) > 1 else recorded[0]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def shared_cassette(directory: Union[Path, str]) -> Cassette:
+    """
+    Cassette of directory shared by the sessions of the process: the session of the sessionfinish hook records after
+    the one of sessionstart instead of overwriting it, and replays where it stopped
+    """
+    key = Path(directory).resolve()
+    with _CASSETTES_LOCK:
+        if key not in _CASSETTES:
+            _CASSETTES[key] = Cassette(directory)
+        return _CASSETTES[key]
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Sends requests over the network and writes every exchange to a cassette"""
+
+    def __init__(self, cassette: Cassette, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.cassette = cassette
+
+    def send(self, request, **kwargs):  # pylint: disable=arguments-differ
+        response = super().send(request, **kwargs)
+        self.cassette.record(request, response)
+        return response
+
+    def close(self) -> None:
+        super().close()
+        self.cassette.close()
+
+
+class ReplayAdapter(HTTPAdapter):
+    """Serves the responses of a cassette without touching the network"""
+
+    def __init__(self, cassette: Cassette, latency: float = 0.0, **kwargs) -> None:
+        """
+        :param cassette: Recorded exchanges
+        :param latency: Seconds added to every response, to emulate the server
+        """
+        super().__init__(**kwargs)
+        self.cassette = cassette
+        self.latency = latency
+
+    def send(self, request, **kwargs):  # pylint: disable=arguments-differ
+        entry = self.cassette.play(request)
+        if self.latency:
+            time.sleep(self.latency)
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.reason = entry.get('reason')
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response.encoding = 'utf-8'
+        content = entry['body'].encode('utf-8') if 'body' in entry else base64.b64decode(entry['body_b64'])
+        response._content = content  # pylint: disable=protected-access
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
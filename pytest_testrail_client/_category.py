@@ -1,17 +1,25 @@
 """
 TestRail API categories
 """
-import json
-from typing import List
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, Iterator, List, Tuple, Union
 
+from pytest_testrail_client import _json
+from pytest_testrail_client._attachment import file_digest
 from pytest_testrail_client._enums import METHODS
 from pytest_testrail_client._exception import TestRailError
+from pytest_testrail_client.helper import testrail_duration_to_timedelta
 from pytest_testrail_client.model.case import Case
 from pytest_testrail_client.model.case_type import CaseType
+from pytest_testrail_client.model.compact import COMPACT
+from pytest_testrail_client.model.frame import ResultFrame, TestFrame
 from pytest_testrail_client.model.plan import Plan, Entry
 from pytest_testrail_client.model.priority import Priority
 from pytest_testrail_client.model.project import Project
 from pytest_testrail_client.model.result import Result
+from pytest_testrail_client.model.run import Run
 from pytest_testrail_client.model.section import Section
 from pytest_testrail_client.model.status import Status
 from pytest_testrail_client.model.suite import Suite
@@ -19,11 +27,240 @@ from pytest_testrail_client.model.templates import Template
 from pytest_testrail_client.model.test import Test
 
 
+API_PREFIX = '/api/v2/'
+# tolerated difference between the local and the TestRail clock when looking up interrupted writes
+CLOCK_SKEW = 60
+# fields compared to recognize the results of an interrupted write among the results of its tests
+RESULT_MATCH_FIELDS = ('test_id', 'status_id', 'comment', 'elapsed', 'defects', 'version', 'assignedto_id')
+# case IDs per request of the bulk case endpoints
+BULK_CHUNK_SIZE = 250
+
+
+def _next_page(response: dict):
+    """Source of the next page from the `_links` of a paginated response, None for the last page"""
+    next_link = (response.get('_links') or {}).get('next')
+    if not next_link:
+        return None
+    return next_link.split(API_PREFIX, 1)[-1]
+
+
+def _seconds(duration) -> float:
+    """Seconds of a TestRail timespan, e.g. '1m 30s' or 90"""
+    if isinstance(duration, (int, float)) or str(duration).isdigit():
+        return float(duration)
+    return testrail_duration_to_timedelta(duration).total_seconds()
+
+
+def _same_result(found: dict, submitted: dict) -> bool:
+    """True if found, a result read from TestRail, holds the test and fields of the submitted result"""
+    for field in RESULT_MATCH_FIELDS:
+        value = submitted.get(field)
+        if value is None:
+            continue
+        if field == 'elapsed':
+            if not found.get('elapsed') or _seconds(value) != _seconds(found['elapsed']):
+                return False
+        elif str(value).strip() != str(found.get(field) if found.get(field) is not None else '').strip():
+            return False
+    return True
+
+
 class BaseCategory:
 
     def __init__(self, session) -> None:
         self._session = session
 
+    def _model(self, model):
+        """Compact variant of model when the session is set up with testrail-compact-models"""
+        return COMPACT.get(model, model) if getattr(self._session, 'compact_models', False) else model
+
+    def _paginate(self, src: str, key: str, model=None, params: dict = None) -> Iterator:
+        """
+        Lazily yields the items of a bulk endpoint, page by page.
+
+        Follows `_links.next` of the {offset, limit, size, _links, <key>} envelope and requests the next page
+        while the current one is consumed, so at most two pages are held in memory.
+        Flat list responses of TestRail versions prior to 6.7 are yielded as a single page.
+        :param src: The endpoint of the first page
+        :param key: The envelope key holding the items, e.g. 'cases'
+        :param model: Class the items are wrapped with, raw dicts are yielded if None
+        :param params: Filters of the first page
+        """
+        with ThreadPoolExecutor(max_workers=1) as prefetch:
+            pending = prefetch.submit(self._session.request, METHODS.GET, src, params=params or {})
+            while pending is not None:
+                response = pending.result()
+                if isinstance(response, list):
+                    items, next_src = response, None
+                else:
+                    items, next_src = response.get(key) or [], _next_page(response)
+                pending = prefetch.submit(self._session.request, METHODS.GET, next_src) if next_src else None
+                for item in items:
+                    yield model(item) if model else item
+
+
+class Attachments(BaseCategory):
+
+    # endpoint of every kind of object attachments are added to
+    TARGETS = {
+        'case': 'add_attachment_to_case',
+        'plan': 'add_attachment_to_plan',
+        'plan_entry': 'add_attachment_to_plan_entry',
+        'result': 'add_attachment_to_result',
+        'run': 'add_attachment_to_run',
+    }
+
+    def add_attachment_to_case(self, case_id: int, file: Union[Path, str]) -> dict:
+        """
+        http://docs.gurock.com/testrail-api2/reference-attachments#add_attachment_to_case
+
+        Adds an attachment to a test case, streamed from disk.
+        :param case_id: The ID of the test case
+        :param file: Path of the file to upload
+        :return: response, e.g. {"attachment_id": 443}
+        """
+        return self._session.attachment_request(METHODS.POST, f'add_attachment_to_case/{case_id}', file)
+
+    def add_attachment_to_plan(self, plan_id: int, file: Union[Path, str]) -> dict:
+        """
+        http://docs.gurock.com/testrail-api2/reference-attachments#add_attachment_to_plan
+
+        Adds an attachment to a test plan, streamed from disk.
+        :param plan_id: The ID of the test plan
+        :param file: Path of the file to upload
+        :return: response, e.g. {"attachment_id": 443}
+        """
+        return self._session.attachment_request(METHODS.POST, f'add_attachment_to_plan/{plan_id}', file)
+
+    def add_attachment_to_plan_entry(self, plan_id: int, entry_id: str, file: Union[Path, str]) -> dict:
+        """
+        http://docs.gurock.com/testrail-api2/reference-attachments#add_attachment_to_plan_entry
+
+        Adds an attachment to a test plan entry, streamed from disk.
+        :param plan_id: The ID of the test plan
+        :param entry_id: The ID of the test plan entry
+        :param file: Path of the file to upload
+        :return: response, e.g. {"attachment_id": 443}
+        """
+        return self._session.attachment_request(METHODS.POST, f'add_attachment_to_plan_entry/{plan_id}/{entry_id}',
+                                                file)
+
+    def add_attachment_to_result(self, result_id: int, file: Union[Path, str]) -> dict:
+        """
+        http://docs.gurock.com/testrail-api2/reference-attachments#add_attachment_to_result
+
+        Adds an attachment to a test result, streamed from disk.
+        :param result_id: The ID of the test result
+        :param file: Path of the file to upload
+        :return: response, e.g. {"attachment_id": 443}
+        """
+        return self._session.attachment_request(METHODS.POST, f'add_attachment_to_result/{result_id}', file)
+
+    def add_attachment_to_run(self, run_id: int, file: Union[Path, str]) -> dict:
+        """
+        http://docs.gurock.com/testrail-api2/reference-attachments#add_attachment_to_run
+
+        Adds an attachment to a test run, streamed from disk.
+        :param run_id: The ID of the test run
+        :param file: Path of the file to upload
+        :return: response, e.g. {"attachment_id": 443}
+        """
+        return self._session.attachment_request(METHODS.POST, f'add_attachment_to_run/{run_id}', file)
+
+    def add_attachments(self, target: str, attachments: Iterable[Tuple[Union[int, str], Union[Path, str]]],
+                        max_workers: int = None) -> List[dict]:
+        """
+        Uploads files concurrently, each file content once per object of the call: duplicates share the first response.
+        :param target: Kind of object the files are added to: case, plan, plan_entry, result or run
+        :param attachments: (object ID, file path) pairs, the ID of a plan entry is 'plan_id/entry_id'
+        :param max_workers: Maximum number of concurrent uploads (default: the testrail-max-workers option)
+        :return: responses in input order
+        """
+        if target not in self.TARGETS:
+            raise TestRailError(f'Attachments can only be added to {", ".join(self.TARGETS)}, not {target}')
+        attachments = [(f'{self.TARGETS[target]}/{target_id}', Path(file)) for target_id, file in attachments]
+        digests = self._session.map(lambda attachment: file_digest(attachment[1]), attachments,
+                                    max_workers=max_workers)
+        uploads = dict()
+        for (src, file), digest in zip(attachments, digests):
+            uploads.setdefault((src, digest), file)
+        responses = dict(zip(uploads, self._session.map(
+            lambda upload: self._session.attachment_request(METHODS.POST, upload[0][0], upload[1]),
+            list(uploads.items()), max_workers=max_workers)))
+        return [responses[(src, digest)] for (src, _), digest in zip(attachments, digests)]
+
+    def get_attachments_for_case(self, case_id: int) -> List[dict]:
+        """
+        http://docs.gurock.com/testrail-api2/reference-attachments#get_attachments_for_case
+
+        Returns a list of attachments for a test case.
+        :param case_id: The ID of the test case
+        :return: response
+        """
+        return list(self._paginate(f'get_attachments_for_case/{case_id}', 'attachments'))
+
+    def get_attachments_for_plan(self, plan_id: int) -> List[dict]:
+        """
+        http://docs.gurock.com/testrail-api2/reference-attachments#get_attachments_for_plan
+
+        Returns a list of attachments for a test plan.
+        :param plan_id: The ID of the test plan
+        :return: response
+        """
+        return list(self._paginate(f'get_attachments_for_plan/{plan_id}', 'attachments'))
+
+    def get_attachments_for_plan_entry(self, plan_id: int, entry_id: str) -> List[dict]:
+        """
+        http://docs.gurock.com/testrail-api2/reference-attachments#get_attachments_for_plan_entry
+
+        Returns a list of attachments for a test plan entry.
+        :param plan_id: The ID of the test plan
+        :param entry_id: The ID of the test plan entry
+        :return: response
+        """
+        return list(self._paginate(f'get_attachments_for_plan_entry/{plan_id}/{entry_id}', 'attachments'))
+
+    def get_attachments_for_run(self, run_id: int) -> List[dict]:
+        """
+        http://docs.gurock.com/testrail-api2/reference-attachments#get_attachments_for_run
+
+        Returns a list of attachments for a test run.
+        :param run_id: The ID of the test run
+        :return: response
+        """
+        return list(self._paginate(f'get_attachments_for_run/{run_id}', 'attachments'))
+
+    def get_attachments_for_test(self, test_id: int) -> List[dict]:
+        """
+        http://docs.gurock.com/testrail-api2/reference-attachments#get_attachments_for_test
+
+        Returns a list of attachments for the results of a test.
+        :param test_id: The ID of the test
+        :return: response
+        """
+        return list(self._paginate(f'get_attachments_for_test/{test_id}', 'attachments'))
+
+    def get_attachment(self, attachment_id: int, path: Union[Path, str]) -> Path:
+        """
+        http://docs.gurock.com/testrail-api2/reference-attachments#get_attachment
+
+        Downloads an attachment, streamed to disk.
+        :param attachment_id: The ID of the attachment
+        :param path: Path of the downloaded file
+        :return: path
+        """
+        return self._session.get_attachment(METHODS.GET, f'get_attachment/{attachment_id}', path)
+
+    def delete_attachment(self, attachment_id: int):
+        """
+        http://docs.gurock.com/testrail-api2/reference-attachments#delete_attachment
+
+        Deletes an attachment.
+        :param attachment_id: The ID of the attachment
+        :return: response
+        """
+        return self._session.request(METHODS.POST, f'delete_attachment/{attachment_id}')
+
 
 class Cases(BaseCategory):
 
@@ -36,7 +273,7 @@ class Cases(BaseCategory):
         :return: response
         """
         response = self._session.request(METHODS.GET, f'get_case/{case_id}')
-        return Case(response)
+        return self._model(Case)(response)
 
     def get_cases(self, project_id: int, **kwargs) -> List[Case]:
         """
@@ -48,8 +285,19 @@ class Cases(BaseCategory):
             :key section_id: int - The ID of the section (optional)
         :return: response
         """
-        response = self._session.request(METHODS.GET, f'get_cases/{project_id}', params=kwargs)
-        return [Case(rsp) for rsp in response]
+        return list(self.iter_cases(project_id, **kwargs))
+
+    def iter_cases(self, project_id: int, **kwargs) -> Iterator[Case]:
+        """
+        http://docs.gurock.com/testrail-api2/reference-cases#get_cases
+
+        Lazily yields the test cases of a test suite or specific section in a test suite, following pagination.
+        :param project_id: The ID of the project
+            :key suite_id: int - The ID of the test suite (optional if the project is operating in single suite mode)
+            :key section_id: int - The ID of the section (optional)
+        :return: generator of Case
+        """
+        return self._paginate(f'get_cases/{project_id}', 'cases', self._model(Case), kwargs)
 
     def add_case(self, section_id: int, case: Case) -> Case:
         """
@@ -68,11 +316,24 @@ class Cases(BaseCategory):
         :return: response
         """
         data = case.raw_data()
-        response = self._session.request(METHODS.POST, f'add_case/{section_id}', json=data)
+        since = int(time.time()) - CLOCK_SKEW
+        response = self._session.request(METHODS.POST, f'add_case/{section_id}', json=data,
+                                         check=lambda: self._added_case(section_id, case, since))
         if 'error' in response:
             raise TestRailError('Case add failed with error: %s' % response['error'])
         return Case(response)
 
+    def _added_case(self, section_id: int, case: Case, since: int):
+        """The case created by an interrupted add_case, None if it was not created"""
+        suite_id = case.suite_id or self._session.request(METHODS.GET, f'get_section/{section_id}')['suite_id']
+        project_id = self._session.request(METHODS.GET, f'get_suite/{suite_id}')['project_id']
+        data = case.raw_data()
+        return next((found.raw_data() for found in self.iter_cases(project_id, suite_id=suite_id,
+                                                                     section_id=section_id)
+                     if found.raw_data().get('created_on', 0) >= since
+                     and found.title == case.title
+                     and found.raw_data().get('custom_data_set') == data.get('custom_data_set')), None)
+
     def update_case(self, case_id: int, case: Case) -> Case:
         """
         http://docs.gurock.com/testrail-api2/reference-cases#update_case
@@ -99,6 +360,56 @@ class Cases(BaseCategory):
         """
         return self._session.request(METHODS.POST, f'delete_case/{case_id}')
 
+    def update_cases(self, suite_id: int, case_ids: Iterable[int], fields: dict,
+                     max_workers: int = None) -> List[Case]:
+        """
+        http://docs.gurock.com/testrail-api2/reference-cases#update_cases
+
+        Updates the same fields of several test cases of a suite (requires TestRail 6.5.2 or later).
+        Cases are sent BULK_CHUNK_SIZE per request, the requests run concurrently.
+        :param suite_id: The ID of the suite of the test cases
+        :param case_ids: The IDs of the test cases
+        :param fields: Values of the fields to update, custom fields prefixed with 'custom_'
+        :param max_workers: Maximum number of concurrent requests (default: the testrail-max-workers option)
+        :return: updated cases
+        """
+        case_ids = list(case_ids)
+        chunks = [case_ids[start:start + BULK_CHUNK_SIZE] for start in range(0, len(case_ids), BULK_CHUNK_SIZE)]
+        responses = self._session.map(lambda chunk: self._session.request(
+            METHODS.POST, f'update_cases/{suite_id}', json=dict(fields, case_ids=chunk)), chunks,
+            max_workers=max_workers)
+        cases = list()
+        for response in responses:
+            if isinstance(response, dict) and 'error' in response:
+                raise TestRailError('Cases update failed with error: %s' % response['error'])
+            updated = response.get('updated_cases', []) if isinstance(response, dict) else response or []
+            cases.extend(Case(obj) for obj in updated)
+        return cases
+
+    def delete_cases(self, suite_id: int, case_ids: Iterable[int], soft: bool = False,
+                     max_workers: int = None) -> List[dict]:
+        """
+        http://docs.gurock.com/testrail-api2/reference-cases#delete_cases
+
+        Deletes several test cases of a suite (requires TestRail 6.5.2 or later).
+        Cases are sent BULK_CHUNK_SIZE per request, the requests run concurrently.
+        :param suite_id: The ID of the suite of the test cases
+        :param case_ids: The IDs of the test cases
+        :param soft: Only return the number of affected tests, runs and results, without deleting anything
+        :param max_workers: Maximum number of concurrent requests (default: the testrail-max-workers option)
+        :return: responses, one per chunk
+        """
+        case_ids = list(case_ids)
+        chunks = [case_ids[start:start + BULK_CHUNK_SIZE] for start in range(0, len(case_ids), BULK_CHUNK_SIZE)]
+        params = {'soft': 1} if soft else {}
+        responses = self._session.map(lambda chunk: self._session.request(
+            METHODS.POST, f'delete_cases/{suite_id}', params=dict(params), json={'case_ids': chunk}), chunks,
+            max_workers=max_workers)
+        for response in responses:
+            if isinstance(response, dict) and 'error' in response:
+                raise TestRailError('Cases deletion failed with error: %s' % response['error'])
+        return responses
+
 
 class CaseFields(BaseCategory):
 
@@ -314,8 +625,18 @@ class Plans(BaseCategory):
             :key milestone_id: int(list) - A comma-separated list of milestone IDs to filter by.
         :return: response
         """
-        response = self._session.request(METHODS.GET, f'get_plans/{project_id}', params=kwargs)
-        return [Plan(obj) for obj in response]
+        return list(self.iter_plans(project_id, **kwargs))
+
+    def iter_plans(self, project_id: int, **kwargs) -> Iterator[Plan]:
+        """
+        http://docs.gurock.com/testrail-api2/reference-plans#get_plans
+
+        Lazily yields the test plans of a project, following pagination.
+        :param project_id: The ID of the project
+        :param kwargs: filters, same as get_plans
+        :return: generator of Plan
+        """
+        return self._paginate(f'get_plans/{project_id}', 'plans', Plan, kwargs)
 
     def add_plan(self, project_id: int, plan: Plan) -> Plan:
         """
@@ -503,7 +824,7 @@ class Results(BaseCategory):
             :key status_id: int(list) - A comma-separated list of status IDs to filter by.
         :return: response
         """
-        return self._session.request(METHODS.GET, f'get_results/{test_id}', params=kwargs)
+        return list(self._paginate(f'get_results/{test_id}', 'results', params=kwargs))
 
     def get_results_for_case(self, run_id: int, case_id: int, **kwargs) -> List[Result]:
         """
@@ -543,7 +864,35 @@ class Results(BaseCategory):
             :key status_id: int(list) - A comma-separated list of status IDs to filter by.
         :return: response
         """
-        return self._session.request(METHODS.GET, f'get_results_for_run/{run_id}', params=kwargs)
+        return list(self._paginate(f'get_results_for_run/{run_id}', 'results', params=kwargs))
+
+    def iter_results_for_run(self, run_id: int, **kwargs) -> Iterator[Result]:
+        """
+        http://docs.gurock.com/testrail-api2/reference-results#get_results_for_run
+
+        Lazily yields the test results of a test run, following pagination.
+
+        :param run_id: The ID of the test run
+        :param kwargs: filters, same as get_results_for_run
+        :return: generator of Result
+        """
+        return self._paginate(f'get_results_for_run/{run_id}', 'results', self._model(Result), kwargs)
+
+    def get_results_for_run_frame(self, run_id: int, case_ids: bool = False, **kwargs) -> ResultFrame:
+        """
+        http://docs.gurock.com/testrail-api2/reference-results#get_results_for_run
+
+        Returns the test results of a test run as columns, see model.frame.
+
+        :param run_id: The ID of the test run
+        :param case_ids: Fill the case_id column from the tests of the run, results do not carry it
+        :param kwargs: filters, same as get_results_for_run
+        :return: ResultFrame
+        """
+        tests = {test['id']: test['case_id'] for test in self._paginate(f'get_tests/{run_id}', 'tests')} \
+            if case_ids else None
+        return ResultFrame.from_items(self._paginate(f'get_results_for_run/{run_id}', 'results', params=kwargs),
+                                      case_ids=tests)
 
     def add_result(self, result: Result) -> List[Result]:
         """
@@ -556,7 +905,10 @@ class Results(BaseCategory):
         :return: response
         """
         data = result.raw_data()
-        response = self._session.request(METHODS.POST, f'add_result/{result.test_id}', json=data)
+        since = int(time.time()) - CLOCK_SKEW
+        response = self._session.request(METHODS.POST, f'add_result/{result.test_id}', json=data,
+                                         check=lambda: self._added_results(
+                                             self.get_results(result.test_id, created_after=since), [result]))
         return [Result(obj) for obj in response]
 
     def add_result_for_case(self, run_id: int, case_id: int, result: Result) -> List[Result]:
@@ -605,9 +957,29 @@ class Results(BaseCategory):
         payload = {'results': list()}
         for obj in data:
             payload['results'].append(obj)
-        response = self._session.request(METHODS.POST, f'add_results/{run_id}', json=payload)
+        since = int(time.time()) - CLOCK_SKEW
+        response = self._session.request(METHODS.POST, f'add_results/{run_id}', json=payload,
+                                         check=lambda: self._added_results(
+                                             self.get_results_for_run(run_id, created_after=since), results))
         return [Result(obj) for obj in response]
 
+    @staticmethod
+    def _added_results(found: List[dict], results: List[Result]):
+        """
+        The results created by an interrupted add_result(s), None if they were not created.
+        A result found only counts if it has the test and the fields of a submitted one, every found result once.
+        """
+        found = list(found or [])
+        added = list()
+        for result in results:
+            match = next((index for index, obj in enumerate(found)
+                          if obj is not None and _same_result(obj, result.raw_data())), None)
+            if match is None:
+                return None
+            added.append(found[match])
+            found[match] = None
+        return added or None
+
     def add_results_for_cases(self, run_id: int, results: List[Result]) -> List[Result]:
         """
         http://docs.gurock.com/testrail-api2/reference-results#add_results_for_cases
@@ -629,7 +1001,7 @@ class Results(BaseCategory):
             Please note that all referenced tests must belong to the same test run.
         :return: response
         """
-        data = json.dumps({'results': [ob.raw_data() for ob in results]})
+        data = _json.dumps({'results': [ob.raw_data() for ob in results]})
         response = self._session.request(METHODS.POST, f'add_results_for_cases/{run_id}', json=data)
         return [Result(obj) for obj in response]
 
@@ -678,7 +1050,19 @@ class Runs(BaseCategory):
             :key suite_id: int(list) - A comma-separated list of test suite IDs to filter by.
         :return: response
         """
-        return self._session.request(METHODS.GET, f'get_runs/{project_id}', params=kwargs)
+        return list(self._paginate(f'get_runs/{project_id}', 'runs', params=kwargs))
+
+    def iter_runs(self, project_id: int, **kwargs) -> Iterator[Run]:
+        """
+        http://docs.gurock.com/testrail-api2/reference-runs#get_runs
+
+        Lazily yields the test runs of a project that are not part of a test plan, following pagination.
+
+        :param project_id: The ID of the project
+        :param kwargs: filters, same as get_runs
+        :return: generator of Run
+        """
+        return self._paginate(f'get_runs/{project_id}', 'runs', Run, kwargs)
 
     def add_run(self, project_id: int, **kwargs) -> dict:
         """
@@ -761,8 +1145,19 @@ class Sections(BaseCategory):
         :param suite_id: The ID of the test suite (optional if the project is operating in single suite mode)
         :return: response
         """
-        response = self._session.request(METHODS.GET, f'get_sections/{project_id}', params={'suite_id': suite_id})
-        return [Section(rsp) for rsp in response]
+        return list(self.iter_sections(project_id, suite_id))
+
+    def iter_sections(self, project_id: int, suite_id: int) -> Iterator[Section]:
+        """
+        http://docs.gurock.com/testrail-api2/reference-sections#get_sections
+
+        Lazily yields the sections of a project and test suite, following pagination.
+
+        :param project_id: The ID of the project
+        :param suite_id: The ID of the test suite (optional if the project is operating in single suite mode)
+        :return: generator of Section
+        """
+        return self._paginate(f'get_sections/{project_id}', 'sections', Section, {'suite_id': suite_id})
 
     def add_section(self, project_id: int, section: Section) -> Section:
         """
@@ -923,7 +1318,7 @@ class Tests(BaseCategory):
         :return: response
         """
         result = self._session.request(METHODS.GET, f'get_test/{test_id}')
-        return Test(result)
+        return self._model(Test)(result)
 
     def get_tests(self, run_id: int, **kwargs) -> List[Test]:
         """
@@ -936,8 +1331,31 @@ class Tests(BaseCategory):
             :key status_id: int(list) - A comma-separated list of status IDs to filter by.
         :return: response
         """
-        result = self._session.request(METHODS.GET, f'get_tests/{run_id}', params=kwargs)
-        return [Test(obj) for obj in result]
+        return list(self.iter_tests(run_id, **kwargs))
+
+    def iter_tests(self, run_id: int, **kwargs) -> Iterator[Test]:
+        """
+        http://docs.gurock.com/testrail-api2/reference-tests#get_tests
+
+        Lazily yields the tests of a test run, following pagination.
+
+        :param run_id: The ID of the test run
+        :param kwargs: filters, same as get_tests
+        :return: generator of Test
+        """
+        return self._paginate(f'get_tests/{run_id}', 'tests', self._model(Test), kwargs)
+
+    def get_tests_frame(self, run_id: int, **kwargs) -> TestFrame:
+        """
+        http://docs.gurock.com/testrail-api2/reference-tests#get_tests
+
+        Returns the tests of a test run as columns, see model.frame.
+
+        :param run_id: The ID of the test run
+        :param kwargs: filters, same as get_tests
+        :return: TestFrame
+        """
+        return TestFrame.from_items(self._paginate(f'get_tests/{run_id}', 'tests', params=kwargs))
 
 
 class Users(BaseCategory):
@@ -15,3 +15,12 @@ class TestRailAPIError(TestRailError):
 
 class StatusCodeError(TestRailAPIError):
     """Status code Exception"""
+
+
+class TestRailBatchError(TestRailError):
+    """Errors of concurrent calls, by index of the failed item"""
+
+    def __init__(self, errors: dict, results: list) -> None:
+        super().__init__("{} of {} calls failed: {}".format(len(errors), len(results), errors))
+        self.errors = errors
+        self.results = results
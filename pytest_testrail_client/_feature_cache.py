@@ -0,0 +1,94 @@
+"""On-disk cache of the parsed feature files, so unchanged files are not parsed again"""
+
+import hashlib
+import marshal
+import os
+import shutil
+import struct
+import sys
+from pathlib import Path
+from typing import Optional, Tuple
+
+try:
+    from importlib.metadata import PackageNotFoundError, version
+except ImportError:  # pragma: no cover
+    PackageNotFoundError, version = Exception, None
+
+# bumped when the layout of the entries changes
+FORMAT = 1
+PREFIX = 'features-'
+# length of the marshalled header, which is followed by the marshalled AST
+HEADER_LENGTH = struct.Struct('<I')
+
+
+def _stamp() -> str:
+    """Versions the cached ASTs depend on: gherkin builds them, marshal stores them per Python version"""
+    try:
+        gherkin = version('gherkin-official') if version else 'unknown'
+    except PackageNotFoundError:
+        gherkin = 'unknown'
+    return '{}gherkin{}-py{}{}-{}'.format(PREFIX, gherkin, *sys.version_info[:2], FORMAT)
+
+
+def _digest(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+class FeatureCache:
+    """
+    Parsed feature files by path, one marshal file each in a directory stamped with the gherkin-official and
+    Python versions. An entry is valid while the file keeps its mtime and size, or else its content hash, which
+    survives fresh checkouts; entries of other versions are dropped.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = Path(directory, _stamp())
+        for stale in Path(directory).glob(PREFIX + '*'):
+            if stale != self.directory:
+                shutil.rmtree(stale, ignore_errors=True)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _entry(self, file_path: str) -> Path:
+        return self.directory / (hashlib.sha1(os.path.abspath(file_path).encode('utf-8')).hexdigest() + '.marshal')
+
+    def check(self, file_path: str) -> Tuple[bool, tuple]:
+        """
+        Whether the cached AST of file_path is up to date, and the (mtime, size, hash) header to store with its
+        AST otherwise
+        """
+        stat = os.stat(file_path)
+        try:
+            with self._entry(file_path).open('rb') as entry:
+                length, = HEADER_LENGTH.unpack(entry.read(HEADER_LENGTH.size))
+                mtime, size, digest = marshal.loads(entry.read(length))
+        except (OSError, EOFError, ValueError, TypeError, struct.error):
+            mtime = size = digest = None
+        if (mtime, size) == (stat.st_mtime_ns, stat.st_size):
+            return True, (mtime, size, digest)
+        with open(file_path, 'rb') as file:
+            header = (stat.st_mtime_ns, stat.st_size, _digest(file.read()))
+        feature = self.get(file_path) if header[2] == digest else None
+        if feature is not None:
+            # same content with a new mtime, e.g. after a checkout: only the header changes
+            self.put(file_path, header, feature)
+            return True, header
+        return False, header
+
+    def get(self, file_path: str) -> Optional[dict]:
+        """Cached AST of file_path, None if there is none"""
+        try:
+            with self._entry(file_path).open('rb') as entry:
+                content = entry.read()
+            length, = HEADER_LENGTH.unpack_from(content)
+            # loads of a whole buffer, load from a file reads it in small pieces
+            return marshal.loads(memoryview(content)[HEADER_LENGTH.size + length:])
+        except (OSError, EOFError, ValueError, TypeError, struct.error):
+            return None
+
+    def put(self, file_path: str, header: tuple, feature: dict) -> None:
+        entry = self._entry(file_path)
+        temporary = entry.with_suffix('.tmp')
+        header = marshal.dumps(header)
+        with temporary.open('wb') as file:
+            file.write(HEADER_LENGTH.pack(len(header)) + header + marshal.dumps(feature))
+        os.replace(temporary, entry)
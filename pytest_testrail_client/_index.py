@@ -0,0 +1,65 @@
+"""Hash indexes of the cases of a suite and the tests of a run, to reconcile scenarios with them in O(1)"""
+
+import json
+from typing import Iterable, Optional
+
+
+def canonical_data_set(data_set) -> Optional[str]:
+    """
+    Data set as JSON with sorted keys and no indentation, None without data set.
+    JSON text, e.g. custom_data_set of TestRail, is parsed first; text which is not JSON is kept as it is.
+    """
+    if data_set is None:
+        return None
+    if isinstance(data_set, str):
+        try:
+            data_set = json.loads(data_set)
+        except ValueError:
+            return data_set
+    return json.dumps(data_set, sort_keys=True, ensure_ascii=False, default=str)
+
+
+class _Index:
+    # whether items without data set match any data set
+    ANY_DATA_SET = False
+
+    def __init__(self, items: Iterable) -> None:
+        self._length = 0
+        self._by_title = dict()
+        self._any_data_set = dict()
+        for position, item in enumerate(items):
+            self._length += 1
+            # the first of equal items wins, like a scan would find it
+            custom = item._custom_methods  # pylint: disable=protected-access
+            data_set = canonical_data_set(custom.get('custom_data_set'))
+            if data_set is None and self.ANY_DATA_SET:
+                self._any_data_set.setdefault(item.title, (position, item))
+            else:
+                self._by_title.setdefault((item.title, data_set), (position, item))
+
+    def __len__(self) -> int:
+        return self._length
+
+    def find(self, title: str, data_set=None):
+        """
+        First item with title and data set, None if there is none
+        :param title: Title of the case or test
+        :param data_set: dict, JSON text or None
+        """
+        found = self._by_title.get((title, canonical_data_set(data_set)))
+        any_data_set = self._any_data_set.get(title)
+        if found is None or any_data_set is not None and any_data_set[0] < found[0]:
+            found = any_data_set
+        return found[1] if found else None
+
+
+class CaseIndex(_Index):
+    """Cases of a suite by title and data set"""
+
+
+class TestIndex(_Index):
+    """Tests of a run by title and data set, tests without data set match any data set"""
+
+    # not a test class, pytest does not collect it where it is imported
+    __test__ = False
+    ANY_DATA_SET = True
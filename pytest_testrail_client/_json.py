@@ -0,0 +1,33 @@
+"""JSON backend: orjson or ujson when installed, the standard library otherwise"""
+
+import json
+from typing import Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+try:
+    import ujson
+except ImportError:  # pragma: no cover
+    ujson = None
+
+BACKEND = 'orjson' if orjson else 'ujson' if ujson else 'json'
+
+
+def loads(data: Union[bytes, str]):
+    """Decodes a JSON document, raises ValueError if invalid"""
+    if orjson:
+        return orjson.loads(data)
+    if ujson:
+        return ujson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj) -> bytes:
+    """Encodes obj to UTF-8 JSON"""
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    if ujson:
+        return ujson.dumps(obj, ensure_ascii=False).encode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
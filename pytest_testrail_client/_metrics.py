@@ -0,0 +1,153 @@
+"""Request instrumentation of the TestRail sessions"""
+
+import json
+import math
+import threading
+import time
+from typing import Dict, List
+
+from ._cache import endpoint
+
+
+def percentile(values: List[float], share: float) -> float:
+    """Nearest-rank percentile of values, 0 if empty"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered), max(1, math.ceil(share * len(ordered)))) - 1]
+
+
+class EndpointStats:
+    """Counters of one normalized endpoint"""
+
+    __slots__ = ('count', 'errors', 'retries', 'rate_limited', 'cached', 'shared', 'bytes_sent', 'bytes_received',
+                 'payload_sent', 'payload_received', 'latencies')
+
+    def __init__(self) -> None:
+        self.count = self.errors = self.retries = self.rate_limited = self.cached = self.shared = 0
+        # on the wire, and before compression
+        self.bytes_sent = self.bytes_received = self.payload_sent = self.payload_received = 0
+        self.latencies = []
+
+    def to_dict(self) -> dict:
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'retries': self.retries,
+            'rate_limited': self.rate_limited,
+            'cached': self.cached,
+            'shared': self.shared,
+            'bytes_sent': self.bytes_sent,
+            'bytes_received': self.bytes_received,
+            'payload_sent': self.payload_sent,
+            'payload_received': self.payload_received,
+            'total': sum(self.latencies),
+            'p50': percentile(self.latencies, 0.50),
+            'p95': percentile(self.latencies, 0.95),
+            'p99': percentile(self.latencies, 0.99),
+        }
+
+
+class Metrics:
+    """
+    Calls, latencies (seconds), bytes, retries and HTTP 429 of every request, grouped by endpoint
+    (get_tests/12 -> get_tests), and wall time of the export phases. Shared by the threads of the process.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._endpoints = dict()
+        self._phases = dict()
+        self._requests = 0
+        self._current = None
+
+    def _stats(self, src: str) -> EndpointStats:
+        name = endpoint(src)
+        stats = self._endpoints.get(name)
+        if stats is None:
+            stats = self._endpoints[name] = EndpointStats()
+        return stats
+
+    def record(self, src: str, latency: float, sent: int = 0, received: int = 0, status: int = None,
+               payload_sent: int = None, payload_received: int = None) -> None:
+        """
+        One HTTP request sent, status None if it failed without response.
+        sent and received are the bytes on the wire, payload_sent and payload_received the bodies before compression.
+        """
+        with self._lock:
+            stats = self._stats(src)
+            stats.count += 1
+            stats.latencies.append(latency)
+            stats.bytes_sent += sent
+            stats.bytes_received += received
+            stats.payload_sent += sent if payload_sent is None else payload_sent
+            stats.payload_received += received if payload_received is None else payload_received
+            if status is None or status >= 400:
+                stats.errors += 1
+            if status == 429:
+                stats.rate_limited += 1
+            self._requests += 1
+
+    def retry(self, src: str) -> None:
+        with self._lock:
+            self._stats(src).retries += 1
+
+    def hit(self, src: str) -> None:
+        """Request served from the response cache"""
+        with self._lock:
+            self._stats(src).cached += 1
+
+    def share(self, src: str) -> None:
+        """Request served by an identical request in flight"""
+        with self._lock:
+            self._stats(src).shared += 1
+
+    def start_phase(self, name: str) -> None:
+        """Ends the current phase, if any, and measures the wall time and the requests of the next one"""
+        with self._lock:
+            self._end_phase()
+            phase = self._phases.setdefault(name, {'duration': 0.0, 'requests': 0})
+            self._current = (phase, time.perf_counter(), self._requests)
+
+    def end_phase(self) -> None:
+        with self._lock:
+            self._end_phase()
+
+    def _end_phase(self) -> None:
+        if self._current is not None:
+            phase, start, requests = self._current
+            phase['duration'] += time.perf_counter() - start
+            phase['requests'] += self._requests - requests
+            self._current = None
+
+    @property
+    def endpoints(self) -> Dict[str, dict]:
+        with self._lock:
+            return {name: stats.to_dict() for name, stats in sorted(self._endpoints.items())}
+
+    @property
+    def phases(self) -> Dict[str, dict]:
+        with self._lock:
+            return {name: dict(phase) for name, phase in self._phases.items()}
+
+    def to_dict(self) -> dict:
+        return {'endpoints': self.endpoints, 'phases': self.phases}
+
+    def dump(self, path: str) -> None:
+        with open(path, 'w') as file:
+            json.dump(self.to_dict(), file, indent=2)
+
+    def report(self) -> List[str]:
+        """Lines of the summary table"""
+        lines = ['{:<28}{:>7}{:>7}{:>7}{:>6}{:>9}{:>9}{:>9}{:>9}{:>9}{:>11}{:>11}'.format(
+            'endpoint', 'calls', 'errors', 'retry', '429', 'cached', 'shared', 'p50 ms', 'p95 ms', 'p99 ms',
+            'sent KB', 'recv KB')]
+        for name, stats in self.endpoints.items():
+            lines.append('{:<28}{:>7}{:>7}{:>7}{:>6}{:>9}{:>9}{:>9.0f}{:>9.0f}{:>9.0f}{:>11.1f}{:>11.1f}'.format(
+                name, stats['count'], stats['errors'], stats['retries'], stats['rate_limited'], stats['cached'],
+                stats['shared'],
+                stats['p50'] * 1000, stats['p95'] * 1000, stats['p99'] * 1000,
+                stats['bytes_sent'] / 1024, stats['bytes_received'] / 1024))
+        for name, phase in self.phases.items():
+            lines.append('phase {:<40}{:>9.2f}s {:>7} requests'.format(name, phase['duration'], phase['requests']))
+        return lines
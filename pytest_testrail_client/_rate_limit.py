@@ -0,0 +1,140 @@
+"""Adaptive token bucket pacing requests under the TestRail rate limit"""
+
+import hashlib
+import json
+import logging
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Union
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+LOGGER = logging.getLogger(__package__)
+
+# multiplicative decrease on HTTP 429, additive increase (share of the ceiling) on success
+RATE_DECREASE = 0.5
+RATE_INCREASE = 0.01
+MIN_RATE = 0.05
+# seconds after which the state file of an earlier run is started over, its learned rate is not carried over
+STATE_TTL = 10
+
+
+def default_state_file(url: str) -> Path:
+    """State file shared by every process talking to the same TestRail host"""
+    digest = hashlib.sha1(url.encode()).hexdigest()[:12]
+    return Path(tempfile.gettempdir()) / "pytest-testrail-client-{}.ratelimit".format(digest)
+
+
+class TokenBucket:
+    """
+    Paces requests at a rate learned from the server.
+
+    Every request takes a token; tokens refill at `rate` per second up to `burst`. A HTTP 429 halves the rate and
+    pauses every client for retry-after seconds, each success raises the rate again towards its ceiling, so the
+    aggregate throughput settles just under the server limit.
+    The bucket is shared by the threads of the process and, through a locked state file, by every process of the
+    host (e.g. pytest-xdist workers).
+    """
+
+    def __init__(self, rate: float, burst: float = None, state_file: Union[Path, str, None] = None) -> None:
+        """
+        :param rate: Ceiling of the rate, in requests per second
+        :param burst: Number of requests which may be sent at once (default: one second worth of requests)
+        :param state_file: File sharing the bucket between processes, in-process only if None
+        """
+        self.max_rate = float(rate)
+        self.burst = float(burst or max(1.0, self.max_rate))
+        self._lock = threading.Lock()
+        self._state_file = Path(state_file) if state_file and fcntl else None
+        if state_file and not fcntl:
+            LOGGER.warning("File locks not supported on this platform, rate limit is shared in-process only")
+        self._state = self._initial(time.time())
+        # successes not applied to the state yet, see reward
+        self._rewards = 0
+
+    def _initial(self, now: float) -> dict:
+        return {"rate": self.max_rate, "tokens": self.burst, "updated": now}
+
+    def _load(self, content: str) -> dict:
+        now = time.time()
+        state = json.loads(content) if content else None
+        if not state or now - state["updated"] > STATE_TTL:
+            return self._initial(now)
+        # another ceiling may have been configured since the state was written
+        state["rate"] = min(self.max_rate, state["rate"])
+        state["tokens"] = min(self.burst, state["tokens"])
+        return state
+
+    @property
+    def rate(self) -> float:
+        """Current rate, in requests per second"""
+        with self._locked() as state:
+            return state["rate"]
+
+    def _apply_rewards(self, state: dict) -> None:
+        rewards, self._rewards = self._rewards, 0
+        if rewards:
+            state["rate"] = min(self.max_rate, state["rate"] + rewards * self.max_rate * RATE_INCREASE)
+
+    @contextmanager
+    def _locked(self):
+        with self._lock:
+            if self._state_file is None:
+                self._apply_rewards(self._state)
+                yield self._state
+                return
+            with self._state_file.open("a+") as file:
+                fcntl.flock(file, fcntl.LOCK_EX)
+                file.seek(0)
+                state = self._load(file.read())
+                self._apply_rewards(state)
+                yield state
+                file.seek(0)
+                file.truncate()
+                file.write(json.dumps(state))
+                file.flush()
+
+    def _refill(self, state: dict, now: float) -> None:
+        if now > state["updated"]:
+            state["tokens"] = min(self.burst, state["tokens"] + (now - state["updated"]) * state["rate"])
+            state["updated"] = now
+
+    def reserve(self) -> float:
+        """Takes a token, returns the seconds to wait before sending the request"""
+        with self._locked() as state:
+            now = time.time()
+            self._refill(state, now)
+            state["tokens"] -= 1
+            # a negative balance queues the caller behind those who reserved earlier
+            return max(0.0, state["updated"] - now) + max(0.0, -state["tokens"]) / state["rate"]
+
+    def acquire(self) -> None:
+        """Blocks until a token is available"""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    def penalize(self, retry_after: float) -> None:
+        """HTTP 429 received: lower the rate and hold every client back for retry_after seconds"""
+        with self._locked() as state:
+            now = time.time()
+            self._refill(state, now)
+            state["rate"] = max(MIN_RATE, state["rate"] * RATE_DECREASE)
+            state["tokens"] = min(state["tokens"], 0.0)
+            state["updated"] = max(state["updated"], now + retry_after)
+            LOGGER.warning("Rate limited by TestRail, pausing %ss and lowering rate to %.2f requests/s",
+                           retry_after, state["rate"])
+
+    def reward(self) -> None:
+        """
+        Request accepted: raise the rate back towards its ceiling.
+        Counted in-process and applied with the next reservation, so a request locks the state file once.
+        """
+        with self._lock:
+            self._rewards += 1
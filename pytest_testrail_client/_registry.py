@@ -0,0 +1,168 @@
+"""
+Session scoped registry of TestRail reference data
+"""
+import functools
+import operator
+import threading
+from collections import defaultdict
+
+
+class Index:
+    """name -> id and id -> object lookups over a list of TestRail objects"""
+
+    def __init__(self, objs):
+        self.by_id = dict()
+        self.by_name = dict()
+        for obj in objs:
+            obj_id, obj_name = (obj['id'], obj['name']) if isinstance(obj, dict) else (obj.id, obj.name)
+            self.by_id[obj_id] = obj
+            self.by_name.setdefault(obj_name, obj)
+
+    def __iter__(self):
+        return iter(self.by_id.values())
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def __contains__(self, name):
+        return name in self.by_name
+
+    def get(self, name):
+        return self.by_name.get(name)
+
+    def id_of(self, name):
+        obj = self.by_name.get(name)
+        if obj is None:
+            return None
+        return obj['id'] if isinstance(obj, dict) else obj.id
+
+    def names(self):
+        return list(self.by_name)
+
+
+class SectionTree:
+    """
+    Sections of a suite by path of names from the suite down, e.g. ('Suite', 'Section', 'Sub'), and by parent.
+    Sections added through the client are inserted with add, the tree is never fetched again.
+    """
+
+    def __init__(self, suite_name: str, sections) -> None:
+        self.suite_name = suite_name
+        self.by_id = dict()
+        self._by_name = dict()
+        self._children = defaultdict(list)
+        sections = list(sections)
+        for section in sections:
+            self.by_id[section.id] = section
+        for section in sections:
+            self._insert(section)
+
+    def __iter__(self):
+        return iter(self.by_id.values())
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def _names(self, section) -> tuple:
+        names = [section.name]
+        parent = self.by_id.get(section.parent_id)
+        while parent is not None:
+            names.append(parent.name)
+            parent = self.by_id.get(parent.parent_id)
+        return (self.suite_name, *reversed(names))
+
+    def _insert(self, section) -> None:
+        self._children[section.parent_id].append(section)
+        # the first of same named siblings wins, like a scan in display order would find it
+        self._by_name.setdefault((section.parent_id, section.name), section)
+
+    def add(self, section):
+        """Inserts a section created during the export, returns it"""
+        self.by_id[section.id] = section
+        self._insert(section)
+        return section
+
+    def get(self, *names):
+        """
+        Section by path, e.g. get('Suite', 'Section', 'Sub'), None if there is none.
+        Every name is looked up under the section found for the previous one.
+        """
+        if not names or names[0] != self.suite_name:
+            return None
+        section = None
+        for name in names[1:]:
+            section = self._by_name.get((section.id if section is not None else None, name))
+            if section is None:
+                return None
+        return section
+
+    def path(self, section_id: int) -> str:
+        """Full path of a section, e.g. 'Suite/Section/Sub'"""
+        return '/'.join(self._names(self.by_id[section_id]))
+
+    def children(self, parent_id: int = None) -> list:
+        """Sections under parent_id, the top level sections of the suite if None"""
+        return list(self._children.get(parent_id, ()))
+
+
+class Registry:
+    """
+    Loads priorities, case types, statuses, templates, configurations and section trees once per TestRailAPI
+    and serves every following lookup from memory.
+    """
+
+    def __init__(self, tr) -> None:
+        self._tr = tr
+        self._lock = threading.Lock()
+        # one lock per key, a slow load only holds up the lookups of the same key
+        self._locks = dict()
+        self._indexes = dict()
+
+    def _index(self, key, loader, kind=Index):
+        index = self._indexes.get(key)
+        if index is None:
+            with self._lock:
+                lock = self._locks.setdefault(key, threading.Lock())
+            with lock:
+                index = self._indexes.get(key)
+                if index is None:
+                    index = self._indexes[key] = kind(loader())
+        return index
+
+    @property
+    def priorities(self) -> Index:
+        return self._index('priorities', self._tr.priorities.get_priorities)
+
+    @property
+    def case_types(self) -> Index:
+        return self._index('case_types', self._tr.case_types.get_case_types)
+
+    @property
+    def statuses(self) -> Index:
+        return self._index('statuses', self._tr.statuses.get_statuses)
+
+    def templates(self, project_id: int) -> Index:
+        return self._index(('templates', int(project_id)),
+                           lambda: self._tr.templates.get_templates(project_id))
+
+    def configs(self, project_id: int) -> Index:
+        """Configurations of all configuration groups of the project, flattened"""
+        return self._index(('configs', int(project_id)),
+                           lambda: functools.reduce(operator.iconcat,
+                                                    [config_group['configs'] for config_group in
+                                                     self._tr.configurations.get_configs(project_id)],
+                                                    []))
+
+    def sections(self, project_id: int, suite_id: int, suite_name: str = None) -> SectionTree:
+        """Sections of a suite, from one paginated fetch; suite_name is the root of the paths"""
+        return self._index(('sections', int(project_id), int(suite_id)),
+                           lambda: self._tr.sections.iter_sections(project_id, suite_id),
+                           functools.partial(SectionTree, suite_name))
+
+    def invalidate(self, key=None):
+        """Drop one loaded index (e.g. 'statuses', ('configs', 1)) or all of them"""
+        with self._lock:
+            if key is None:
+                self._indexes.clear()
+            else:
+                self._indexes.pop(key, None)
@@ -0,0 +1,58 @@
+"""Retry policy for transient failures"""
+
+import random
+import time
+
+import requests
+from urllib3.exceptions import NewConnectionError
+
+from ._enums import METHODS
+
+TRANSIENT_STATUS_CODES = (502, 503, 504)
+
+# retry classes of the endpoints
+READ = "read"  # GET, always safe to repeat
+IDEMPOTENT = "idempotent"  # update_*, close_*, delete_*, repeating leaves the same state
+GUARDED = "guarded"  # add_*, repeating may create duplicates
+
+
+def retry_class(method: METHODS, src: str) -> str:
+    if method is METHODS.GET:
+        return READ
+    if src.startswith(("update_", "close_", "delete_")):
+        return IDEMPOTENT
+    return GUARDED
+
+
+def not_sent(error: Exception) -> bool:
+    """True if the request failed before reaching the server, so it is safe to repeat whatever the endpoint"""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter, bounded by a number of attempts, a per-call and a global deadline"""
+
+    def __init__(self, attempts: int = 5, backoff: float = 0.5, max_backoff: float = 30.0,
+                 deadline: float = 300.0, global_deadline: float = None) -> None:
+        """
+        :param attempts: Maximum number of attempts of one call
+        :param backoff: Delay before the first retry, doubled on every following one
+        :param max_backoff: Ceiling of the delay between two attempts
+        :param deadline: Seconds after which a call is not retried anymore
+        :param global_deadline: Seconds, from the creation of the policy, after which no call is retried anymore
+        """
+        self.attempts = max(1, int(attempts))
+        self.backoff = float(backoff)
+        self.max_backoff = float(max_backoff)
+        self.deadline = float(deadline)
+        self.global_deadline = time.monotonic() + float(global_deadline) if global_deadline else None
+
+    def call_deadline(self) -> float:
+        deadline = time.monotonic() + self.deadline
+        return min(deadline, self.global_deadline) if self.global_deadline else deadline
+
+    def delay(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
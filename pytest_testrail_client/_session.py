@@ -1,22 +1,121 @@
 """Base session"""
 
+import gzip
 import logging
 import time
-from json.decoder import JSONDecodeError
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from os import environ
 from pathlib import Path
-from typing import Union
+from typing import Callable, Iterable, List, Union
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from . import __version__
+from . import _json
+from ._attachment import CHUNK_SIZE, MultipartFile
+from ._cache import MISS, ResponseCache, parse_ttls
+from ._cassette import RecordingAdapter, ReplayAdapter, shared_cassette
 from ._enums import METHODS
-from ._exception import StatusCodeError, TestRailError
+from ._exception import StatusCodeError, TestRailBatchError, TestRailError
+from ._metrics import Metrics
+from ._rate_limit import TokenBucket, default_state_file
+from ._retry import GUARDED, TRANSIENT_STATUS_CODES, RetryPolicy, not_sent, retry_class
+from ._singleflight import SingleFlight
 
 LOGGER = logging.getLogger(__package__)
 
 RATE_LIMIT_TIMEOUT = 3
 RATE_LIMIT_STATUS_CODE = 429
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_TIMEOUT = 30
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_RETRIES = 5
+DEFAULT_RETRY_BACKOFF = 0.5
+DEFAULT_RETRY_DEADLINE = 300
+DEFAULT_COMPRESS_THRESHOLD = 16 * 1024
+COMPRESS_LEVEL = 6
+COMPRESSION_REJECTED_STATUS_CODE = 415
+
+# gzip request bodies accepted, by TestRail address: True, False or missing if not known yet
+_COMPRESSION = dict()
+
+
+def _get_option(config, name: str, default=None):
+    """Plugin option from command line or ini file"""
+    value = config.getoption(f"--{name}", default=None) \
+            or config.inicfg.config.get('pytest-testrail-client', name)
+    return default if value is None else value
+
+
+def _as_bool(value) -> bool:
+    return value if isinstance(value, bool) else str(value).strip().lower() not in ('0', 'false', 'no', 'off')
+
+
+def _rate_limiter(config, url: str):
+    """
+    Token bucket of the testrail-rate-limit option (requests per minute), None if not set.
+    The rate adapts to HTTP 429 below that ceiling only.
+    """
+    rate = _get_option(config, "testrail-rate-limit")
+    if not rate:
+        return None
+    state_file = _get_option(config, "testrail-rate-limit-file") or default_state_file(url)
+    return TokenBucket(float(rate) / 60, state_file=state_file)
+
+
+def _response_cache_file(config) -> Path:
+    cache = getattr(config, "cache", None)
+    directory = cache.mkdir("testrail") if cache is not None else Path(str(config.rootdir), ".pytest_cache", "testrail")
+    return Path(directory, "responses.sqlite")
+
+
+def _response_cache(config, url: str, email: str):
+    """Persistent response cache of the testrail-cache option, None if not enabled"""
+    if not _as_bool(_get_option(config, "testrail-cache", False)):
+        return None
+    return ResponseCache(_response_cache_file(config), "{} {}".format(url, email),
+                         ttls=parse_ttls(_get_option(config, "testrail-cache-ttl")))
+
+
+def clear_response_cache(config) -> None:
+    """Drops the cached responses if testrail-cache-clear is set, once per pytest run, before any session exists"""
+    if config.getoption("--testrail-cache-clear", default=False) and not hasattr(config, "workerinput"):
+        # xdist workers start after the controller cleared the cache, they share it
+        ResponseCache(_response_cache_file(config), "").clear()
+
+
+def _adapter(config, **kwargs) -> HTTPAdapter:
+    """Transport adapter, recording or replaying the traffic if testrail-record or testrail-replay is set"""
+    replay = _get_option(config, "testrail-replay")
+    if replay:
+        return ReplayAdapter(shared_cassette(replay), latency=float(_get_option(config, "testrail-replay-latency", 0)),
+                             **kwargs)
+    record = _get_option(config, "testrail-record")
+    if record:
+        return RecordingAdapter(shared_cassette(record), **kwargs)
+    return HTTPAdapter(**kwargs)
+
+
+def _credentials(config):
+    """TestRail url, email and key from command line, ini file or environment"""
+    _url = config.getoption("--testrail-url") \
+           or config.inicfg.config.get('pytest-testrail-client', 'testrail-url') \
+           or environ.get("TESTRAIL_URL")
+    _email = config.getoption("--testrail-email") \
+             or config.inicfg.config.get('pytest-testrail-client', 'testrail-email') \
+             or environ.get("TESTRAIL_EMAIL")
+    _key = config.getoption("--testrail-key") \
+           or config.inicfg.config.get('pytest-testrail-client', 'testrail-key') \
+           or environ.get("TESTRAIL_KEY")
+    if _get_option(config, "testrail-replay"):
+        # replayed traffic needs no TestRail account
+        _url, _email, _key = _url or "http://testrail.replay", _email or "replay", _key or "replay"
+    if not _url or not _email or not _key:
+        raise TestRailError("No url or email or key values set. Aborting!!!")
+    if _url.endswith("/"):
+        _url = _url[:-1]
+    return _url, _email, _key
 
 
 class Session:
@@ -35,39 +134,59 @@ class Session:
         :param exc:
             Catching exceptions
         :param kwargs:
-            :key timeout: int (default: 30)
+            :key timeout: int (default: 30) - default of both connect and read timeout
             :key verify: bool (default: True)
             :key headers: dict
+            :key max_workers: int - default size of the thread pool used by map (default: 8)
+            :key metrics: Metrics - request instrumentation shared with other sessions
         """
-        _url = config.getoption("--testrail-url") \
-               or config.inicfg.config.get('pytest-testrail-client', 'testrail-url') \
-               or environ.get("TESTRAIL_URL")
-        _email = config.getoption("--testrail-email") \
-                 or config.inicfg.config.get('pytest-testrail-client', 'testrail-email') \
-                 or environ.get("TESTRAIL_EMAIL")
-        _key = config.getoption("--testrail-key") \
-               or config.inicfg.config.get('pytest-testrail-client', 'testrail-key') \
-               or environ.get("TESTRAIL_KEY")
-        if not _url or not _email or not _key:
-            raise TestRailError("No url or email or key values set. Aborting!!!")
-        if _url.endswith("/"):
-            _url = _url[:-1]
+        _url, _email, _key = _credentials(config)
         self.__base_url = "{}/index.php?/api/v2/".format(_url)
         self.__user_email = _email
-        self.__timeout = kwargs.get("timeout", 30)
+        self._max_workers = int(kwargs.get("max_workers") or _get_option(config, "testrail-max-workers",
+                                                                          DEFAULT_MAX_WORKERS))
+        timeout = kwargs.get("timeout", DEFAULT_TIMEOUT)
+        self.__timeout = (float(_get_option(config, "testrail-connect-timeout", timeout)),
+                          float(_get_option(config, "testrail-read-timeout", timeout)))
         self.__session = requests.Session()
+        # one pooled connection per concurrent worker, so connections are reused instead of re-handshaked
+        adapter = _adapter(
+            config,
+            pool_connections=int(_get_option(config, "testrail-pool-connections", DEFAULT_POOL_CONNECTIONS)),
+            pool_maxsize=int(_get_option(config, "testrail-pool-maxsize", self._max_workers)),
+        )
+        self.__session.mount("https://", adapter)
+        self.__session.mount("http://", adapter)
+        if not _as_bool(_get_option(config, "testrail-keep-alive", True)):
+            self.__session.headers["Connection"] = "close"
         self.__session.headers["User-Agent"] = self._user_agent
+        self.__session.headers["Accept-Encoding"] = "gzip, deflate"
         self.__session.headers.update(kwargs.get("headers", {}))
         self.__session.verify = kwargs.get("verify", True)
         self.__session.auth = (self.__user_email, _key)
         self.__exc = exc
         self._rate_limit = rate_limit
+        self._limiter = _rate_limiter(config, _url) if rate_limit else None
+        self._retry = RetryPolicy(
+            attempts=int(_get_option(config, "testrail-retries", DEFAULT_RETRIES)),
+            backoff=float(_get_option(config, "testrail-retry-backoff", DEFAULT_RETRY_BACKOFF)),
+            deadline=float(_get_option(config, "testrail-retry-deadline", DEFAULT_RETRY_DEADLINE)),
+            global_deadline=_get_option(config, "testrail-global-deadline"),
+        )
+        self._flights = SingleFlight()
+        self._cache = _response_cache(config, _url, _email)
+        self._compress_threshold = int(_get_option(config, "testrail-compress-threshold", DEFAULT_COMPRESS_THRESHOLD)) \
+            if _as_bool(_get_option(config, "testrail-compress", False)) else 0
+        self.metrics = kwargs.get("metrics") if kwargs.get("metrics") is not None else Metrics()
+        self.compact_models = _as_bool(_get_option(config, "testrail-compact-models", False))
         LOGGER.info(
-            "Create Session{url: %s, user: %s, timeout: %s, headers: %s, verify: "
+            "Create Session{url: %s, user: %s, timeout: %s, pool: %s/%s, headers: %s, verify: "
             "%s, exception: %s}",
             _url,
             self.__user_email,
             self.__timeout,
+            adapter._pool_connections,  # pylint: disable=protected-access
+            adapter._pool_maxsize,  # pylint: disable=protected-access
             self.__session.headers,
             self.__session.verify,
             self.__exc,
@@ -95,14 +214,26 @@ class Session:
                     response.content,
                 )
 
-        LOGGER.debug("Response body: %s", response.text)
+        # the body is decoded once, from the raw bytes; it is only turned into text to be logged
+        content = response.content
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            LOGGER.debug("Response body: %s", response.text)
+        if not content:
+            return None
         try:
-            return response.json()
-        except (JSONDecodeError, ValueError):
+            return _json.loads(content)
+        except ValueError:
             return response.text or None
 
-    def request(self, method: METHODS, src: str, raw: bool = False, **kwargs):
-        """Base request method"""
+    def request(self, method: METHODS, src: str, raw: bool = False, check: Callable = None, **kwargs):
+        """
+        Base request method
+
+        Connection errors, timeouts and HTTP 429/502/503/504 are retried with exponential backoff, except for add_*
+        writes which may have gone through: those are only retried once check confirmed they did not.
+        :param check: Looks up the result of an interrupted add_* write, returns its response or None
+        :key json: Payload, bytes or str are sent as already serialized JSON
+        """
         url = "{}{}".format(self.__base_url, src)
         if not src.startswith("add_attachment"):
             headers = kwargs.setdefault("headers", {})
@@ -113,43 +244,217 @@ class Session:
                 if isinstance(value, list):
                     kwargs["params"][key] = ",".join([str(i) for i in value])
 
-        iterations = 3
-        for count in range(iterations):
-            try:
-                response = self.__session.request(method=method.value, url=url, timeout=self.__timeout, **kwargs)
-            except Exception as err:
-                LOGGER.error("%s", err, exc_info=True)
-                raise
-            if (
-                self._rate_limit
-                and response.status_code == RATE_LIMIT_STATUS_CODE
-                and count < iterations - 1
-            ):
-                time.sleep(int(response.headers.get("retry-after", RATE_LIMIT_TIMEOUT)))
-                continue
-            LOGGER.debug("Response header: %s", response.headers)
-            return response if raw else self.__response(response)
+        cacheable = self._cache is not None and method is METHODS.GET and not raw and self._cache.cacheable(src)
+        if cacheable:
+            cached = self._cache.get(src, kwargs.get("params"))
+            if cached is not MISS:
+                self.metrics.hit(src)
+                return cached
+        if method is METHODS.GET and not raw:
+            # concurrent identical reads share one request
+            key = (src, tuple(sorted((kwargs.get("params") or {}).items())))
+            return self._flights.do(key,
+                                    lambda: self.__exchange(method, src, url, check, raw, cacheable, **kwargs),
+                                    on_shared=lambda: self.metrics.share(src))
+
+        if "json" in kwargs:
+            # bytes or str are taken as already serialized
+            body = kwargs.pop("json")
+            kwargs["data"] = body if isinstance(body, (bytes, str)) else _json.dumps(body)
+
+        return self.__exchange(method, src, url, check, raw, cacheable, **kwargs)
+
+    def __exchange(self, method: METHODS, src: str, url: str, check: Callable, raw: bool, cacheable: bool, **kwargs):
+        """Sends the request and records its outcome in the cache"""
+        response = self.__send(method, src, url, check, **kwargs)
+        if not isinstance(response, requests.Response):
+            # response of an interrupted write, found by check
+            if self._cache is not None:
+                self._cache.invalidate(src)
+            return response
+        LOGGER.debug("Response header: %s", response.headers)
+        if raw:
+            return response
+        result = self.__response(response)
+        if self._cache is not None and response.ok:
+            if cacheable:
+                self._cache.put(src, kwargs.get("params"), result)
+            elif method is METHODS.POST:
+                self._cache.invalidate(src)
+        return result
+
+    def __send(self, method: METHODS, src: str, url: str, check: Callable, **kwargs):
+        guarded = retry_class(method, src) == GUARDED
+        deadline = self._retry.call_deadline()
+        compressed = self.__compress(kwargs)
+        attempt = 0
+        while True:
+            if self._limiter:
+                self._limiter.acquire()
+            response, error = self.__attempt(method, src, url, compressed or kwargs, kwargs.get("data"))
+            if compressed and response is not None:
+                if response.status_code == COMPRESSION_REJECTED_STATUS_CODE:
+                    # rejected before being processed: compression is off for this server, sent again as is
+                    LOGGER.warning("TestRail does not accept compressed requests, sending them uncompressed")
+                    _COMPRESSION[self.__base_url] = False
+                    compressed = None
+                    if self._limiter:
+                        self._limiter.acquire()
+                    response, error = self.__attempt(method, src, url, kwargs, kwargs.get("data"))
+                elif response.ok:
+                    _COMPRESSION[self.__base_url] = True
+            attempt += 1
+
+            if response is not None and response.status_code == RATE_LIMIT_STATUS_CODE:
+                if not self._rate_limit:
+                    return response
+                delay = float(response.headers.get("retry-after", RATE_LIMIT_TIMEOUT))
+                if self._limiter:
+                    # the pause is shared, the next acquire waits it out
+                    self._limiter.penalize(delay)
+                    delay = 0
+            elif response is not None and response.status_code not in TRANSIENT_STATUS_CODES:
+                if self._limiter:
+                    self._limiter.reward()
+                return response
+            else:
+                if guarded and not (error is not None and not_sent(error)):
+                    # the server may have processed the write, only repeat it if it did not
+                    try:
+                        landed = check() if check else None
+                    except Exception as lookup_error:  # pylint: disable=broad-except
+                        # not knowing whether the write went through, it is not repeated
+                        LOGGER.warning("Could not look up whether %s went through: %s", src, lookup_error)
+                        if error is not None:
+                            raise error from lookup_error
+                        return response
+                    if landed is not None:
+                        LOGGER.warning("%s went through despite %s", src, error or response.status_code)
+                        return landed
+                    if check is None:
+                        attempt = self._retry.attempts
+                delay = self._retry.delay(attempt - 1)
+
+            if attempt >= self._retry.attempts or time.monotonic() + delay > deadline:
+                if error is not None:
+                    LOGGER.error("%s", error, exc_info=True)
+                    raise error
+                return response
+            LOGGER.warning("Retrying %s in %.1fs after %s (attempt %s of %s)",
+                           src, delay, error or response.status_code, attempt, self._retry.attempts)
+            self.metrics.retry(src)
+            time.sleep(delay)
+
+    def __compress(self, kwargs: dict):
+        """Request arguments with a gzip body, None if the body is not worth compressing or the server refused it"""
+        data = kwargs.get("data")
+        if not self._compress_threshold or not isinstance(data, (bytes, str)) \
+                or len(data) < self._compress_threshold or _COMPRESSION.get(self.__base_url) is False:
+            return None
+        # no timestamp in the header, the same body always compresses to the same bytes
+        data = gzip.compress(data.encode("utf-8") if isinstance(data, str) else data, compresslevel=COMPRESS_LEVEL,
+                             mtime=0)
+        headers = dict(kwargs.get("headers") or {}, **{"Content-Encoding": "gzip"})
+        return dict(kwargs, data=data, headers=headers)
+
+    def __attempt(self, method: METHODS, src: str, url: str, kwargs: dict, payload):
+        """Sends the request once, returns the response or the connection error"""
+        if hasattr(kwargs.get("data"), "seek"):
+            # streamed bodies are sent again from their start
+            kwargs["data"].seek(0)
+        response = error = None
+        start = time.perf_counter()
+        try:
+            response = self.__session.request(method=method.value, url=url, timeout=self.__timeout, **kwargs)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as err:
+            error = err
+        except Exception as err:
+            LOGGER.error("%s", err, exc_info=True)
+            raise
+        finally:
+            self.__record(src, time.perf_counter() - start, response, payload, kwargs.get("stream"))
+        return response, error
+
+    def __record(self, src: str, latency: float, response, payload, stream: bool = False) -> None:
+        payload_sent = len(payload) if hasattr(payload, "__len__") else 0
+        if response is None:
+            self.metrics.record(src, latency, sent=payload_sent, payload_sent=payload_sent)
+            return
+        body = response.request.body
+        if stream:
+            # a streamed response is not read here, its announced length is recorded
+            received = payload_received = int(response.headers.get("Content-Length") or 0)
+        else:
+            payload_received = len(response.content)
+            # bytes pulled over the wire, before decompression
+            received = response.raw.tell() if hasattr(response.raw, "tell") else payload_received
+        self.metrics.record(src, latency, sent=len(body) if hasattr(body, "__len__") else 0, received=received,
+                            status=response.status_code, payload_sent=payload_sent,
+                            payload_received=payload_received)
+
+    def map(self, fn: Callable, iterable: Iterable, max_workers: int = None, return_exceptions: bool = False) -> List:
+        """
+        Calls fn for every item on a bounded thread pool sharing this session's connection pool.
+
+        Results come back in input order. Errors are collected per item: with return_exceptions they take the
+        place of the result, otherwise TestRailBatchError is raised once every call has finished.
+        :param fn: Callable taking one item, typically issuing one or more requests
+        :param iterable: Independent items
+        :param max_workers: Maximum number of concurrent calls (default: the testrail-max-workers option)
+        :param return_exceptions: Return exceptions in place of the results instead of raising
+        :return: list of results
+        """
+        items = list(iterable)
+        results = [None] * len(items)
+        errors = dict()
+        if not items:
+            return results
+        with ThreadPoolExecutor(max_workers=min(max_workers or self._max_workers, len(items)),
+                                thread_name_prefix="testrail") as executor:
+            futures = {executor.submit(fn, item): index for index, item in enumerate(items)}
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    results[index] = future.result()
+                except Exception as err:  # pylint: disable=broad-except
+                    LOGGER.error("Item %s failed: %s", index, err)
+                    results[index] = errors[index] = err
+        if errors and not return_exceptions:
+            raise TestRailBatchError(errors, results)
+        return results
+
+    def request_many(self, calls: Iterable, max_workers: int = None, return_exceptions: bool = False) -> List:
+        """
+        Sends independent requests concurrently, see map.
+        :param calls: (method, src) or (method, src, kwargs) tuples, e.g. (METHODS.GET, 'get_tests/1')
+        :return: list of responses in input order
+        """
+        def send(call):
+            method, src, kwargs = call if len(call) > 2 else (*call, {})
+            return self.request(method, src, **kwargs)
+
+        return self.map(send, calls, max_workers=max_workers, return_exceptions=return_exceptions)
 
     @staticmethod
     def _path(path: Union[Path, str]) -> Path:
         return path if isinstance(path, Path) else Path(path)
 
-    def attachment_request(
-        self, method: METHODS, src: str, file: Union[Path, str], **kwargs
-    ):
-        """Send attach"""
-        file = self._path(file)
-        with file.open("rb") as attachment:
-            return self.request(method, src, files={"attachment": attachment}, **kwargs)
+    def attachment_request(self, method: METHODS, src: str, file: Union[Path, str], **kwargs):
+        """Sends attach, streamed from disk"""
+        with MultipartFile(self._path(file)) as body:
+            headers = dict(kwargs.pop("headers", {}), **{"Content-Type": body.content_type})
+            return self.request(method, src, data=body, headers=headers, **kwargs)
 
     def get_attachment(
         self, method: METHODS, src: str, file: Union[Path, str], **kwargs
     ) -> Path:
-        """Downloads attach"""
+        """Downloads attach, streamed to disk"""
         file = self._path(file)
-        response = self.request(method, src, raw=True, **kwargs)
-        if response.ok:
-            with file.open("wb") as attachment:
-                attachment.write(response.content)
-            return file
-        return self.__response(response)
+        response = self.request(method, src, raw=True, stream=True, **kwargs)
+        with response:
+            if response.ok:
+                with file.open("wb") as attachment:
+                    for chunk in response.iter_content(CHUNK_SIZE):
+                        attachment.write(chunk)
+                return file
+            return self.__response(response)
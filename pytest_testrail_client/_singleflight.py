@@ -0,0 +1,64 @@
+"""Coalescing of concurrent identical calls"""
+
+import threading
+from typing import Callable, Hashable
+
+from . import _json
+
+
+class _Call:
+    __slots__ = ('done', 'shared', 'error', 'waiters')
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.shared = self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Runs a call once for all the threads asking for the same key at the same time: the first one sends it, the
+    others wait for its outcome and get their own copy of its decoded result, or its exception.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls = dict()
+
+    def do(self, key: Hashable, fn: Callable, on_shared: Callable = None):
+        """
+        :param key: Identity of the call, e.g. endpoint and parameters
+        :param fn: The call, returning a JSON serializable result
+        :param on_shared: Called when the result of a call in flight is shared instead of calling fn
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.waiters += 1
+        if not leader:
+            if on_shared:
+                on_shared()
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return _json.loads(call.shared)
+
+        result = error = None
+        try:
+            result = fn()
+            return result
+        except BaseException as err:
+            error = err
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            if call.waiters:
+                # serialized before the leader's caller gets the result, the waiters never see it modified
+                call.error = error
+                if error is None:
+                    call.shared = _json.dumps(result)
+            call.done.set()
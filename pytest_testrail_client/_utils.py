@@ -1,32 +1,98 @@
-from os import listdir, path
+import shutil
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from os import cpu_count, listdir, path, remove, replace
 from os.path import abspath
+from tempfile import NamedTemporaryFile
+from typing import Iterable, Iterator, List, Tuple
 
 from gherkin.token_scanner import TokenScanner
 from gherkin.parser import Parser
 
+from ._feature_cache import FeatureCache
+
+
+def _parse_feature(file_path: str):
+    """ Parse given feature file, in a worker process of _iter_features"""
+    with open(file_path, "r") as file_obj:
+        steam = file_obj.read()
+    parser = Parser()
+    return parser.parse(TokenScanner(steam))
+
 
 def _get_feature(file_path: str):
     """ Read and parse given feature file"""
     print('Reading feature file ', file_path)
-    file_obj = open(file_path, "r")
-    steam = file_obj.read()
-    parser = Parser()
-    return parser.parse(TokenScanner(steam))
+    return _parse_feature(file_path)
+
+
+def _iter_features(file_paths: List[str], workers: int = None,
+                   cache: FeatureCache = None) -> Iterator[Tuple[str, dict]]:
+    """
+    (file path, AST) of the given feature files, in order.
+    Files are parsed ahead by a pool of worker processes while the caller works on the ones already yielded.
+    :param workers: Number of worker processes (default: number of CPUs), parsed in this process if 1 or less
+    :param cache: Parsed files, unchanged ones are loaded from it instead of being parsed
+    """
+    headers = {file_path: cache.check(file_path) for file_path in file_paths} if cache is not None else dict()
+    misses = [file_path for file_path in file_paths if not headers.get(file_path, (False,))[0]]
+    workers = min(workers or cpu_count() or 1, len(misses))
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    # every file is submitted at once, results are taken in order as soon as the next one is parsed
+    futures = {file_path: executor.submit(_parse_feature, file_path) for file_path in misses} if executor else dict()
+    try:
+        for file_path in file_paths:
+            print('Reading feature file ', file_path)
+            fresh, header = headers.get(file_path, (False, None))
+            feature = cache.get(file_path) if fresh else None
+            if feature is None:
+                future = futures.get(file_path)
+                try:
+                    feature = future.result() if future else _parse_feature(file_path)
+                except BrokenProcessPool:
+                    # the errors of the gherkin parser do not survive pickling and break the pool,
+                    # the file is parsed again here to raise its error
+                    feature = _parse_feature(file_path)
+                if cache is not None:
+                    cache.put(file_path, header, feature)
+            yield file_path, feature
+    finally:
+        if executor:
+            # files not parsed yet when the caller stops early or a file fails are dropped
+            for future in futures.values():
+                future.cancel()
+            executor.shutdown()
 
 
-def _write_feature(file_path: str, line, column, value):
-    ln, cn = line - 1, column - 1  # offset from human index to Python index
-    count = 0  # initial count of characters
-    with open(file_path, 'r+') as f:  # open file for reading an writing
-        for idx, line in enumerate(f):  # for all line in the file
-            if idx < ln:  # before the given line
-                count += len(line)  # read and count characters
-            elif idx == ln:  # once at the line
-                f.seek(count + cn)  # place cursor at the correct character location
-                remainder = f.read()  # store all character afterwards
-                f.seek(count + cn)  # move cursor back to the correct character location
-                f.write(value + remainder.strip())  # insert text and rewrite the remainder
-                return  # You're finished!
+def _write_feature(file_path: str, insertions: Iterable[Tuple[int, int, str]]) -> None:
+    """
+    Inserts text into a feature file in one pass, e.g. the tags of the scenarios created in TestRail.
+    The file is written to a temporary file next to it which then replaces it, so it is never left half written.
+    :param insertions: (line, column, text), line and column starting at 1 like the locations of the AST;
+        texts at the same location are inserted in the given order
+    """
+    by_line = defaultdict(lambda: defaultdict(str))
+    for line, column, text in insertions:
+        by_line[line][column] += text
+    directory, name = path.split(abspath(file_path))
+    temporary = NamedTemporaryFile('w', dir=directory, prefix=f'.{name}.', suffix='.tmp', newline='', delete=False)
+    with open(file_path, 'r', newline='') as source, temporary as target:
+        try:
+            for number, line in enumerate(source, start=1):
+                # from the last column back, so the columns before stay valid
+                for column, text in sorted(by_line.get(number, dict()).items(), reverse=True):
+                    if line.endswith('\r\n'):
+                        # line breaks of the inserted text follow the file
+                        text = text.replace('\n', '\r\n')
+                    line = line[:column - 1] + text + line[column - 1:]
+                target.write(line)
+        except BaseException:
+            target.close()
+            remove(target.name)
+            raise
+    shutil.copymode(file_path, target.name)
+    replace(target.name, file_path)
 
 
 def _get_list_of_files(absolute_path):
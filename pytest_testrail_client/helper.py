@@ -13,12 +13,33 @@ class ContainerIter:
         return self._objs[index]
 
 
-CUSTOM_METHODS_RE = re.compile(r'^custom_(\w+)')
+CUSTOM_PREFIX = 'custom_'
 
 
 def custom_methods(content):
-    matches = [CUSTOM_METHODS_RE.match(method) for method in content]
-    return dict({match.string: content[match.string] for match in matches if match})
+    return {key: value for key, value in content.items() if key.startswith(CUSTOM_PREFIX)}
+
+
+class CustomMethods:
+    """
+    Custom fields (custom_*) of a model, collected from its content on first use instead of at construction
+    and kept for the next ones
+    """
+    __slots__ = ()
+    _custom_fields = None
+
+    @property
+    def _custom_methods(self):
+        if self._custom_fields is None:
+            self._custom_fields = custom_methods(self._content)
+        return self._custom_fields
+
+    def __getattr__(self, attr):
+        # only custom_* names are looked up in the content, the others fail fast, e.g. before __init__ ran on copy
+        if attr.startswith(CUSTOM_PREFIX) and attr in self._content:
+            return self._content[attr]
+        raise AttributeError('"{}" object has no attribute "{}"'.format(
+            self.__class__.__name__, attr))
 
 
 def testrail_duration_to_timedelta(duration):
@@ -1,19 +1,12 @@
 from datetime import datetime
 
 from pytest_testrail_client._exception import TestRailError
-from pytest_testrail_client.helper import custom_methods
+from pytest_testrail_client.helper import CustomMethods
 
 
-class Case(object):
+class Case(CustomMethods):
     def __init__(self, content=None):
         self._content = content or dict()
-        self._custom_methods = custom_methods(self._content)
-
-    def __getattr__(self, attr):
-        if attr in self._custom_methods:
-            return self._content.get(self._custom_methods[attr])
-        raise AttributeError('"{}" object has no attribute "{}"'.format(
-            self.__class__.__name__, attr))
 
     def __str__(self):
         return self.title
@@ -0,0 +1,132 @@
+"""
+Compact variants of the Case, Test and Result models, for projects whose cases and tests do not fit in memory as
+dicts (opt-in with testrail-compact-models).
+
+Each object holds the values of the fields known to its model in a list laid out by a schema shared by the class,
+and the values of its custom_* fields in a tuple turned into a dict on first use; other fields of the response are
+dropped. The properties are the ones of the regular models, reading through a view of that storage.
+"""
+from pytest_testrail_client.helper import CUSTOM_PREFIX, CustomMethods
+from pytest_testrail_client.model.case import Case
+from pytest_testrail_client.model.result import Result
+from pytest_testrail_client.model.test import Test
+
+
+class _Unset:
+    """Value of the fields missing from the response, the same object once pickled"""
+    __slots__ = ()
+
+    def __reduce__(self):
+        return '_UNSET'
+
+
+_UNSET = _Unset()
+# custom_* keys by keys of a response, the items of a page share them
+_CUSTOM_KEYS = dict()
+
+
+def _custom_keys(keys: tuple) -> tuple:
+    custom_keys = _CUSTOM_KEYS.get(keys)
+    if custom_keys is None:
+        custom_keys = _CUSTOM_KEYS[keys] = tuple(key for key in keys if key.startswith(CUSTOM_PREFIX))
+    return custom_keys
+
+
+class _Content:
+    """Dict-like view of the fields of a compact model, what the properties of the regular models read"""
+    __slots__ = ('_model',)
+
+    def __init__(self, model) -> None:
+        self._model = model
+
+    def get(self, key, default=None):
+        index = self._model.SCHEMA.get(key)
+        if index is not None:
+            value = self._model._values[index]  # pylint: disable=protected-access
+            return default if value is _UNSET else value
+        if key.startswith(CUSTOM_PREFIX):
+            return self._model._custom_methods.get(key, default)  # pylint: disable=protected-access
+        return default
+
+    def __getitem__(self, key):
+        value = self.get(key, _UNSET)
+        if value is _UNSET:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value) -> None:
+        index = self._model.SCHEMA.get(key)
+        if index is not None:
+            self._model._values[index] = value  # pylint: disable=protected-access
+        elif key.startswith(CUSTOM_PREFIX):
+            self._model._custom_methods[key] = value  # pylint: disable=protected-access
+        else:
+            raise KeyError(f'{key} is not a field of {self._model.__class__.__name__}')
+
+    def __contains__(self, key) -> bool:
+        return self.get(key, _UNSET) is not _UNSET
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def keys(self):
+        return [key for key, _ in self.items()]
+
+    def items(self):
+        values = self._model._values  # pylint: disable=protected-access
+        known = [(key, values[index]) for key, index in self._model.SCHEMA.items() if values[index] is not _UNSET]
+        return known + list(self._model._custom_methods.items())  # pylint: disable=protected-access
+
+
+class _Compact(CustomMethods):
+    __slots__ = ('_values', '_custom', '_custom_fields')
+    SCHEMA = dict()
+
+    def __init__(self, content=None) -> None:
+        content = content or dict()
+        self._values = [content.get(key, _UNSET) for key in self.SCHEMA]
+        custom_keys = _custom_keys(tuple(content))
+        self._custom = (custom_keys, tuple([content[key] for key in custom_keys]))
+        self._custom_fields = None
+
+    @property
+    def _content(self):
+        return _Content(self)
+
+    @property
+    def _custom_methods(self):
+        if self._custom_fields is None:
+            self._custom_fields = dict(zip(*self._custom))
+            self._custom = None
+        return self._custom_fields
+
+    def raw_data(self):
+        # a plain dict, the requests serialize it
+        return dict(self._content.items())
+
+
+def _compact(model, fields):
+    """Compact class with the properties of model and slots for fields"""
+    namespace = {name: attr for name, attr in vars(model).items()
+                 if isinstance(attr, property) or name == '__str__'}
+    namespace.update(__slots__=(), __doc__=f'Compact {model.__name__}',
+                     SCHEMA={field: index for index, field in enumerate(fields)})
+    return type(f'Compact{model.__name__}', (_Compact,), namespace)
+
+
+CompactCase = _compact(Case, (
+    'id', 'title', 'section_id', 'suite_id', 'template_id', 'type_id', 'priority_id', 'milestone_id', 'refs',
+    'created_by', 'created_on', 'updated_by', 'updated_on', 'estimate', 'estimate_forecast', 'estimated_forecast',
+    'display_order'))
+CompactTest = _compact(Test, (
+    'id', 'case_id', 'run_id', 'status_id', 'assignedto_id', 'title', 'template_id', 'type_id', 'priority_id',
+    'milestone_id', 'refs', 'estimate', 'estimate_forecast'))
+CompactResult = _compact(Result, (
+    'id', 'test_id', 'status_id', 'created_by', 'created_on', 'assignedto_id', 'comment', 'version', 'elapsed',
+    'defects'))
+
+# regular model -> compact variant
+COMPACT = {Case: CompactCase, Test: CompactTest, Result: CompactResult}
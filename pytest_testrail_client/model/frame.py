@@ -0,0 +1,165 @@
+"""
+Columnar frames of results and tests, for analytics over many of them without one Python object per row.
+
+Numeric fields are held in one array per field: NumPy arrays when NumPy is installed, array.array otherwise.
+Text fields are held as indices into a string table shared by the columns of the frame, each distinct text once.
+Missing ids and timestamps are 0, missing elapsed times 0.0 and missing texts index 0, i.e. None.
+"""
+import heapq
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from pytest_testrail_client.helper import testrail_duration_to_timedelta
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+# TestRail system statuses passed and untested
+PASSED_STATUS_ID = 1
+UNTESTED_STATUS_ID = 3
+
+
+class Strings:
+    """Interned texts of a frame, index 0 is None"""
+
+    def __init__(self) -> None:
+        self._texts = [None]
+        self._indices = {None: 0}
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def __getitem__(self, index: int) -> Optional[str]:
+        return self._texts[index]
+
+    def intern(self, text: Optional[str]) -> int:
+        index = self._indices.get(text)
+        if index is None:
+            index = self._indices[text] = len(self._texts)
+            self._texts.append(text)
+        return index
+
+
+def _elapsed_seconds(cache: dict, duration) -> float:
+    """Seconds of a TestRail timespan, e.g. '1m 30s' or 90, parsed once per distinct value"""
+    seconds = cache.get(duration)
+    if seconds is None:
+        if isinstance(duration, (int, float)):
+            seconds = float(duration)
+        else:
+            seconds = testrail_duration_to_timedelta(duration).total_seconds() if duration else 0.0
+        cache[duration] = seconds
+    return seconds
+
+
+class _Frame:
+    # column name -> array typecode, 'I' columns index the string table
+    COLUMNS: Dict[str, str] = dict()
+
+    def __init__(self, columns: Dict[str, array], strings: Strings) -> None:
+        self.strings = strings
+        self._length = len(next(iter(columns.values()))) if columns else 0
+        self.columns = {name: numpy.frombuffer(column, dtype=column.typecode) if numpy is not None else column
+                        for name, column in columns.items()}
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, name: str):
+        return self.columns[name]
+
+    @classmethod
+    def _columns(cls) -> Dict[str, array]:
+        return {name: array(typecode) for name, typecode in cls.COLUMNS.items()}
+
+    def row(self, index: int) -> dict:
+        """Fields of one row, texts resolved"""
+        row = dict()
+        for name, column in self.columns.items():
+            value = column[index].item() if numpy is not None else column[index]
+            row[name] = self.strings[value] if self.COLUMNS[name] == 'I' else value
+        return row
+
+    def status_histogram(self) -> Dict[int, int]:
+        """Number of rows by status_id"""
+        status_ids = self.columns['status_id']
+        if numpy is not None:
+            values, counts = numpy.unique(status_ids, return_counts=True)
+            return dict(zip(values.tolist(), counts.tolist()))
+        return dict(sorted(Counter(status_ids).items()))
+
+    def pass_rate(self, passed_status_ids: Iterable[int] = (PASSED_STATUS_ID,)) -> float:
+        """Share of the rows with one of passed_status_ids, of the rows with a status other than untested"""
+        histogram = self.status_histogram()
+        with_status = sum(count for status_id, count in histogram.items()
+                          if status_id and status_id != UNTESTED_STATUS_ID)
+        passed = sum(histogram.get(status_id, 0) for status_id in set(passed_status_ids))
+        return passed / with_status if with_status else 0.0
+
+
+class ResultFrame(_Frame):
+    """Columns of test results, e.g. the results of get_results_for_run"""
+
+    COLUMNS = {'id': 'q', 'test_id': 'q', 'case_id': 'q', 'status_id': 'q', 'created_on': 'q', 'created_by': 'q',
+               'elapsed': 'd', 'assignedto_id': 'q', 'version': 'I', 'defects': 'I'}
+
+    @classmethod
+    def from_items(cls, results: Iterable[dict], case_ids: Dict[int, int] = None) -> 'ResultFrame':
+        """
+        :param results: Results as returned by TestRail, consumed once
+        :param case_ids: case_id by test_id, for results which do not carry their case_id
+        """
+        columns, strings, durations, case_ids = cls._columns(), Strings(), dict(), case_ids or dict()
+        ints = [(columns[name].append, name) for name, typecode in cls.COLUMNS.items()
+                if typecode == 'q' and name != 'case_id']
+        case_id, elapsed = columns['case_id'].append, columns['elapsed'].append
+        version, defects = columns['version'].append, columns['defects'].append
+        for result in results:
+            for append, name in ints:
+                append(result.get(name) or 0)
+            case_id(result.get('case_id') or case_ids.get(result.get('test_id')) or 0)
+            elapsed(_elapsed_seconds(durations, result.get('elapsed')))
+            version(strings.intern(result.get('version')))
+            defects(strings.intern(result.get('defects')))
+        return cls(columns, strings)
+
+    def slowest(self, count: int = 10) -> List[Tuple[int, float]]:
+        """(test_id, elapsed seconds) of the count slowest results, slowest first"""
+        test_ids, elapsed = self.columns['test_id'], self.columns['elapsed']
+        count = min(count, len(self))
+        if numpy is not None:
+            if not count:
+                return list()
+            rows = numpy.argpartition(elapsed, len(self) - count)[len(self) - count:]
+            rows = rows[numpy.argsort(elapsed[rows], kind='stable')[::-1]]
+            return list(zip(test_ids[rows].tolist(), elapsed[rows].tolist()))
+        rows = heapq.nlargest(count, range(len(self)), key=elapsed.__getitem__)
+        return [(test_ids[row], elapsed[row]) for row in rows]
+
+
+class TestFrame(_Frame):
+    """Columns of the tests of a run, e.g. the tests of get_tests"""
+
+    # not a test class, pytest does not collect it where it is imported
+    __test__ = False
+
+    COLUMNS = {'id': 'q', 'case_id': 'q', 'run_id': 'q', 'status_id': 'q', 'assignedto_id': 'q',
+               'priority_id': 'q', 'type_id': 'q', 'title': 'I', 'refs': 'I'}
+
+    @classmethod
+    def from_items(cls, tests: Iterable[dict]) -> 'TestFrame':
+        """
+        :param tests: Tests as returned by TestRail, consumed once
+        """
+        columns, strings = cls._columns(), Strings()
+        ints = [(columns[name].append, name) for name, typecode in cls.COLUMNS.items() if typecode == 'q']
+        texts = [(columns[name].append, name) for name, typecode in cls.COLUMNS.items() if typecode == 'I']
+        for test in tests:
+            for append, name in ints:
+                append(test.get(name) or 0)
+            for append, name in texts:
+                append(strings.intern(test.get(name)))
+        return cls(columns, strings)
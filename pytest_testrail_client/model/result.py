@@ -1,19 +1,12 @@
 from datetime import datetime, timedelta
 
 from pytest_testrail_client._exception import TestRailError
-from pytest_testrail_client.helper import custom_methods, testrail_duration_to_timedelta
+from pytest_testrail_client.helper import CustomMethods, testrail_duration_to_timedelta
 
 
-class Result(object):
+class Result(CustomMethods):
     def __init__(self, content=None):
         self._content = content or dict()
-        self._custom_methods = custom_methods(self._content)
-
-    def __getattr__(self, attr):
-        if attr in self._custom_methods:
-            return self._content.get(self._custom_methods[attr])
-        raise AttributeError('"{}" object has no attribute "{}"'.format(
-            self.__class__.__name__, attr))
 
     @property
     def assignedto_id(self):
@@ -1,20 +1,20 @@
-from pytest_testrail_client.helper import custom_methods, testrail_duration_to_timedelta
+from pytest_testrail_client.helper import CustomMethods, testrail_duration_to_timedelta
 
 
-class Test(object):
+class Test(CustomMethods):
+    # not a test class, pytest does not collect it where it is imported
+    __test__ = False
+
     def __init__(self, content=None):
         self._content = content or dict()
-        self.custom_methods = custom_methods(self._content)
-
-    def __getattr__(self, attr):
-        if attr in self.custom_methods:
-            return self._content.get(self._custom_methods[attr])
-        raise AttributeError('"{}" object has no attribute "{}"'.format(
-            self.__class__.__name__, attr))
 
     def __str__(self):
         return self.title
 
+    @property
+    def custom_methods(self):
+        return self._custom_methods
+
     @property
     def assignedto_id(self):
         return self._content.get('assignedto_id')
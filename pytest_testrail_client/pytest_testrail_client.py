@@ -6,7 +6,6 @@ import operator
 from collections import defaultdict
 from copy import deepcopy
 from os import environ
-from typing import List
 
 import pytest
 
@@ -16,8 +15,13 @@ from pytest_testrail_client.model.result import Result
 from pytest_testrail_client.model.section import Section
 from pytest_testrail_client.model.suite import Suite
 from pytest_testrail_client.testrail_api import TestRailAPI, validate_setup
+from ._case_updates import CaseUpdates, SyncManifest
 from ._exception import TestRailError
-from ._utils import _get_feature, _get_list_of_files, _write_feature
+from ._feature_cache import FeatureCache
+from ._index import CaseIndex, TestIndex
+from ._metrics import Metrics
+from ._session import _as_bool, _credentials, _get_option, clear_response_cache
+from ._utils import _get_list_of_files, _iter_features, _write_feature
 from .model.run import Run
 
 SEPARATOR_CHAR = ' - '
@@ -29,6 +33,8 @@ DEFAULT_SECTION_NAME = 'Default Section'
 def pytest_configure(config):
     config.option.markexpr = 'not not_in_scope'
     pytest.testrail_client_dict = defaultdict()
+    pytest.testrail_client_dict['metrics'] = Metrics()
+    clear_response_cache(config)
 
 
 def pytest_addoption(parser):
@@ -63,6 +69,93 @@ def pytest_addoption(parser):
     _help = "TestRail Test Configuration used for testing."
     group.addoption("--pytest-testrail-test-configuration-name", action="store", default=None, help=_help)
 
+    _help = "Maximum number of concurrent TestRail requests for independent calls (default: 8)."
+    group.addoption("--testrail-max-workers", action="store", type=int, default=None, help=_help)
+    parser.addini("testrail-max-workers", default=None, help=_help)
+    _help = "Number of host connection pools to cache (default: 10)."
+    group.addoption("--testrail-pool-connections", action="store", type=int, default=None, help=_help)
+    parser.addini("testrail-pool-connections", default=None, help=_help)
+    _help = "Maximum number of connections kept alive per host (default: testrail-max-workers)."
+    group.addoption("--testrail-pool-maxsize", action="store", type=int, default=None, help=_help)
+    parser.addini("testrail-pool-maxsize", default=None, help=_help)
+    _help = "Reuse connections between requests: true / false (default: true)."
+    group.addoption("--testrail-keep-alive", action="store", choices=("true", "false"), default=None, help=_help)
+    parser.addini("testrail-keep-alive", default=None, help=_help)
+    _help = "Seconds to wait for a connection to TestRail (default: 30)."
+    group.addoption("--testrail-connect-timeout", action="store", type=float, default=None, help=_help)
+    parser.addini("testrail-connect-timeout", default=None, help=_help)
+    _help = "Seconds to wait for a TestRail response (default: 30)."
+    group.addoption("--testrail-read-timeout", action="store", type=float, default=None, help=_help)
+    parser.addini("testrail-read-timeout", default=None, help=_help)
+    _help = "Requests per minute allowed by TestRail, paced by a token bucket shared by all workers of the host. " \
+            "The rate is lowered automatically on HTTP 429 (default: not paced, a HTTP 429 only waits for its " \
+            "retry-after delay)."
+    group.addoption("--testrail-rate-limit", action="store", type=float, default=None, help=_help)
+    parser.addini("testrail-rate-limit", default=None, help=_help)
+    _help = "File sharing the rate limit state between processes (default: one per TestRail url in the temp dir)."
+    group.addoption("--testrail-rate-limit-file", action="store", default=None, help=_help)
+    parser.addini("testrail-rate-limit-file", default=None, help=_help)
+    _help = "Maximum attempts of a request failing with a connection error, a timeout or HTTP 429/502/503/504 " \
+            "(default: 5)."
+    group.addoption("--testrail-retries", action="store", type=int, default=None, help=_help)
+    parser.addini("testrail-retries", default=None, help=_help)
+    _help = "Seconds before the first retry, doubled with jitter on every following one (default: 0.5)."
+    group.addoption("--testrail-retry-backoff", action="store", type=float, default=None, help=_help)
+    parser.addini("testrail-retry-backoff", default=None, help=_help)
+    _help = "Seconds after which a request is not retried anymore (default: 300)."
+    group.addoption("--testrail-retry-deadline", action="store", type=float, default=None, help=_help)
+    parser.addini("testrail-retry-deadline", default=None, help=_help)
+    _help = "Seconds, from the start of the export, after which no request is retried anymore (default: none)."
+    group.addoption("--testrail-global-deadline", action="store", type=float, default=None, help=_help)
+    parser.addini("testrail-global-deadline", default=None, help=_help)
+    _help = "Cache slow changing responses (project, suites, sections, configs, statuses, priorities, templates, " \
+            "case types, fields) in .pytest_cache between runs: true / false (default: false)."
+    group.addoption("--testrail-cache", action="store", choices=("true", "false"), default=None, help=_help)
+    parser.addini("testrail-cache", default=None, help=_help)
+    _help = "Time to live of the cached responses by endpoint in seconds, e.g. get_sections=600,get_statuses=0."
+    group.addoption("--testrail-cache-ttl", action="store", default=None, help=_help)
+    parser.addini("testrail-cache-ttl", default=None, help=_help)
+    _help = "Drop the cached TestRail responses before starting."
+    group.addoption("--testrail-cache-clear", action="store_true", help=_help)
+    _help = "Report calls, latency percentiles, bytes, retries and HTTP 429 of the TestRail requests by endpoint."
+    group.addoption("--testrail-metrics", action="store_true", help=_help)
+    parser.addini("testrail-metrics", default=None, help=_help)
+    _help = "Write the TestRail request metrics to the given JSON file."
+    group.addoption("--testrail-metrics-json", action="store", default=None, help=_help)
+    parser.addini("testrail-metrics-json", default=None, help=_help)
+    _help = "Write every TestRail request and response to a cassette in the given directory."
+    group.addoption("--testrail-record", action="store", default=None, help=_help)
+    parser.addini("testrail-record", default=None, help=_help)
+    _help = "Serve the TestRail responses from the cassette in the given directory, without network nor account."
+    group.addoption("--testrail-replay", action="store", default=None, help=_help)
+    parser.addini("testrail-replay", default=None, help=_help)
+    _help = "Seconds added to every replayed response (default: 0)."
+    group.addoption("--testrail-replay-latency", action="store", type=float, default=None, help=_help)
+    parser.addini("testrail-replay-latency", default=None, help=_help)
+    _help = "Compress large request bodies with gzip, turned off if TestRail refuses them: true / false " \
+            "(default: false)."
+    group.addoption("--testrail-compress", action="store", choices=("true", "false"), default=None, help=_help)
+    parser.addini("testrail-compress", default=None, help=_help)
+    _help = "Size in bytes from which request bodies are compressed (default: 16384)."
+    group.addoption("--testrail-compress-threshold", action="store", type=int, default=None, help=_help)
+    parser.addini("testrail-compress-threshold", default=None, help=_help)
+    _help = "Hold the cases, tests and results read from TestRail in compact objects keeping only their known and " \
+            "custom fields, for large projects: true / false (default: false)."
+    group.addoption("--testrail-compact-models", action="store", choices=("true", "false"), default=None, help=_help)
+    parser.addini("testrail-compact-models", default=None, help=_help)
+    _help = "Number of processes parsing the feature files while the export runs (default: number of CPUs, " \
+            "1 parses them in the pytest process)."
+    group.addoption("--testrail-parse-workers", action="store", type=int, default=None, help=_help)
+    parser.addini("testrail-parse-workers", default=None, help=_help)
+    _help = "Keep the parsed feature files in .pytest_cache and parse only the changed ones on the next case " \
+            "export: true / false (default: true)."
+    group.addoption("--testrail-feature-cache", action="store", choices=("true", "false"), default=None, help=_help)
+    parser.addini("testrail-feature-cache", default=None, help=_help)
+    _help = "Keep a hash of every exported case in .pytest_cache and skip the cases which did not change since the " \
+            "last case export, unless they changed in TestRail: true / false (default: true)."
+    group.addoption("--testrail-sync-manifest", action="store", choices=("true", "false"), default=None, help=_help)
+    parser.addini("testrail-sync-manifest", default=None, help=_help)
+
 
 def pytest_collection_modifyitems(config, items):
     if 'pytest_testrail_export_test_cases' in config.option \
@@ -78,13 +171,12 @@ def pytest_sessionstart(session):
         pytest.testrail_client_dict['scenarios_run'] = {}
 
         tr, project_data = get_testrail_api(session.config)
-        tr_configs = functools.reduce(operator.iconcat, [tr_cg['configs'] for tr_cg in
-                                                         tr.configurations.get_configs(project_data['project_id'])])
+        tr_configs = tr.registry.configs(project_data['project_id'])
         project_data['configuration_name'] = session.config.option.pytest_testrail_test_configuration_name
-        if project_data['configuration_name'] not in [tr_config['name'] for tr_config in tr_configs]:
+        if project_data['configuration_name'] not in tr_configs:
             TestRailError(f"Configuration {project_data['configuration_name']} not available. \n"
                           f"Please use one of the following configurations or manually create a new one: "
-                          f"{[tr_config['name'] for tr_config in tr_configs]}")
+                          f"{tr_configs.names()}")
 
 
 def pytest_sessionfinish(session):
@@ -96,10 +188,26 @@ def pytest_sessionfinish(session):
 
         try:
             tr, project_data = get_testrail_api(session.config)
-            for file_path in files_abs_path:
-                feature = _get_feature(file_path)
-                export_test_cases(tr, project_data['project_id'], project_data['jira_project_key'], feature['feature'],
-                                  file_path)
+            manifest = None
+            if getattr(session.config, 'cache', None) is not None \
+                    and _as_bool(_get_option(session.config, "testrail-sync-manifest", True)):
+                manifest = SyncManifest(session.config.cache, _credentials(session.config)[0],
+                                        project_data['project_id'])
+            updates = CaseUpdates(tr, project_data['project_id'], manifest)
+            parse_workers = int(_get_option(session.config, "testrail-parse-workers", 0))
+            feature_cache = None
+            if getattr(session.config, 'cache', None) is not None \
+                    and _as_bool(_get_option(session.config, "testrail-feature-cache", True)):
+                feature_cache = FeatureCache(session.config.cache.mkdir('testrail'))
+            tr.metrics.start_phase('export test cases')
+            try:
+                for file_path, feature in _iter_features(files_abs_path, parse_workers, feature_cache):
+                    export_test_cases(tr, project_data['project_id'], project_data['jira_project_key'],
+                                      feature['feature'], file_path, updates)
+                updates.flush()
+            finally:
+                # also when the export failed, so its time is not counted in a later phase
+                tr.metrics.end_phase()
         except ImportError as e:
             pass
     if 'pytest_testrail_export_test_results' in session.config.option \
@@ -112,61 +220,100 @@ def pytest_sessionfinish(session):
             testrail_plan_id = session.config.option.pytest_testrail_test_plan_id
             project_data['plan_id'] = testrail_plan_id
             project_data['configuration_name'] = session.config.option.pytest_testrail_test_configuration_name
-            export_tests_results(tr, project_data, scenarios_run)
+            try:
+                export_tests_results(tr, project_data, scenarios_run)
+            finally:
+                # ends the phase the export was in, also when it failed
+                tr.metrics.end_phase()
         except ImportError:
             pass
 
 
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    metrics = pytest.testrail_client_dict['metrics']
+    if not metrics.endpoints:
+        return
+    if _as_bool(_get_option(config, "testrail-metrics", False)):
+        terminalreporter.write_sep('-', 'TestRail requests')
+        for line in metrics.report():
+            terminalreporter.write_line(line)
+    metrics_json = _get_option(config, "testrail-metrics-json")
+    if metrics_json:
+        metrics.dump(metrics_json)
+        terminalreporter.write_line(f'TestRail request metrics written to {metrics_json}')
+
+
 def get_testrail_api(config):
-    tr = TestRailAPI(config)
-    project_id = config.getoption("--testrail-project-id") \
-                 or config.inicfg.config.get('pytest-testrail-client', 'testrail-project-id') \
-                 or environ.get("TESTRAIL_PROJECT_ID")
-    jira_project_key = config.getoption("--jira-project-key") \
-                       or config.inicfg.config.get('pytest-testrail-client', 'jira-project-key') \
-                       or environ.get("JIRA_PROJECT_KEY")
-    validate_setup(tr, project_id)
-    return tr, {'project_id': project_id, 'jira_project_key': jira_project_key}
-
-
-def export_test_cases(tr: TestRailAPI, project_id: int, jira_project_key, feature, feature_file_path):
+    # one client per run, the sessionstart and sessionfinish hooks share its registry
+    api = pytest.testrail_client_dict.get('api')
+    if api is None:
+        tr = TestRailAPI(config, metrics=pytest.testrail_client_dict['metrics'])
+        project_id = config.getoption("--testrail-project-id") \
+                     or config.inicfg.config.get('pytest-testrail-client', 'testrail-project-id') \
+                     or environ.get("TESTRAIL_PROJECT_ID")
+        jira_project_key = config.getoption("--jira-project-key") \
+                           or config.inicfg.config.get('pytest-testrail-client', 'jira-project-key') \
+                           or environ.get("JIRA_PROJECT_KEY")
+        validate_setup(tr, project_id)
+        api = pytest.testrail_client_dict['api'] = (tr, {'project_id': project_id,
+                                                          'jira_project_key': jira_project_key})
+    tr, project_data = api
+    # the hooks add their own keys to the project data
+    return tr, dict(project_data)
+
+
+def export_test_cases(tr: TestRailAPI, project_id: int, jira_project_key, feature, feature_file_path,
+                      updates: CaseUpdates = None):
+    # without a caller collecting the updates of several features, they are sent at the end of this one
+    flush = updates is None
+    updates = CaseUpdates(tr, project_id) if flush else updates
     tr_project_suite_id = get_project_suite_id(tr, project_id, feature)
     tr_suite_sections_id = get_suite_section_id(tr, project_id, tr_project_suite_id, feature)
     tr_suite_section_id = tr_suite_sections_id['tr_suite_sub_section_id'] \
         if tr_suite_sections_id['tr_suite_sub_section_id'] is not None \
         else tr_suite_sections_id['tr_suite_section_id']
     raw_custom_preconds = []
-    for scenario in reversed(feature['children']):
-        if scenario['type'] == 'Background':
-            continue
-        raw_cases = []
-        if 'examples' in scenario:
-            examples_raw = scenario['examples'][0]
-            table_rows = []
-            table_header = examples_raw['tableHeader']['cells']
-            for i in range(examples_raw['tableBody'].__len__()):
-                table_row = examples_raw['tableBody'][i]
-                row = {}
-                for j in range(table_row['cells'].__len__()):
-                    row.update({table_header[j]['value']: table_row['cells'][j]['value']})
-                table_rows.append(row)
-            for table_row in table_rows:
-                raw_custom_data_set = json.dumps(table_row, indent=4, ensure_ascii=False)
-                raw_cases.append(build_case(tr=tr, project_id=project_id, suite_id=tr_project_suite_id,
-                                            section_id=tr_suite_section_id, feature=feature, scenario=scenario,
-                                            raw_custom_preconds=raw_custom_preconds,
-                                            raw_custom_data_set=raw_custom_data_set,
-                                            project_name=jira_project_key))
-            set_test_case(tr, tr_suite_section_id, feature_file_path, scenario, raw_cases)
-        else:
-            raw_case = build_case(tr=tr, project_id=project_id, suite_id=tr_project_suite_id,
-                                  section_id=tr_suite_section_id, feature=feature, scenario=scenario,
-                                  raw_custom_preconds=raw_custom_preconds, raw_custom_data_set=None,
-                                  project_name=jira_project_key)
-            set_test_case(tr, tr_suite_section_id, feature_file_path, scenario, [raw_case])
-
-
-def set_test_case(tr: TestRailAPI, section_id, feature_file_path, scenario, raw_cases):
+    # tags of the scenarios created in TestRail, written to the feature file at once
+    insertions = list()
+    try:
+        for scenario in feature['children']:
+            if scenario['type'] == 'Background':
+                continue
+            raw_cases = []
+            if 'examples' in scenario:
+                examples_raw = scenario['examples'][0]
+                table_rows = []
+                table_header = examples_raw['tableHeader']['cells']
+                for i in range(examples_raw['tableBody'].__len__()):
+                    table_row = examples_raw['tableBody'][i]
+                    row = {}
+                    for j in range(table_row['cells'].__len__()):
+                        row.update({table_header[j]['value']: table_row['cells'][j]['value']})
+                    table_rows.append(row)
+                for table_row in table_rows:
+                    raw_custom_data_set = json.dumps(table_row, indent=4, ensure_ascii=False)
+                    raw_cases.append(build_case(tr=tr, project_id=project_id, suite_id=tr_project_suite_id,
+                                                section_id=tr_suite_section_id, feature=feature, scenario=scenario,
+                                                raw_custom_preconds=raw_custom_preconds,
+                                                raw_custom_data_set=raw_custom_data_set,
+                                                project_name=jira_project_key))
+                set_test_case(tr, tr_suite_section_id, feature_file_path, scenario, raw_cases, updates, insertions)
+            else:
+                raw_case = build_case(tr=tr, project_id=project_id, suite_id=tr_project_suite_id,
+                                      section_id=tr_suite_section_id, feature=feature, scenario=scenario,
+                                      raw_custom_preconds=raw_custom_preconds, raw_custom_data_set=None,
+                                      project_name=jira_project_key)
+                set_test_case(tr, tr_suite_section_id, feature_file_path, scenario, [raw_case], updates, insertions)
+    finally:
+        # also the tags of the cases created before an error, so they are not created again
+        if insertions:
+            _write_feature(feature_file_path, insertions)
+    if flush:
+        updates.flush()
+
+
+def set_test_case(tr: TestRailAPI, section_id, feature_file_path, scenario, raw_cases, updates: CaseUpdates = None,
+                  insertions: list = None):
     tags = [tag for tag in scenario['tags'] if TESTRAIL_TAG_PREFIX in tag['name']]
     if tags.__len__() != 0:
         print(f'Scenario {scenario["name"]} already exists in TestRail. Updating ...')
@@ -174,18 +321,27 @@ def set_test_case(tr: TestRailAPI, section_id, feature_file_path, scenario, raw_
             print(f'Cannot update Scenario {scenario["name"]}. The number of eExamples changed. '
                   f'Please manually remove {[tag["name"] + " " for tag in tags]} and import Scenario as new one.')
         for index, raw_case in enumerate(raw_cases, start=0):
-            tr.cases.update_case(case_id=tags[index]['name'].replace(TESTRAIL_TAG_PREFIX, ''), case=raw_case)
+            case_id = tags[index]['name'].replace(TESTRAIL_TAG_PREFIX, '')
+            if updates is not None:
+                updates.add(case_id, raw_case)
+            else:
+                tr.cases.update_case(case_id=case_id, case=raw_case)
     else:
         print(f'Creating scenario {scenario["name"]} in TestRail.')
-        line = scenario['location']['line'] - 1 \
-            if scenario['tags'].__len__() > 0 else scenario['location']['line']
-        column = scenario['location']['column']
+        # before the first tag of the scenario, else on a line of its own before the scenario
+        location = scenario['tags'][0]['location'] if scenario['tags'].__len__() > 0 else scenario['location']
+        line, column = location['line'], location['column']
         tag = ''
         for raw_case in raw_cases:
             tr_case = tr.cases.add_case(section_id=section_id, case=raw_case)
+            if updates is not None:
+                updates.created(raw_case, tr_case)
             tag += f'{TESTRAIL_TAG_PREFIX}{tr_case.id} '
         tag += f'\n{" " * int(column - 1)}' if scenario['tags'].__len__() == 0 else ''
-        _write_feature(feature_file_path, line, column, tag)
+        if insertions is not None:
+            insertions.append((line, column, tag))
+        else:
+            _write_feature(feature_file_path, [(line, column, tag)])
 
 
 # pylint: disable=too-many-arguments
@@ -211,14 +367,13 @@ def build_case(tr: TestRailAPI, project_id: int, suite_id: int, section_id: int,
         else 'High' if filter(lambda sc: 'sanity' in sc['name'], scenario['tags']) \
         else 'Medium' if filter(lambda sc: 'regression' in sc['name'], scenario['tags']) \
         else 'Low'
-    raw_priority = next((pr.id for pr in tr.priorities.get_priorities() if pr.name == priority_name), None)
+    raw_priority = tr.registry.priorities.id_of(priority_name)
 
     # Setting Case type
-    raw_type = next((ct.id for ct in tr.case_types.get_case_types() if ct.name == 'Functional'), None)
+    raw_type = tr.registry.case_types.id_of('Functional')
 
     # Setting Case template
-    raw_template = next((ct.id for ct in tr.templates.get_templates(project_id) if ct.name == 'Test Case (Steps)'),
-                        None)
+    raw_template = tr.registry.templates(project_id).id_of('Test Case (Steps)')
 
     # Setting Case automation
     raw_custom_automation_type = '2' if any('stencil-automated' in sc['name'] for sc in scenario['tags']) \
@@ -263,17 +418,15 @@ def add_data_table(scenario_step):
 
 
 # pylint: disable=protected-access
-def export_case(tr: TestRailAPI, section_id: int, tr_suite_cases: List[Case], raw_case: Case):
-    tr_suite_case = next((sc for sc in tr_suite_cases
-                          if sc.title == raw_case.title
-                          and sc._custom_methods['custom_data_set'] == raw_case._custom_methods['custom_data_set'])
-                         , None)
+def export_case(tr: TestRailAPI, section_id: int, tr_suite_cases: CaseIndex, raw_case: Case) -> Case:
+    # callers exporting several cases of a suite build the index once
+    tr_suite_case = tr_suite_cases.find(raw_case.title, raw_case._custom_methods.get('custom_data_set'))
     if tr_suite_case:
         print('Upgrading Case ', tr_suite_case.title)
         tr.cases.update_case(case_id=tr_suite_case.id, case=raw_case)
-    else:
-        print('Creating Case ', raw_case.title)
-        tr.cases.add_case(section_id=section_id, case=raw_case)
+        return tr_suite_case
+    print('Creating Case ', raw_case.title)
+    return tr.cases.add_case(section_id=section_id, case=raw_case)
 
 
 def get_project_test_plan(tr, tr_plan_name, test_market):
@@ -316,11 +469,11 @@ def get_suite_section_id(tr: TestRailAPI, project_id: int, project_suite_id: int
     suite_name_raw = feature_name_raw.split(SEPARATOR_CHAR)[0]
     section_name_raw = feature_name_components[1] if feature_name_components.__len__() > 1 else DEFAULT_SECTION_NAME
     sub_section_name_raw = feature_name_components[2] if feature_name_components.__len__() > 2 else None
-    tr_suite_sections = tr.sections.get_sections(project_id, project_suite_id)
-    if any(tr_suite_section.name == section_name_raw for tr_suite_section in tr_suite_sections):
+    # one fetch per suite for all its features, sections created below are added to the tree
+    tr_suite_sections = tr.registry.sections(project_id, project_suite_id, suite_name_raw)
+    tr_suite_section = tr_suite_sections.get(suite_name_raw, section_name_raw)
+    if tr_suite_section is not None:
         print(f'Collecting Sections for suite {suite_name_raw} from TestRail')
-        tr_suite_section_id = next(section.id for section in tr_suite_sections if section.name == section_name_raw)
-        tr_suite_section_id = tr_suite_section_id
     else:
         print(f'No Section with name {section_name_raw} was found for suite {suite_name_raw}. Creating new Section.')
         suite_section = {
@@ -330,15 +483,14 @@ def get_suite_section_id(tr: TestRailAPI, project_id: int, project_suite_id: int
             'display_order': 2,
             'suite_id': project_suite_id
         }
-        tr_suite_section = tr.sections.add_section(project_id=project_id, section=Section(suite_section))
-        tr_suite_section_id = tr_suite_section.id
-        tr_suite_sections = tr.sections.get_sections(project_id, project_suite_id)
-    if (sub_section_name_raw is not None and any(tr_suite_section.name == sub_section_name_raw
-                                                 for tr_suite_section in tr_suite_sections)):
+        tr_suite_section = tr_suite_sections.add(
+            tr.sections.add_section(project_id=project_id, section=Section(suite_section)))
+    tr_suite_section_id = tr_suite_section.id
+    tr_suite_sub_section = tr_suite_sections.get(suite_name_raw, section_name_raw, sub_section_name_raw) \
+        if sub_section_name_raw is not None else None
+    if tr_suite_sub_section is not None:
         print(f'Collecting Sub-Sections for suite {suite_name_raw} from TestRail')
-        tr_suite_sub_section_id = next(section.id
-                                       for section in tr_suite_sections if section.name == sub_section_name_raw)
-        tr_suite_sub_section_id = tr_suite_sub_section_id
+        tr_suite_sub_section_id = tr_suite_sub_section.id
     elif sub_section_name_raw is not None:
         suite_sub_section = {
             'name': sub_section_name_raw,
@@ -348,7 +500,8 @@ def get_suite_section_id(tr: TestRailAPI, project_id: int, project_suite_id: int
             'suite_id': project_suite_id,
             'parent_id': tr_suite_section_id
         }
-        tr_suite_sub_section = tr.sections.add_section(project_id=project_id, section=Section(suite_sub_section))
+        tr_suite_sub_section = tr_suite_sections.add(
+            tr.sections.add_section(project_id=project_id, section=Section(suite_sub_section)))
         tr_suite_sub_section_id = tr_suite_sub_section.id
     else:
         tr_suite_sub_section_id = None
@@ -358,28 +511,26 @@ def get_suite_section_id(tr: TestRailAPI, project_id: int, project_suite_id: int
 def export_tests_results(tr: TestRailAPI, project_data: dict, scenarios_run: list):
     print('\nPublishing results')
 
+    tr.metrics.start_phase('load plan')
     tr_plan = tr.plans.get_plan(project_data['plan_id'])
-    tr_statuses = tr.statuses.get_statuses()
+    tr_statuses = tr.registry.statuses
+    tr_configs = tr.registry.configs(project_data['project_id'])
+
+    tr_suites = tr.suites.get_suites(project_data['project_id'])
 
+    tr.metrics.start_phase('add plan entries')
     plan_entry_names = [plan_entry.name for plan_entry in tr_plan.entries]
     feature_names = scenarios_run.keys()
 
     for feature_name in feature_names:
         if feature_name not in plan_entry_names:
-            config_ids = [config['id'] for config in functools.reduce(operator.iconcat,
-                                                                      [config_groups['configs'] for config_groups in
-                                                                       tr.configurations.get_configs(
-                                                                           project_data['project_id'])])]
+            config_ids = list(tr_configs.by_id)
         else:
-            config_ids = [config['id'] for config in functools.reduce(operator.iconcat,
-                                                                      [config_groups['configs'] for config_groups in
-                                                                       tr.configurations.get_configs(
-                                                                           project_data['project_id'])])
+            config_ids = [config['id'] for config in tr_configs
                           if config['name'] == project_data['configuration_name']]
         if feature_name not in plan_entry_names or (feature_name in plan_entry_names and project_data['configuration_name'] not in [run.config for run in functools.reduce(operator.iconcat, [plan_entry.runs for plan_entry in tr_plan.entries if plan_entry.name == feature_name])]):
             print(f"Adding suite {feature_name} to test plan {tr_plan.name}")
-            suite_id = next((tr_suite.id for tr_suite in tr.suites.get_suites(project_data['project_id'])
-                             if tr_suite.name == feature_name), None)
+            suite_id = next((tr_suite.id for tr_suite in tr_suites if tr_suite.name == feature_name), None)
             runs = [Run({
                 'include_all': True,
                 'config_ids': [config_id],
@@ -393,54 +544,58 @@ def export_tests_results(tr: TestRailAPI, project_data: dict, scenarios_run: lis
             })
             tr.plans.add_plan_entry(tr_plan.id, tr_plan_entry)
 
+    tr.metrics.start_phase('fetch tests')
     tr_plan = tr.plans.get_plan(project_data['plan_id'])
-    for tr_plan_entry in tr_plan.entries:
-        for tr_run in tr_plan_entry.runs:
-            tr_results = []
-            if tr_run.config == project_data['configuration_name'] and tr_run.name in scenarios_run:
-                for scenario_run in scenarios_run[tr_run.name]:
-                    tr_tests = tr.tests.get_tests(tr_run.id)
-                    tr_test = next((test for test in tr_tests if test.title == scenario_run.name
-                                    and (test.custom_methods['custom_data_set'] is None
-                                         or ('custom_data_set' in test.custom_methods
-                                             and json.loads(
-                                test.custom_methods['custom_data_set']) == scenario_run.data_set)))
-                                   , None)
-
-                    if tr_test is None:
-                        print('Result for test %s not published to TestRail' % scenario_run.name)
-                    else:
-                        custom_step_results = []
-                        custom_steps_separated = tr_test.custom_methods['custom_steps_separated']
-                        passed = True
-                        for scenario_step, tr_case_step in zip(scenario_run.steps, custom_steps_separated):
-                            status_type = 'blocked' if not passed \
-                                else 'passed' if not scenario_step.failed \
-                                else 'failed' if scenario_step.failed \
-                                else 'untested'
-                            if status_type == 'failed':
-                                passed = False
-                            status_id = next((st.id for st in tr_statuses if st.name == status_type), None)
-                            exception_message = scenario_run.exception_message \
-                                if status_type == 'failed' and hasattr(scenario_run, 'exception_message') \
-                                else ''
-                            custom_step_results.append({
-                                'content': tr_case_step['content'],
-                                'expected': tr_case_step['expected'],
-                                'actual': exception_message,
-                                'status_id': status_id
-                            })
-                        status_type = 'failed' if scenario_run.failed else 'passed'
-                        tr_result = Result({
-                            'test_id': tr_test.id,
-                            'status_id': next(st.id for st in tr_statuses if st.name == status_type),
-                            'comment': '',
-                            'custom_step_results': custom_step_results
-                        })
-                        tr_results.append(tr_result)
-
-            if tr_results.__len__() != 0:
-                tr.results.add_results(tr_run.id, tr_results)
+    tr_runs = [tr_run for tr_plan_entry in tr_plan.entries for tr_run in tr_plan_entry.runs
+               if tr_run.config == project_data['configuration_name'] and tr_run.name in scenarios_run]
+    # tests of every run are independent of each other, fetch them concurrently
+    tr_runs_tests = tr.map(lambda run: tr.tests.get_tests(run.id), tr_runs)
+    tr.metrics.start_phase('match results')
+    tr_runs_results = []
+    for tr_run, tr_tests in zip(tr_runs, tr_runs_tests):
+        tr_results = []
+        tr_tests = TestIndex(tr_tests)
+        for scenario_run in scenarios_run[tr_run.name]:
+            tr_test = tr_tests.find(scenario_run.name, scenario_run.data_set)
+
+            if tr_test is None:
+                print('Result for test %s not published to TestRail' % scenario_run.name)
+            else:
+                custom_step_results = []
+                custom_steps_separated = tr_test.custom_methods['custom_steps_separated']
+                passed = True
+                for scenario_step, tr_case_step in zip(scenario_run.steps, custom_steps_separated):
+                    status_type = 'blocked' if not passed \
+                        else 'passed' if not scenario_step.failed \
+                        else 'failed' if scenario_step.failed \
+                        else 'untested'
+                    if status_type == 'failed':
+                        passed = False
+                    status_id = tr_statuses.id_of(status_type)
+                    exception_message = scenario_run.exception_message \
+                        if status_type == 'failed' and hasattr(scenario_run, 'exception_message') \
+                        else ''
+                    custom_step_results.append({
+                        'content': tr_case_step['content'],
+                        'expected': tr_case_step['expected'],
+                        'actual': exception_message,
+                        'status_id': status_id
+                    })
+                status_type = 'failed' if scenario_run.failed else 'passed'
+                tr_result = Result({
+                    'test_id': tr_test.id,
+                    'status_id': tr_statuses.id_of(status_type),
+                    'comment': '',
+                    'custom_step_results': custom_step_results
+                })
+                tr_results.append(tr_result)
+
+        if tr_results.__len__() != 0:
+            tr_runs_results.append((tr_run.id, tr_results))
+    tr.metrics.start_phase('publish results')
+    # results of one run are a single POST, runs are published concurrently
+    tr.map(lambda run_results: tr.results.add_results(*run_results), tr_runs_results)
+    tr.metrics.end_phase()
     print('\nResults published')
 
 
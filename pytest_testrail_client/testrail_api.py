@@ -2,8 +2,13 @@
 Description
 """
 from __future__ import annotations
-from . import _category
+
+from concurrent.futures import ThreadPoolExecutor
+
+from . import _async_category, _category
+from ._async_session import DEFAULT_CONCURRENCY, AsyncSession
 from ._exception import TestRailConfigurationError
+from ._registry import Registry
 from ._session import Session
 
 
@@ -20,6 +25,20 @@ def validate_setup(tr: TestRailAPI, project_id):
 
 class TestRailAPI(Session):
 
+    def __init__(self, config, **kwargs) -> None:
+        super().__init__(config, **kwargs)
+        self._registry = Registry(self)
+
+    @property
+    def registry(self) -> Registry:
+        """Reference data (priorities, case types, statuses, templates, configs) loaded once per client"""
+        return self._registry
+
+    @property
+    def attachments(self):
+        """http://docs.gurock.com/testrail-api2/reference-attachments"""
+        return _category.Attachments(self)
+
     @property
     def cases(self):
         """http://docs.gurock.com/testrail-api2/reference-cases"""
@@ -104,3 +123,115 @@ class TestRailAPI(Session):
     def users(self):
         """http://docs.gurock.com/testrail-api2/reference-users"""
         return _category.Users(self)
+
+
+class AsyncTestRailAPI(AsyncSession):
+    """
+    asyncio client, every category method is a coroutine.
+
+        async with AsyncTestRailAPI(config, max_concurrency=16) as tr:
+            tests = await asyncio.gather(*(tr.tests.get_tests(run.id) for run in runs))
+    """
+
+    def __init__(self, config, max_concurrency: int = DEFAULT_CONCURRENCY, **kwargs) -> None:
+        super().__init__(config, max_concurrency=max_concurrency, **kwargs)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency * 2, thread_name_prefix='testrail')
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Worker threads running the shared category code"""
+        return self._executor
+
+    async def close(self) -> None:
+        await super().close()
+        self._executor.shutdown(wait=False)
+
+    @property
+    def attachments(self):
+        """http://docs.gurock.com/testrail-api2/reference-attachments"""
+        return _async_category.Attachments(self)
+
+    @property
+    def cases(self):
+        """http://docs.gurock.com/testrail-api2/reference-cases"""
+        return _async_category.Cases(self)
+
+    @property
+    def case_fields(self):
+        """http://docs.gurock.com/testrail-api2/reference-cases-fields"""
+        return _async_category.CaseFields(self)
+
+    @property
+    def case_types(self):
+        """http://docs.gurock.com/testrail-api2/reference-cases-types"""
+        return _async_category.CaseTypes(self)
+
+    @property
+    def configurations(self):
+        """http://docs.gurock.com/testrail-api2/reference-configs"""
+        return _async_category.Configurations(self)
+
+    @property
+    def milestones(self):
+        """http://docs.gurock.com/testrail-api2/reference-milestones"""
+        return _async_category.Milestones(self)
+
+    @property
+    def plans(self):
+        """http://docs.gurock.com/testrail-api2/reference-plans"""
+        return _async_category.Plans(self)
+
+    @property
+    def priorities(self):
+        """http://docs.gurock.com/testrail-api2/reference-priorities"""
+        return _async_category.Priorities(self)
+
+    @property
+    def projects(self):
+        """http://docs.gurock.com/testrail-api2/reference-projects"""
+        return _async_category.Projects(self)
+
+    @property
+    def results(self):
+        """http://docs.gurock.com/testrail-api2/reference-results"""
+        return _async_category.Results(self)
+
+    @property
+    def result_fields(self):
+        """http://docs.gurock.com/testrail-api2/reference-results-fields"""
+        return _async_category.ResultFields(self)
+
+    @property
+    def runs(self):
+        """http://docs.gurock.com/testrail-api2/reference-runs"""
+        return _async_category.Runs(self)
+
+    @property
+    def sections(self):
+        """http://docs.gurock.com/testrail-api2/reference-sections"""
+        return _async_category.Sections(self)
+
+    @property
+    def statuses(self):
+        """http://docs.gurock.com/testrail-api2/reference-statuses"""
+        return _async_category.Statuses(self)
+
+    @property
+    def suites(self):
+        """http://docs.gurock.com/testrail-api2/reference-suites"""
+        return _async_category.Suites(self)
+
+    @property
+    def templates(self):
+        """http://docs.gurock.com/testrail-api2/reference-templates"""
+        return _async_category.Templates(self)
+
+    @property
+    def tests(self):
+        """http://docs.gurock.com/testrail-api2/reference-tests"""
+        return _async_category.Tests(self)
+
+    @property
+    def users(self):
+        """http://docs.gurock.com/testrail-api2/reference-users"""
+        return _async_category.Users(self)
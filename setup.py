@@ -19,6 +19,11 @@ setup(
         "pytest-bdd>=3.3.0",
         "requests",
     ],
+    extras_require={
+        "async": ["aiohttp"],
+        "fast-json": ["orjson"],
+        "frames": ["numpy"],
+    },
     entry_points={
         "pytest11": [
             "pytest-testrail-client = pytest_testrail_client.pytest_testrail_client",
@@ -0,0 +1,26 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# the in-process TestRail emulator lives with the development tools
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'dev_tools'))
+
+from _bench import BenchConfig  # noqa: E402  pylint: disable=wrong-import-position
+from emulator import Emulator  # noqa: E402  pylint: disable=wrong-import-position
+
+from pytest_testrail_client.testrail_api import TestRailAPI  # noqa: E402  pylint: disable=wrong-import-position
+
+
+@pytest.fixture
+def emulator():
+    emulator = Emulator()
+    emulator.project_id = emulator.seed(cases=10)
+    emulator.serve()
+    yield emulator
+    emulator.shutdown()
+
+
+@pytest.fixture
+def tr(emulator):
+    return TestRailAPI(BenchConfig(emulator.url, testrail_retry_backoff=0.01))
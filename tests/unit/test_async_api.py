@@ -0,0 +1,51 @@
+import asyncio
+
+from _bench import BenchConfig
+
+from pytest_testrail_client.model.case import Case
+from pytest_testrail_client.model.result import Result
+from pytest_testrail_client.testrail_api import AsyncTestRailAPI
+
+
+def _run(emulator, call):
+    async def main():
+        async with AsyncTestRailAPI(BenchConfig(emulator.url)) as tr:
+            return await call(tr)
+
+    return asyncio.run(main())
+
+
+def test_get_case(emulator):
+    case = _run(emulator, lambda tr: tr.cases.get_case(2))
+    assert (case.id, case.title) == (2, 'Case 2')
+
+
+def test_concurrent_gets(emulator):
+    async def call(tr):
+        return await asyncio.gather(*(tr.cases.get_case(case_id) for case_id in range(1, 11)))
+
+    assert [case.id for case in _run(emulator, call)] == list(range(1, 11))
+    assert emulator.calls['get_case'] == 10
+
+
+def test_iter_cases_is_drained(emulator):
+    cases = _run(emulator, lambda tr: tr.cases.iter_cases(emulator.project_id, suite_id=1))
+    assert [case.id for case in cases] == list(range(1, 11))
+
+
+def test_add_case(emulator):
+    section_id = next(iter(emulator._tables['sections']))  # pylint: disable=protected-access
+    case = _run(emulator, lambda tr: tr.cases.add_case(section_id, Case({'title': 'Async case'})))
+    assert case.title == 'Async case'
+    assert emulator.calls['add_case'] == 1
+
+
+def test_add_results(emulator):
+    async def call(tr):
+        run = await tr.runs.add_run(emulator.project_id, suite_id=1, include_all=True)
+        test = (await tr.tests.get_tests(run['id']))[0]
+        return await tr.results.add_results(run['id'], [Result({'test_id': test.id, 'status_id': 5})])
+
+    results = _run(emulator, call)
+    assert [result.status_id for result in results] == [5]
+    assert emulator.calls['add_results'] == 1
@@ -0,0 +1,35 @@
+from _bench import BenchConfig
+
+from pytest_testrail_client import testrail_api
+from pytest_testrail_client._enums import METHODS
+from pytest_testrail_client._session import clear_response_cache
+
+
+class _Config(BenchConfig):
+    """Config of a run with --testrail-cache-clear"""
+
+    def __init__(self, url, rootdir, **options):
+        super().__init__(url, testrail_cache='true', **options)
+        self.rootdir = rootdir
+
+    def getoption(self, name, default=None):
+        return True if name == '--testrail-cache-clear' else default
+
+
+def test_cache_is_cleared_once_per_run(emulator, tmp_path):
+    config = _Config(emulator.url, tmp_path)
+    testrail_api.TestRailAPI(config).request(METHODS.GET, 'get_statuses')
+    clear_response_cache(config)
+    # the sessions of the sessionstart and sessionfinish hooks share what they cached
+    for _ in range(2):
+        testrail_api.TestRailAPI(config).request(METHODS.GET, 'get_statuses')
+    assert emulator.calls['get_statuses'] == 2
+
+
+def test_xdist_workers_do_not_clear_the_cache(emulator, tmp_path):
+    config = _Config(emulator.url, tmp_path)
+    testrail_api.TestRailAPI(config).request(METHODS.GET, 'get_statuses')
+    config.workerinput = {'workerid': 'gw0'}
+    clear_response_cache(config)
+    testrail_api.TestRailAPI(config).request(METHODS.GET, 'get_statuses')
+    assert emulator.calls['get_statuses'] == 1
@@ -0,0 +1,79 @@
+# pylint: disable=protected-access
+import pytest
+
+from pytest_testrail_client._case_updates import CaseUpdates, SyncManifest
+from pytest_testrail_client.model.case import Case
+
+
+class _Cache(dict):
+    """Stand-in of config.cache"""
+
+    def get(self, key, default):  # pylint: disable=arguments-differ
+        return super().get(key, default)
+
+    def set(self, key, value):
+        self[key] = value
+
+
+def _case(title, **fields):
+    return Case(dict({'title': title, 'suite_id': 1, 'section_id': 1}, **fields))
+
+
+@pytest.fixture
+def manifest(emulator):
+    return SyncManifest(_Cache(), emulator.url, emulator.project_id)
+
+
+def test_identical_changes_share_a_bulk_update(tr, emulator):
+    updates = CaseUpdates(tr, emulator.project_id)
+    for case_id in range(1, 7):
+        updates.add(case_id, _case(f'Case {case_id}', priority_id=1))
+    updates.add(7, _case('Case 7', priority_id=3))
+    updates.add(8, _case('Case 8'))
+    updates.flush()
+    assert emulator.calls['update_cases'] == 1 and emulator.calls['update_case'] == 1
+    assert [case.priority_id for case in tr.cases.get_cases(emulator.project_id, suite_id=1)][:8] == \
+           [1, 1, 1, 1, 1, 1, 3, 2]
+    assert updates.counts == {'created': 0, 'updated': 7, 'skipped': 1, 'drifted': 0}
+
+
+def test_section_changes_are_sent_one_by_one(tr, emulator):
+    updates = CaseUpdates(tr, emulator.project_id)
+    for case_id in (1, 2):
+        updates.add(case_id, _case(f'Case {case_id}', section_id=2))
+    updates.flush()
+    assert emulator.calls['update_case'] == 2 and emulator.calls['update_cases'] == 0
+
+
+def test_manifest_skips_unchanged_cases(tr, emulator, manifest):
+    for _ in range(2):
+        updates = CaseUpdates(tr, emulator.project_id, manifest)
+        for case_id in (1, 2):
+            updates.add(case_id, _case(f'Case {case_id} v2'))
+        emulator.calls.clear()
+        updates.flush()
+    # only the look up of the cases updated in TestRail since
+    assert dict(emulator.calls) == {'get_cases': 1}
+    assert updates.counts == {'created': 0, 'updated': 0, 'skipped': 2, 'drifted': 0}
+
+
+def test_manifest_updates_drifted_cases(tr, emulator, manifest):
+    updates = CaseUpdates(tr, emulator.project_id, manifest)
+    for case_id in (1, 2):
+        updates.add(case_id, _case(f'Case {case_id} v2'))
+    updates.flush()
+    # edited in TestRail after the export
+    emulator._tables['cases'][2].update(title='Edited', updated_on=manifest.get(2)['updated_on'] + 10)
+    updates = CaseUpdates(tr, emulator.project_id, manifest)
+    for case_id in (1, 2):
+        updates.add(case_id, _case(f'Case {case_id} v2'))
+    updates.flush()
+    assert updates.counts == {'created': 0, 'updated': 1, 'skipped': 1, 'drifted': 1}
+    assert tr.cases.get_case(2).title == 'Case 2 v2'
+
+
+def test_manifest_of_another_testrail_is_ignored(emulator, manifest):
+    manifest.record(1, 'hash', 1)
+    manifest.save()
+    assert len(SyncManifest(manifest._cache, emulator.url, emulator.project_id)) == 1
+    assert len(SyncManifest(manifest._cache, 'https://other.testrail.io', emulator.project_id)) == 0
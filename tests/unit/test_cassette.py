@@ -0,0 +1,26 @@
+from _bench import BenchConfig
+
+from pytest_testrail_client._enums import METHODS
+from pytest_testrail_client import testrail_api
+
+
+def test_sessions_of_a_run_share_the_cassette(emulator, tmp_path):
+    # like the sessions of the sessionstart and sessionfinish hooks
+    for src in ('get_statuses', f'get_project/{emulator.project_id}'):
+        tr = testrail_api.TestRailAPI(BenchConfig(emulator.url, testrail_record=str(tmp_path)))
+        tr.request(METHODS.GET, src)
+    emulator.shutdown()
+    replayed = [testrail_api.TestRailAPI(BenchConfig(None, testrail_replay=str(tmp_path))) for _ in range(2)]
+    assert replayed[0].request(METHODS.GET, 'get_statuses')
+    assert replayed[1].request(METHODS.GET, f'get_project/{emulator.project_id}')['name'] == 'Emulated'
+
+
+def test_compressed_requests_are_replayed(emulator, tmp_path):
+    body = {'description': 'x' * 100}
+    options = dict(testrail_compress='true', testrail_compress_threshold=10)
+    tr = testrail_api.TestRailAPI(BenchConfig(emulator.url, testrail_record=str(tmp_path), **options))
+    added = tr.request(METHODS.POST, f'add_suite/{emulator.project_id}', json=body)
+    emulator.shutdown()
+    for replay_options in (options, dict()):
+        tr = testrail_api.TestRailAPI(BenchConfig(None, testrail_replay=str(tmp_path), **replay_options))
+        assert tr.request(METHODS.POST, f'add_suite/{emulator.project_id}', json=body) == added
@@ -0,0 +1,67 @@
+import time
+
+import pytest
+
+from pytest_testrail_client._category import Cases
+from pytest_testrail_client import _exception
+
+
+class _Session:
+    """Session answering every request with the same response"""
+
+    def __init__(self, response):
+        self.response = response
+
+    def request(self, *args, **kwargs):  # pylint: disable=unused-argument
+        return self.response
+
+    @staticmethod
+    def map(func, items, max_workers=None):  # pylint: disable=unused-argument
+        return [func(item) for item in items]
+
+
+@pytest.mark.parametrize('call', [lambda cases: cases.update_cases(1, [1, 2], {'priority_id': 1}),
+                                  lambda cases: cases.delete_cases(1, [1, 2])])
+def test_bulk_error_response_raises(call):
+    with pytest.raises(_exception.TestRailError, match='Field :case_ids'):
+        call(Cases(_Session({'error': 'Field :case_ids is not a valid array.'})))
+
+
+def test_delete_cases_returns_chunk_responses(emulator, tr):
+    case_ids = [case['id'] for case in emulator._tables['cases'].values()]  # pylint: disable=protected-access
+    suite_id = emulator._tables['cases'][case_ids[0]]['suite_id']  # pylint: disable=protected-access
+    assert tr.cases.delete_cases(suite_id, case_ids, soft=True) == [{'cases': len(case_ids), 'tests': 0, 'runs': 0,
+                                                                     'results': 0}]
+
+
+@pytest.fixture
+def paged(emulator):
+    """Emulator serving 3 items per page, with a project of two sections of 10 cases"""
+    emulator.page_size = 3
+    project_id = emulator.seed(project='Paged', sections=2, cases=20)
+    suite_id = max(emulator._tables['suites'])  # pylint: disable=protected-access
+    section_id = max(emulator._tables['sections'])  # pylint: disable=protected-access
+    return project_id, suite_id, section_id
+
+
+def test_pages_are_followed_in_order_with_their_filters(tr, emulator, paged):
+    project_id, suite_id, section_id = paged
+    cases = list(tr.cases.iter_cases(project_id, suite_id=suite_id, section_id=section_id))
+    expected = [case['id'] for case in emulator._tables['cases'].values()  # pylint: disable=protected-access
+                if case['section_id'] == section_id]
+    assert len(expected) == 10
+    assert [case.id for case in cases] == expected
+    assert emulator.calls['get_cases'] == 4
+
+
+def test_next_page_is_prefetched_while_the_current_one_is_consumed(tr, emulator, paged):
+    project_id, suite_id, section_id = paged
+    cases = tr.cases.iter_cases(project_id, suite_id=suite_id, section_id=section_id)
+    next(cases)
+    deadline = time.monotonic() + 5
+    while emulator.calls['get_cases'] < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.1)
+    # one page ahead, not more
+    assert emulator.calls['get_cases'] == 2
+    cases.close()
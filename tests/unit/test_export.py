@@ -0,0 +1,29 @@
+from pytest_testrail_client import pytest_testrail_client as plugin
+from pytest_testrail_client._index import CaseIndex
+from pytest_testrail_client.model.case import Case
+
+
+def test_export_case_updates_the_case_of_the_suite(tr, emulator):
+    tr_cases = CaseIndex(tr.cases.iter_cases(emulator.project_id, suite_id=1, section_id=1))
+    raw_case = Case({'title': 'Case 2', 'suite_id': 1, 'section_id': 1, 'custom_data_set': None,
+                     'refs': 'JIRA-1'})
+    assert plugin.export_case(tr, 1, tr_cases, raw_case).id == 2
+    assert emulator.calls['update_case'] == 1 and emulator.calls['add_case'] == 0
+
+
+def test_export_case_creates_missing_cases(tr, emulator):
+    raw_case = Case({'title': 'Case 2', 'suite_id': 1, 'section_id': 1, 'custom_data_set': '{"pieces": "1"}'})
+    tr_cases = CaseIndex(tr.cases.iter_cases(emulator.project_id, suite_id=1, section_id=1))
+    assert plugin.export_case(tr, 1, tr_cases, raw_case).id == 11
+    assert emulator.calls['add_case'] == 1
+
+
+def test_untagged_scenario_creates_its_case(tr, emulator):
+    # same title as a case of the section, which may belong to another scenario
+    scenario = {'name': 'Case 2', 'tags': [], 'location': {'line': 3, 'column': 3}}
+    raw_case = Case({'title': 'Case 2', 'suite_id': 1, 'section_id': 1, 'custom_data_set': None})
+    insertions = list()
+    plugin.set_test_case(tr, 1, 'eat.feature', scenario, [raw_case], insertions=insertions)
+    assert insertions == [(3, 3, '@TR-C11 \n  ')]
+    assert emulator.calls['add_case'] == 1 and emulator.calls['get_cases'] == 0
+    assert emulator.calls['update_case'] == 0
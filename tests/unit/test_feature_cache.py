@@ -0,0 +1,48 @@
+import os
+
+import pytest
+
+from pytest_testrail_client import _feature_cache
+from pytest_testrail_client._feature_cache import FeatureCache
+
+AST = {'feature': {'name': 'Fruits', 'children': []}}
+
+
+@pytest.fixture
+def cached(tmp_path):
+    feature_file = tmp_path / 'fruits.feature'
+    feature_file.write_text('Feature: Fruits\n')
+    cache = FeatureCache(tmp_path / 'cache')
+    fresh, header = cache.check(str(feature_file))
+    assert not fresh
+    cache.put(str(feature_file), header, AST)
+    return cache, feature_file
+
+
+def test_same_mtime_and_size_is_a_hit_without_reading_the_file(cached, monkeypatch):
+    cache, feature_file = cached
+    monkeypatch.setattr(_feature_cache, '_digest', lambda content: pytest.fail('file content hashed'))
+    assert cache.check(str(feature_file))[0]
+    assert cache.get(str(feature_file)) == AST
+
+
+def test_same_content_with_another_mtime_is_a_hit(cached):
+    cache, feature_file = cached
+    stat = feature_file.stat()
+    os.utime(feature_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    fresh, header = cache.check(str(feature_file))
+    assert fresh and header[0] == stat.st_mtime_ns + 10 ** 9
+    assert cache.get(str(feature_file)) == AST
+
+
+def test_changed_content_is_a_miss(cached):
+    cache, feature_file = cached
+    feature_file.write_text('Feature: Vegetables\n')
+    assert not cache.check(str(feature_file))[0]
+
+
+def test_entries_of_other_versions_are_dropped(tmp_path):
+    stale = tmp_path / (_feature_cache.PREFIX + 'gherkin0-py20-0')
+    stale.mkdir()
+    FeatureCache(tmp_path)
+    assert not stale.exists()
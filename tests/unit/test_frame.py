@@ -0,0 +1,69 @@
+import pytest
+
+from pytest_testrail_client.model import frame
+from pytest_testrail_client.model.frame import ResultFrame, TestFrame
+from pytest_testrail_client.model.result import Result
+
+RESULTS = [
+    {'id': 1, 'test_id': 10, 'status_id': 1, 'elapsed': '1m 30s', 'version': '1.0', 'defects': None},
+    {'id': 2, 'test_id': 11, 'status_id': 5, 'elapsed': '5s', 'version': '1.0', 'defects': 'BUG-1'},
+    {'id': 3, 'test_id': 12, 'status_id': 3, 'elapsed': None, 'version': None, 'defects': None},
+    {'id': 4, 'test_id': 13, 'status_id': 1, 'elapsed': 120, 'version': '1.1', 'defects': None},
+    # a comment only, without status
+    {'id': 5, 'test_id': 10, 'status_id': None, 'elapsed': None, 'version': None, 'defects': None},
+]
+
+
+@pytest.fixture(params=['numpy', 'array'])
+def columns(request, monkeypatch):
+    if request.param == 'array':
+        monkeypatch.setattr(frame, 'numpy', None)
+    return request.param
+
+
+def test_result_columns(columns):  # pylint: disable=unused-argument
+    results = ResultFrame.from_items(iter(RESULTS), case_ids={10: 100, 11: 101})
+    assert len(results) == 5
+    assert list(results['elapsed']) == [90.0, 5.0, 0.0, 120.0, 0.0]
+    assert list(results['case_id']) == [100, 101, 0, 0, 100]
+    assert results.row(1) == {'id': 2, 'test_id': 11, 'case_id': 101, 'status_id': 5, 'created_on': 0,
+                              'created_by': 0, 'elapsed': 5.0, 'assignedto_id': 0, 'version': '1.0',
+                              'defects': 'BUG-1'}
+    # each distinct text once, None at index 0
+    assert len(results.strings) == 4
+
+
+def test_status_histogram_and_pass_rate(columns):  # pylint: disable=unused-argument
+    results = ResultFrame.from_items(RESULTS)
+    assert results.status_histogram() == {0: 1, 1: 2, 3: 1, 5: 1}
+    # untested results and comments without status are left out
+    assert results.pass_rate() == pytest.approx(2 / 3)
+    assert results.pass_rate(passed_status_ids=(1, 5)) == 1.0
+    assert ResultFrame.from_items([]).pass_rate() == 0.0
+
+
+def test_slowest(columns):  # pylint: disable=unused-argument
+    results = ResultFrame.from_items(RESULTS)
+    assert results.slowest(2) == [(13, 120.0), (10, 90.0)]
+    assert len(results.slowest(10)) == 5
+    assert ResultFrame.from_items([]).slowest() == []
+
+
+def test_test_columns(columns):  # pylint: disable=unused-argument
+    tests = TestFrame.from_items([{'id': 1, 'case_id': 5, 'run_id': 2, 'status_id': 3, 'title': 'Eat', 'refs': None},
+                                  {'id': 2, 'case_id': 6, 'run_id': 2, 'status_id': 1, 'title': 'Eat', 'refs': 'A-1'}])
+    assert list(tests['case_id']) == [5, 6]
+    assert tests.row(1)['title'] == 'Eat' and tests.row(1)['refs'] == 'A-1'
+    assert tests.status_histogram() == {1: 1, 3: 1}
+    assert tests.pass_rate() == 1.0
+
+
+def test_frames_of_a_run(tr, emulator):
+    run = tr.runs.add_run(emulator.project_id, suite_id=1, include_all=True)
+    test = tr.tests.get_tests(run['id'])[0]
+    tr.results.add_results(run['id'], [Result({'test_id': test.id, 'status_id': 5, 'elapsed': '2m'})])
+    tests = tr.tests.get_tests_frame(run['id'])
+    assert len(tests) == 10 and tests.status_histogram() == {3: 9, 5: 1}
+    results = tr.results.get_results_for_run_frame(run['id'], case_ids=True)
+    assert list(results['case_id']) == [test.case_id]
+    assert results.slowest(1) == [(test.id, 120.0)]
@@ -0,0 +1,41 @@
+import pytest
+
+from pytest_testrail_client._index import CaseIndex, TestIndex, canonical_data_set
+from pytest_testrail_client.model.case import Case
+from pytest_testrail_client.model.test import Test
+
+
+@pytest.mark.parametrize('data_set, expected', [
+    (None, None),
+    ({'b': '2', 'a': '1'}, '{"a": "1", "b": "2"}'),
+    ('{\n    "b": "2",\n    "a": "1"\n}', '{"a": "1", "b": "2"}'),
+    ({'fruit': 'pêche'}, '{"fruit": "pêche"}'),
+    ('not json', 'not json'),
+])
+def test_canonical_data_set(data_set, expected):
+    assert canonical_data_set(data_set) == expected
+
+
+def test_test_without_data_set_matches_any_data_set():
+    tests = TestIndex([Test({'id': 1, 'title': 'Eat', 'custom_data_set': None})])
+    assert tests.find('Eat', {'fruit': 'apple'}).id == 1
+    assert tests.find('Eat').id == 1
+    assert tests.find('Drink') is None
+
+
+def test_earliest_test_wins():
+    tests = TestIndex([Test({'id': 1, 'title': 'Eat', 'custom_data_set': '{"fruit": "apple"}'}),
+                       Test({'id': 2, 'title': 'Eat', 'custom_data_set': None}),
+                       Test({'id': 3, 'title': 'Eat', 'custom_data_set': '{"fruit": "apple"}'}),
+                       Test({'id': 4, 'title': 'Eat', 'custom_data_set': None})])
+    assert tests.find('Eat', {'fruit': 'apple'}).id == 1
+    assert tests.find('Eat', {'fruit': 'pear'}).id == 2
+    assert len(tests) == 4
+
+
+def test_case_matches_its_data_set_only():
+    cases = CaseIndex([Case({'id': 1, 'title': 'Eat', 'custom_data_set': None}),
+                       Case({'id': 2, 'title': 'Eat', 'custom_data_set': '{"fruit": "apple"}'})])
+    assert cases.find('Eat', '{"fruit": "apple"}').id == 2
+    assert cases.find('Eat').id == 1
+    assert cases.find('Eat', {'fruit': 'pear'}) is None
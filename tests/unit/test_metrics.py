@@ -0,0 +1,93 @@
+import json
+
+import pytest
+from _bench import BenchConfig
+
+from pytest_testrail_client import pytest_testrail_client as plugin
+from pytest_testrail_client import testrail_api
+from pytest_testrail_client._enums import METHODS
+from pytest_testrail_client._exception import StatusCodeError
+from pytest_testrail_client._metrics import Metrics
+
+
+class _Reporter:
+    """Stand-in of the terminal reporter"""
+
+    def __init__(self):
+        self.lines = list()
+
+    def write_sep(self, sep, title):
+        self.lines.append(f'{sep} {title}')
+
+    def write_line(self, line):
+        self.lines.append(line)
+
+
+def test_requests_are_counted_by_endpoint(emulator):
+    tr = testrail_api.TestRailAPI(BenchConfig(emulator.url, testrail_retry_backoff=0.01, testrail_retries=3))
+    for case_id in (1, 2):
+        tr.cases.get_case(case_id)
+    with pytest.raises(StatusCodeError):
+        tr.cases.get_case(999)
+    emulator.error_rate = 1.0
+    with pytest.raises(StatusCodeError):
+        tr.request(METHODS.GET, 'get_statuses')
+    endpoints = tr.metrics.endpoints
+    assert {name: (stats['count'], stats['errors'], stats['retries'])
+            for name, stats in endpoints.items()} == {'get_case': (3, 1, 0), 'get_statuses': (3, 3, 2)}
+    assert endpoints['get_case']['bytes_received'] > 0
+    assert endpoints['get_case']['p50'] <= endpoints['get_case']['p99']
+
+
+def test_cache_hits_are_counted(emulator, tmp_path):
+    config = BenchConfig(emulator.url, testrail_cache='true')
+    config.rootdir = tmp_path
+    tr = testrail_api.TestRailAPI(config)
+    for _ in range(3):
+        tr.request(METHODS.GET, 'get_statuses')
+    assert (tr.metrics.endpoints['get_statuses']['count'], tr.metrics.endpoints['get_statuses']['cached']) == (1, 2)
+
+
+def test_rate_limited_requests_and_phases():
+    metrics = Metrics()
+    metrics.start_phase('export test cases')
+    metrics.record('get_tests/1', 0.1, status=429)
+    metrics.record('get_tests/2', 0.2, sent=10, received=100, status=200, payload_received=400)
+    metrics.end_phase()
+    metrics.record('get_tests/3', 0.3, status=200)
+    stats = metrics.endpoints['get_tests']
+    assert (stats['count'], stats['errors'], stats['rate_limited']) == (3, 1, 1)
+    assert (stats['bytes_received'], stats['payload_received'], stats['payload_sent']) == (100, 400, 10)
+    assert metrics.phases['export test cases']['requests'] == 2
+
+
+@pytest.mark.parametrize('value, reported', [('true', True), ('True', True), ('1', True), ('false', False),
+                                             ('0', False), (None, False)])
+def test_report_option(monkeypatch, value, reported):
+    metrics = Metrics()
+    metrics.record('get_case/1', 0.1, status=200)
+    monkeypatch.setattr(pytest, 'testrail_client_dict', {'metrics': metrics}, raising=False)
+    reporter = _Reporter()
+    plugin.pytest_terminal_summary(reporter, 0, BenchConfig('http://testrail', testrail_metrics=value))
+    assert ('- TestRail requests' in reporter.lines) is reported
+    assert any(line.startswith('get_case ') for line in reporter.lines) is reported
+
+
+def test_json_option(monkeypatch, tmp_path):
+    metrics = Metrics()
+    metrics.record('get_case/1', 0.1, status=200)
+    monkeypatch.setattr(pytest, 'testrail_client_dict', {'metrics': metrics}, raising=False)
+    path = tmp_path / 'metrics.json'
+    reporter = _Reporter()
+    plugin.pytest_terminal_summary(reporter, 0, BenchConfig('http://testrail', testrail_metrics_json=str(path)))
+    assert json.loads(path.read_text())['endpoints']['get_case']['count'] == 1
+    assert reporter.lines == [f'TestRail request metrics written to {path}']
+
+
+def test_nothing_is_reported_without_requests(monkeypatch, tmp_path):
+    monkeypatch.setattr(pytest, 'testrail_client_dict', {'metrics': Metrics()}, raising=False)
+    reporter = _Reporter()
+    path = tmp_path / 'metrics.json'
+    plugin.pytest_terminal_summary(reporter, 0, BenchConfig('http://testrail', testrail_metrics='true',
+                                                            testrail_metrics_json=str(path)))
+    assert not reporter.lines and not path.exists()
@@ -0,0 +1,80 @@
+# pylint: disable=protected-access
+import copy
+import pickle
+
+import pytest
+from _bench import BenchConfig
+
+from pytest_testrail_client import testrail_api
+from pytest_testrail_client.model.case import Case
+from pytest_testrail_client.model.compact import CompactCase, CompactResult
+from pytest_testrail_client.model.result import Result
+
+CASE = {'id': 1, 'title': 'Eat', 'section_id': 2, 'suite_id': 3, 'refs': None, 'is_deleted': 0,
+        'custom_preconds': 'Hungry', 'custom_data_set': '{"fruit": "apple"}'}
+
+
+@pytest.mark.parametrize('model', [Case, CompactCase])
+def test_custom_fields_are_collected_on_first_use(model):
+    case = model(dict(CASE))
+    assert case._custom_fields is None
+    assert case.custom_preconds == 'Hungry'
+    assert case._custom_methods == {'custom_preconds': 'Hungry', 'custom_data_set': '{"fruit": "apple"}'}
+    assert case._custom_methods is case._custom_methods
+    with pytest.raises(AttributeError):
+        case.custom_missing  # pylint: disable=pointless-statement
+
+
+def test_compact_model_reads_like_the_regular_one():
+    case, compact = Case(dict(CASE)), CompactCase(dict(CASE))
+    for name in ('id', 'title', 'section_id', 'suite_id', 'refs', 'priority_id'):
+        assert getattr(compact, name) == getattr(case, name)
+    assert str(compact) == 'Eat'
+    # fields unknown to the model are dropped, missing ones are left out
+    assert compact.raw_data() == {key: value for key, value in CASE.items() if key != 'is_deleted'}
+
+
+def test_compact_model_fields_are_written_through():
+    case = CompactCase(dict(CASE))
+    case.estimate = '1m'
+    case._content['custom_preconds'] = 'Thirsty'
+    assert (case.estimate, case.custom_preconds) == ('1m', 'Thirsty')
+    with pytest.raises(KeyError):
+        case._content['is_deleted'] = 1
+
+
+@pytest.mark.parametrize('model', [Case, CompactCase])
+@pytest.mark.parametrize('read_custom_fields', [False, True])
+def test_pickle(model, read_custom_fields):
+    case = model(dict(CASE))
+    if read_custom_fields:
+        assert case.custom_preconds
+    loaded = pickle.loads(pickle.dumps(case))
+    assert type(loaded) is model
+    assert loaded.raw_data() == case.raw_data()
+    assert loaded.custom_preconds == 'Hungry' and loaded.estimate is None
+
+
+@pytest.mark.parametrize('model', [Case, CompactCase])
+def test_deepcopy_is_independent(model):
+    case = model(dict(CASE))
+    copied = copy.deepcopy(case)
+    copied._content['title'] = 'Drink'
+    copied._content['custom_preconds'] = 'Thirsty'
+    assert (case.title, case.custom_preconds) == ('Eat', 'Hungry')
+    assert (copied.title, copied.custom_preconds) == ('Drink', 'Thirsty')
+
+
+def test_compact_result_of_a_response():
+    result = CompactResult({'id': 5, 'test_id': 7, 'status_id': 1, 'elapsed': '1m 30s', 'custom_step_results': []})
+    assert (result.id, result.test_id, result.status_id) == (5, 7, 1)
+    assert result.elapsed == Result({'elapsed': '1m 30s'}).elapsed
+    assert result.custom_step_results == []
+
+
+def test_categories_build_compact_models_with_the_option(emulator):
+    tr = testrail_api.TestRailAPI(BenchConfig(emulator.url, testrail_compact_models='true'))
+    cases = list(tr.cases.iter_cases(emulator.project_id, suite_id=1))
+    assert {type(case) for case in cases} == {CompactCase}
+    assert [case.title for case in cases] == [f'Case {index}' for index in range(1, 11)]
+    assert type(tr.cases.get_case(1)) is CompactCase
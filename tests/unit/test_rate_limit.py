@@ -0,0 +1,52 @@
+import json
+import time
+
+import pytest
+
+from pytest_testrail_client import _rate_limit
+from pytest_testrail_client._rate_limit import RATE_DECREASE, STATE_TTL, TokenBucket
+
+pytestmark = pytest.mark.skipif(_rate_limit.fcntl is None, reason='file locks not supported')
+
+
+def _write_state(state_file, **state):
+    state_file.write_text(json.dumps(dict({'rate': 1.0, 'tokens': 1.0, 'updated': time.time()}, **state)))
+
+
+def test_rate_learned_by_an_earlier_run_is_not_carried_over(tmp_path):
+    state_file = tmp_path / 'bucket.ratelimit'
+    _write_state(state_file, rate=1.0, updated=time.time() - STATE_TTL - 1)
+    assert TokenBucket(4.0, state_file=state_file).rate == 4.0
+
+
+def test_rate_of_a_running_worker_is_shared(tmp_path):
+    state_file = tmp_path / 'bucket.ratelimit'
+    _write_state(state_file, rate=1.0)
+    assert TokenBucket(4.0, state_file=state_file).rate == 1.0
+
+
+def test_lowered_ceiling_applies_at_once(tmp_path):
+    state_file = tmp_path / 'bucket.ratelimit'
+    _write_state(state_file, rate=10.0, tokens=10.0)
+    bucket = TokenBucket(2.0, state_file=state_file)
+    assert bucket.rate == 2.0
+    assert bucket.reserve() == 0.0
+    assert json.loads(state_file.read_text())['tokens'] == 1.0
+
+
+def test_request_locks_the_state_file_once(tmp_path, monkeypatch):
+    locks = []
+    monkeypatch.setattr(_rate_limit.fcntl, 'flock', lambda file, operation: locks.append(operation))
+    bucket = TokenBucket(4.0, state_file=tmp_path / 'bucket.ratelimit')
+    bucket.acquire()
+    bucket.reward()
+    assert len(locks) == 1
+
+
+def test_successes_raise_the_rate_again(tmp_path):
+    bucket = TokenBucket(4.0, state_file=tmp_path / 'bucket.ratelimit')
+    bucket.penalize(0)
+    assert bucket.rate == 4.0 * RATE_DECREASE
+    for _ in range(10):
+        bucket.reward()
+    assert bucket.rate == pytest.approx(4.0 * RATE_DECREASE + 10 * 4.0 * _rate_limit.RATE_INCREASE)
@@ -0,0 +1,100 @@
+# pylint: disable=protected-access
+import threading
+
+import pytest
+from _bench import BenchConfig
+
+from pytest_testrail_client import pytest_testrail_client as plugin
+from pytest_testrail_client._metrics import Metrics
+from pytest_testrail_client._registry import Index, Registry, SectionTree
+from pytest_testrail_client.model.section import Section
+
+
+def _section(section_id, name, parent_id=None):
+    return Section({'id': section_id, 'name': name, 'parent_id': parent_id})
+
+
+def test_sections_are_found_by_path():
+    tree = SectionTree('Fruits', [_section(1, 'Apples'), _section(2, 'Red', 1), _section(3, 'Pears'),
+                                  _section(4, 'Red', 3)])
+    assert tree.get('Fruits', 'Apples', 'Red').id == 2
+    assert tree.get('Fruits', 'Pears', 'Red').id == 4
+    assert tree.get('Fruits', 'Red') is None
+    assert tree.path(4) == 'Fruits/Pears/Red'
+
+
+def test_first_of_same_named_siblings_wins():
+    tree = SectionTree('Fruits', [_section(1, 'Apples'), _section(2, 'Apples'), _section(3, 'Red', 2)])
+    assert tree.get('Fruits', 'Apples').id == 1
+    assert [section.id for section in tree.children()] == [1, 2]
+    # sub-sections stay reachable under their own parent only
+    assert tree.get('Fruits', 'Apples', 'Red') is None
+    assert tree.path(3) == 'Fruits/Apples/Red'
+
+
+def test_added_sections_are_found():
+    tree = SectionTree('Fruits', [_section(1, 'Apples')])
+    tree.add(_section(5, 'Green', 1))
+    assert tree.get('Fruits', 'Apples', 'Green').id == 5
+    assert [section.id for section in tree.children(1)] == [5]
+
+
+def test_index_lookups():
+    index = Index([{'id': 1, 'name': 'High'}, {'id': 2, 'name': 'Low'}, {'id': 3, 'name': 'High'}])
+    assert index.id_of('High') == 1 and index.id_of('Medium') is None
+    assert index.get('Low') == {'id': 2, 'name': 'Low'}
+    assert 'Low' in index and 'Medium' not in index
+    assert index.names() == ['High', 'Low']
+    assert len(index) == 3 and [obj['id'] for obj in index] == [1, 2, 3]
+    assert Index([_section(4, 'Apples')]).id_of('Apples') == 4
+
+
+def test_reference_data_is_loaded_once(tr, emulator):
+    for _ in range(3):
+        assert 'passed' in tr.registry.statuses
+        assert tr.registry.configs(emulator.project_id).names() == ['Chrome', 'Firefox']
+        assert tr.registry.sections(emulator.project_id, 1, 'Suite 1').get('Suite 1', 'Section 1').id == 1
+    assert emulator.calls['get_statuses'] == emulator.calls['get_configs'] == emulator.calls['get_sections'] == 1
+    tr.registry.invalidate('statuses')
+    assert tr.registry.statuses.id_of('passed') == 1
+    assert emulator.calls['get_statuses'] == 2
+
+
+def test_slow_load_holds_up_its_own_key_only():
+    registry = Registry(None)
+    loading, release = threading.Event(), threading.Event()
+    loads = list()
+
+    def slow():
+        loads.append('slow')
+        loading.set()
+        release.wait(5)
+        return [{'id': 1, 'name': 'Slow'}]
+
+    threads = [threading.Thread(target=registry._index, args=('slow', slow)) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    assert loading.wait(5)
+    # loaded while the other key is being loaded
+    fast = threading.Thread(target=registry._index, args=('fast', lambda: [{'id': 2, 'name': 'Fast'}]))
+    fast.start()
+    fast.join(1)
+    assert not fast.is_alive()
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert loads == ['slow']
+    assert registry._index('slow', slow).id_of('Slow') == 1
+
+
+def test_hooks_of_a_run_share_one_client(emulator, monkeypatch):
+    monkeypatch.setattr(pytest, 'testrail_client_dict', {'metrics': Metrics()}, raising=False)
+    config = BenchConfig(emulator.url, testrail_project_id=str(emulator.project_id))
+    tr, project_data = plugin.get_testrail_api(config)
+    project_data['plan_id'] = 1
+    tr.registry.statuses  # pylint: disable=pointless-statement
+    # the keys added by a hook are not seen by the next one
+    assert plugin.get_testrail_api(config) == (tr, {'project_id': str(emulator.project_id),
+                                                    'jira_project_key': None})
+    assert tr.registry.statuses.id_of('passed') == 1
+    assert emulator.calls['get_statuses'] == 1 and emulator.calls['get_project'] == 1
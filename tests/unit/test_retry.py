@@ -0,0 +1,51 @@
+# pylint: disable=protected-access
+import pytest
+
+from pytest_testrail_client._category import Results
+from pytest_testrail_client._enums import METHODS
+from pytest_testrail_client._exception import StatusCodeError
+from pytest_testrail_client.model.result import Result
+
+
+def test_repeated_writes_are_all_sent(tr, emulator):
+    run = tr.runs.add_run(emulator.project_id, suite_id=1, include_all=True)
+    test = tr.tests.get_tests(run['id'])[0]
+    first = tr.results.add_results(run['id'], [Result({'test_id': test.id, 'status_id': 5})])
+    second = tr.results.add_results(run['id'], [Result({'test_id': test.id, 'status_id': 5})])
+    assert emulator.calls['add_results'] == 2
+    assert first[0].id != second[0].id
+
+
+def test_added_results_match_the_submitted_fields():
+    found = [{'id': 1, 'test_id': 7, 'status_id': 1, 'comment': 'other run'},
+             {'id': 2, 'test_id': 7, 'status_id': 5, 'comment': 'failed', 'elapsed': '1m 30s'}]
+    submitted = Result({'test_id': 7, 'status_id': 5, 'comment': 'failed', 'elapsed': 90})
+    assert Results._added_results(found, [submitted]) == [found[1]]
+    assert Results._added_results(found[:1], [submitted]) is None
+
+
+def test_added_results_count_every_found_result_once():
+    found = [{'id': 1, 'test_id': 7, 'status_id': 5}]
+    submitted = [Result({'test_id': 7, 'status_id': 5}), Result({'test_id': 7, 'status_id': 5})]
+    assert Results._added_results(found, submitted) is None
+    assert Results._added_results(found * 2, submitted) == found * 2
+
+
+def test_failed_lookup_surfaces_the_send_error(tr, emulator):
+    emulator.error_rate, emulator.error_methods = 1.0, ('POST',)
+
+    def check():
+        raise RuntimeError('lookup failed')
+
+    with pytest.raises(StatusCodeError):
+        tr.request(METHODS.POST, 'add_result/1', json={'status_id': 1}, check=check)
+    assert emulator.failed == 1
+
+
+def test_repeated_uploads_are_all_sent(tr, emulator, tmp_path):
+    run = tr.runs.add_run(emulator.project_id, suite_id=1, include_all=True)
+    screenshot = tmp_path / 'screenshot.png'
+    screenshot.write_bytes(b'png')
+    tr.attachments.add_attachment_to_run(run['id'], screenshot)
+    tr.attachments.add_attachment_to_run(run['id'], screenshot)
+    assert emulator.calls['add_attachment_to_run'] == 2
@@ -0,0 +1,61 @@
+import time
+
+import pytest
+
+from _bench import BenchConfig
+
+from pytest_testrail_client import _exception, _session, testrail_api
+from pytest_testrail_client._enums import METHODS
+from pytest_testrail_client._exception import StatusCodeError
+
+COMPRESS = dict(testrail_compress='true', testrail_compress_threshold=10)
+
+
+def test_rejected_request_is_sent_once(emulator):
+    tr = testrail_api.TestRailAPI(BenchConfig(emulator.url, **COMPRESS))
+    with pytest.raises(StatusCodeError):
+        tr.request(METHODS.POST, 'add_case/999', json={'title': 'x' * 100})
+    assert tr.metrics.endpoints['add_case']['count'] == 1
+    assert _session._COMPRESSION.get(f'{emulator.url}/index.php?/api/v2/') is None
+
+
+def test_unsupported_compression_is_turned_off(emulator):
+    emulator.gzip_requests = False
+    tr = testrail_api.TestRailAPI(BenchConfig(emulator.url, **COMPRESS))
+    for _ in range(2):
+        assert tr.request(METHODS.POST, f'add_suite/{emulator.project_id}', json={'name': 'x' * 100})
+    assert emulator.calls['add_suite'] == 2
+    # the HTTP 415 and its uncompressed resend, then the next request uncompressed at once
+    assert tr.metrics.endpoints['add_suite']['count'] == 3
+    assert _session._COMPRESSION[f'{emulator.url}/index.php?/api/v2/'] is False
+
+
+def test_responses_come_back_in_input_order(tr, emulator):
+    case_ids = list(range(10, 0, -1))
+    responses = tr.request_many([(METHODS.GET, f'get_case/{case_id}') for case_id in case_ids], max_workers=4)
+    assert [response['id'] for response in responses] == case_ids
+    assert emulator.calls['get_case'] == 10
+
+
+def test_errors_are_collected_per_item(tr):
+    calls = [(METHODS.GET, 'get_case/1'), (METHODS.GET, 'get_case/999'), (METHODS.GET, 'get_case/3')]
+    responses = tr.request_many(calls, return_exceptions=True)
+    assert responses[0]['id'] == 1 and responses[2]['id'] == 3
+    assert isinstance(responses[1], StatusCodeError)
+
+
+def test_batch_error_is_raised_once_every_call_finished(tr):
+    finished = list()
+
+    def get_case(case_id):
+        if case_id == 999:
+            return tr.request(METHODS.GET, f'get_case/{case_id}')
+        time.sleep(0.05)
+        finished.append(case_id)
+        return tr.request(METHODS.GET, f'get_case/{case_id}')
+
+    with pytest.raises(_exception.TestRailBatchError) as error:
+        tr.map(get_case, [999, 1, 2, 3], max_workers=2)
+    assert sorted(finished) == [1, 2, 3]
+    assert list(error.value.errors) == [0]
+    assert [result['id'] for result in error.value.results[1:]] == [1, 2, 3]
@@ -0,0 +1,88 @@
+import pytest
+from gherkin.errors import CompositeParserException
+
+from pytest_testrail_client._utils import _iter_features, _parse_feature, _write_feature
+
+FEATURE = (
+    'Feature: Fruits\n'
+    '\n'
+    '  Scenario: Eat an apple\n'
+    '    Given I have 1 apples\n'
+    '\n'
+    '  @smoke\n'
+    '  Scenario: Eat a pear\n'
+    '    Given I have 1 pears\n'
+)
+
+
+def _tag(scenario: dict, tag: str):
+    """Insertion of tag like set_test_case builds it from the AST"""
+    location = scenario['tags'][0]['location'] if scenario['tags'] else scenario['location']
+    text = tag + ' ' + ('' if scenario['tags'] else '\n' + ' ' * (location['column'] - 1))
+    return location['line'], location['column'], text
+
+
+@pytest.fixture
+def feature_file(tmp_path):
+    feature_file = tmp_path / 'fruits.feature'
+    feature_file.write_bytes(FEATURE.encode('utf-8'))
+    return feature_file
+
+
+def test_tags_are_inserted_before_the_tags_or_the_scenario(feature_file):
+    apple, pear = _parse_feature(str(feature_file))['feature']['children']
+    _write_feature(str(feature_file), [_tag(apple, '@TR-C1'), _tag(pear, '@TR-C2')])
+    assert feature_file.read_text() == FEATURE.replace(
+        '  Scenario: Eat an apple', '  @TR-C1 \n  Scenario: Eat an apple').replace('@smoke', '@TR-C2 @smoke')
+    apple, pear = _parse_feature(str(feature_file))['feature']['children']
+    assert [tag['name'] for tag in apple['tags']] == ['@TR-C1']
+    assert [tag['name'] for tag in pear['tags']] == ['@TR-C2', '@smoke']
+
+
+def test_line_breaks_and_trailing_newline_are_kept(feature_file):
+    feature_file.write_bytes(FEATURE.replace('\n', '\r\n').encode('utf-8'))
+    apple, _ = _parse_feature(str(feature_file))['feature']['children']
+    _write_feature(str(feature_file), [_tag(apple, '@TR-C1')])
+    content = feature_file.read_bytes()
+    assert content.endswith(b'Given I have 1 pears\r\n')
+    assert b'  @TR-C1 \r\n  Scenario: Eat an apple\r\n' in content
+    assert content.count(b'\n') == content.count(b'\r\n') == FEATURE.count('\n') + 1
+
+
+def test_failed_insertion_leaves_the_file_as_it_was(feature_file):
+    with pytest.raises(TypeError):
+        _write_feature(str(feature_file), [(3, 3, None)])
+    assert feature_file.read_text() == FEATURE
+    assert [file.name for file in feature_file.parent.iterdir()] == ['fruits.feature']
+
+
+@pytest.fixture
+def feature_files(tmp_path):
+    feature_files = list()
+    for index in range(6):
+        feature_file = tmp_path / f'fruits_{index}.feature'
+        feature_file.write_text(FEATURE.replace('Feature: Fruits', f'Feature: Fruits {index}'))
+        feature_files.append(str(feature_file))
+    return feature_files
+
+
+def test_pool_yields_the_features_in_order(feature_files):
+    features = list(_iter_features(feature_files, workers=3))
+    assert [file_path for file_path, _ in features] == feature_files
+    assert [feature['feature']['name'] for _, feature in features] == [f'Fruits {index}' for index in range(6)]
+    assert features[0][1] == _parse_feature(feature_files[0])
+
+
+def test_pool_surfaces_a_parse_error(feature_files):
+    with open(feature_files[2], 'w') as feature_file:
+        feature_file.write('Fruits without feature\n')
+    features = _iter_features(feature_files, workers=3)
+    assert next(features)[0] == feature_files[0]
+    with pytest.raises(CompositeParserException):
+        list(features)
+
+
+def test_pool_stops_with_the_caller(feature_files):
+    features = _iter_features(feature_files, workers=2)
+    assert next(features)[0] == feature_files[0]
+    features.close()